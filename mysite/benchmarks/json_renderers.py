@@ -0,0 +1,100 @@
+"""
+Compare le rendu JSON de DRF (json de la bibliothèque standard) et
+core.renderers.ORJSONRenderer sur une page de N ventes (10 000 par défaut)
+au format de /api/ventes/, ainsi que la lecture du même document.
+
+    python benchmarks/json_renderers.py [--rows 10000] [--repeat 20]
+
+Les données sont fabriquées en mémoire (aucune base nécessaire), telles que
+les produit le sérialiseur : montants et dates déjà convertis en chaînes.
+`--natifs` garde des Decimal / datetime pour mesurer aussi leur encodage.
+"""
+import argparse
+import io
+import os
+import sys
+import timeit
+from datetime import timedelta
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "mysite.settings")
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.utils import timezone  # noqa: E402
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from core import renderers  # noqa: E402
+
+
+def page_ventes(nombre, natifs=False):
+    maintenant = timezone.now()
+    montant = Decimal if natifs else str
+    date = (lambda valeur: valeur) if natifs else (lambda valeur: valeur.isoformat().replace("+00:00", "Z"))
+    return {
+        "next": "http://testserver/api/ventes/?cursor=cD0yMDI1LTA2LTAx",
+        "previous": None,
+        "results": [
+            {
+                "id": i,
+                "client": f"Client {i % 300}",
+                "lignes": [
+                    {
+                        "id": i * 3 + j,
+                        "produit": f"Produit {j}",
+                        "quantite": montant("2.00"),
+                        "prix_unitaire": montant("1500.00"),
+                        "remise": montant("0.00"),
+                        "vente": i,
+                    }
+                    for j in range(3)
+                ],
+                "date": date(maintenant - timedelta(minutes=i)),
+                "total": montant("9000.00"),
+                "montant_paye": montant("9000.00"),
+                "mode_paiement": "ESPECES",
+                "statut": "PAYEE",
+            }
+            for i in range(nombre)
+        ],
+    }
+
+
+def mesurer(libelle, fonction, repetitions):
+    durees = timeit.repeat(fonction, number=1, repeat=repetitions)
+    meilleure, mediane = min(durees), sorted(durees)[len(durees) // 2]
+    print(f"{libelle:32} min {meilleure * 1000:8.1f} ms   médiane {mediane * 1000:8.1f} ms")
+    return mediane
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--natifs", action="store_true")
+    args = parser.parse_args()
+
+    if renderers.orjson is None:
+        sys.exit("orjson n'est pas installé : rien à comparer.")
+
+    data = page_ventes(args.rows, args.natifs)
+    stdlib, rapide = JSONRenderer(), renderers.ORJSONRenderer()
+    corps = stdlib.render(data)
+    if rapide.render(data) != corps:
+        sys.exit("Les deux rendus diffèrent.")
+    print(f"{args.rows} ventes, {len(corps) / 1024:.0f} Ko\n")
+
+    a = mesurer("rendu DRF (json)", lambda: stdlib.render(data), args.repeat)
+    b = mesurer("rendu orjson", lambda: rapide.render(data), args.repeat)
+    print(f"{'':32} x{a / b:.1f}\n")
+    a = mesurer("lecture DRF (json)", lambda: JSONParser().parse(io.BytesIO(corps)), args.repeat)
+    b = mesurer("lecture orjson", lambda: renderers.ORJSONParser().parse(io.BytesIO(corps)), args.repeat)
+    print(f"{'':32} x{a / b:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+Test de charge minimal (bibliothèque standard uniquement).
+
+Envoie des GET en boucle sur une URL depuis N threads (connexions HTTP
+keep-alive) pendant une durée donnée, puis affiche requêtes/s et latences
+p50/p95/p99. Les résultats peuvent être enregistrés en JSON puis comparés,
+par exemple avant et après activation des connexions persistantes :
+
+    python benchmarks/loadtest.py http://localhost:8000/api/produits/ \\
+        -H "Authorization: Bearer <token>" --output avant.json
+    python benchmarks/loadtest.py ... --output apres.json
+    python benchmarks/loadtest.py --compare avant.json apres.json
+"""
+import argparse
+import http.client
+import json
+import statistics
+import threading
+import time
+from urllib.parse import urlsplit
+
+
+def centile(valeurs, p):
+    if not valeurs:
+        return 0.0
+    valeurs = sorted(valeurs)
+    rang = max(0, min(len(valeurs) - 1, round(p / 100 * len(valeurs)) - 1))
+    return valeurs[rang]
+
+
+def _client(url, entetes, fin, latences, erreurs, verrou):
+    parties = urlsplit(url)
+    classe = http.client.HTTPSConnection if parties.scheme == "https" else http.client.HTTPConnection
+    chemin = parties.path + (f"?{parties.query}" if parties.query else "")
+    conn = classe(parties.netloc, timeout=30)
+    locales, nb_erreurs = [], 0
+    while time.monotonic() < fin:
+        debut = time.perf_counter()
+        try:
+            conn.request("GET", chemin, headers=entetes)
+            reponse = conn.getresponse()
+            reponse.read()
+            if reponse.status >= 400:
+                nb_erreurs += 1
+        except (OSError, http.client.HTTPException):
+            nb_erreurs += 1
+            conn.close()
+            conn = classe(parties.netloc, timeout=30)
+            continue
+        locales.append(time.perf_counter() - debut)
+    conn.close()
+    with verrou:
+        latences.extend(locales)
+        erreurs.append(nb_erreurs)
+
+
+def lancer(url, entetes, concurrence, duree, echauffement):
+    if echauffement:
+        lancer(url, entetes, concurrence, echauffement, 0)
+    latences, erreurs, verrou = [], [], threading.Lock()
+    fin = time.monotonic() + duree
+    threads = [
+        threading.Thread(target=_client, args=(url, entetes, fin, latences, erreurs, verrou))
+        for _ in range(concurrence)
+    ]
+    debut = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    ecoule = time.perf_counter() - debut
+    return {
+        "url": url,
+        "concurrence": concurrence,
+        "requetes": len(latences),
+        "erreurs": sum(erreurs),
+        "rps": len(latences) / ecoule if ecoule else 0.0,
+        "p50_ms": centile(latences, 50) * 1000,
+        "p95_ms": centile(latences, 95) * 1000,
+        "p99_ms": centile(latences, 99) * 1000,
+        "moyenne_ms": (statistics.fmean(latences) if latences else 0.0) * 1000,
+    }
+
+
+def afficher(resultat):
+    print(
+        f"{resultat['url']} ({resultat['concurrence']} clients) : "
+        f"{resultat['requetes']} requêtes, {resultat['erreurs']} erreurs, "
+        f"{resultat['rps']:.1f} req/s, p50 {resultat['p50_ms']:.1f} ms, "
+        f"p95 {resultat['p95_ms']:.1f} ms, p99 {resultat['p99_ms']:.1f} ms"
+    )
+
+
+def comparer(avant, apres):
+    print(f"{'':12}{'avant':>12}{'après':>12}{'écart':>10}")
+    for cle in ("rps", "p50_ms", "p95_ms", "p99_ms"):
+        a, b = avant[cle], apres[cle]
+        ecart = f"{(b - a) / a * 100:+.1f}%" if a else "-"
+        print(f"{cle:12}{a:12.1f}{b:12.1f}{ecart:>10}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("url", nargs="?")
+    parser.add_argument("-H", "--header", action="append", default=[], help="En-tête « Nom: valeur »")
+    parser.add_argument("-c", "--concurrency", type=int, default=16)
+    parser.add_argument("-d", "--duration", type=float, default=30)
+    parser.add_argument("--warmup", type=float, default=3)
+    parser.add_argument("--output", help="Enregistre le résultat en JSON")
+    parser.add_argument("--compare", nargs=2, metavar=("AVANT", "APRES"))
+    args = parser.parse_args()
+
+    if args.compare:
+        with open(args.compare[0]) as a, open(args.compare[1]) as b:
+            comparer(json.load(a), json.load(b))
+        return
+    if not args.url:
+        parser.error("URL requise (ou --compare)")
+
+    entetes = dict(h.split(":", 1) for h in args.header)
+    entetes = {nom.strip(): valeur.strip() for nom, valeur in entetes.items()}
+    resultat = lancer(args.url, entetes, args.concurrency, args.duration, args.warmup)
+    afficher(resultat)
+    if args.output:
+        with open(args.output, "w") as fichier:
+            json.dump(resultat, fichier, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,7 +1,8 @@
 from django.contrib import admin
 from .models import (
     CategorieProduit, Produit, Client, Fournisseur, Vente, LigneVente,
-    Achat, LigneAchat, MouvementStock, Employe, Salaire, Transaction
+    Achat, LigneAchat, MouvementStock, Employe, Salaire, Transaction,
+    AgregatJournalier, StockSnapshot,
 )
 
 @admin.register(CategorieProduit)
@@ -19,11 +20,13 @@ class ProduitAdmin(admin.ModelAdmin):
 class ClientAdmin(admin.ModelAdmin):
     list_display = ("id", "nom", "telephone", "email", "solde")
     search_fields = ("nom","telephone","email")
+    readonly_fields = ("solde",)
 
 @admin.register(Fournisseur)
 class FournisseurAdmin(admin.ModelAdmin):
     list_display = ("id","nom","telephone","email","solde")
     search_fields = ("nom","telephone","email")
+    readonly_fields = ("solde",)
 
 class LigneVenteInline(admin.TabularInline):
     model = LigneVente
@@ -50,6 +53,12 @@ class MouvementStockAdmin(admin.ModelAdmin):
     list_display = ("id","produit","type","quantite","date","source_type","source_id")
     list_filter = ("type","date")
 
+@admin.register(StockSnapshot)
+class StockSnapshotAdmin(admin.ModelAdmin):
+    list_display = ("id","produit","date","quantite")
+    list_filter = ("date",)
+    raw_id_fields = ("produit",)
+
 @admin.register(Employe)
 class EmployeAdmin(admin.ModelAdmin):
     list_display = ("id","nom","poste","salaire_base","date_embauche","actif")
@@ -63,4 +72,9 @@ class SalaireAdmin(admin.ModelAdmin):
 @admin.register(Transaction)
 class TransactionAdmin(admin.ModelAdmin):
     list_display = ("id","type","module","reference_id","montant","date")
-    list_filter = ("type","module","date")
\ No newline at end of file
+    list_filter = ("type","module","date")
+
+@admin.register(AgregatJournalier)
+class AgregatJournalierAdmin(admin.ModelAdmin):
+    list_display = ("jour","module","statut","total","nombre")
+    list_filter = ("module","statut")
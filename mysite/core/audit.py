@@ -0,0 +1,178 @@
+"""
+Écriture différée et groupée du journal d'audit (modèle Transaction).
+
+`enregistrer()` ne fait pas d'INSERT dans la requête : les entrées sont
+placées, après le commit de la transaction métier, dans une file en mémoire
+qu'un thread d'arrière-plan vide par `bulk_create` toutes les
+`FLUSH_INTERVAL_MS` millisecondes ou dès `BATCH_SIZE` entrées. Une écriture
+métier annulée (rollback) ne produit donc aucune ligne d'audit.
+
+Réglage `AUDIT_WRITER` (settings) :
+    MODE               "async" ou "sync" (écriture immédiate, pour les tests)
+    FLUSH_INTERVAL_MS  délai maximal avant écriture d'une entrée
+    BATCH_SIZE         nombre d'entrées par INSERT
+    MAX_QUEUE          au-delà, l'appelant écrit lui-même (contre-pression)
+    TENTATIVES         essais d'un lot en échec, espacés de RETRY_DELAY_MS
+                       doublé à chaque essai
+    RETRY_DELAY_MS     premier délai entre deux essais
+
+Un lot qui échoue encore après TENTATIVES essais est écrit entrée par
+entrée : seules celles que la base refuse sont perdues, et chacune est
+journalisée (logger) avec son contenu pour pouvoir être ressaisie.
+
+La file est vidée à l'arrêt du processus (atexit) ; `arreter()` peut aussi
+être appelé explicitement, par exemple par le hook `worker_exit` de gunicorn.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from core.models import Transaction
+
+logger = logging.getLogger(__name__)
+
+DEFAUTS = {
+    "MODE": "async",
+    "FLUSH_INTERVAL_MS": 200,
+    "BATCH_SIZE": 500,
+    "MAX_QUEUE": 10000,
+    "TENTATIVES": 3,
+    "RETRY_DELAY_MS": 500,
+}
+
+_ARRET = object()
+
+
+def _reglages():
+    return {**DEFAUTS, **getattr(settings, "AUDIT_WRITER", {})}
+
+
+def _ecrire(entrees):
+    Transaction.objects.bulk_create(entrees)
+
+
+class AuditWriter:
+    """File d'entrées d'audit vidée par un thread unique, démarré à la demande."""
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self._pid = None
+        self._file = None
+        self._thread = None
+
+    def _demarrer(self):
+        # Après un fork (gunicorn --preload), le thread du parent n'existe
+        # pas dans l'enfant : chaque processus démarre sa propre file.
+        if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+            return
+        with self._verrou:
+            if self._pid == os.getpid() and self._thread is not None and self._thread.is_alive():
+                return
+            reglages = _reglages()
+            self._pid = os.getpid()
+            self._file = queue.Queue(maxsize=reglages["MAX_QUEUE"])
+            self._thread = threading.Thread(
+                target=self._boucle,
+                args=(self._file, reglages["FLUSH_INTERVAL_MS"] / 1000, reglages["BATCH_SIZE"], reglages),
+                name="audit-writer",
+                daemon=True,
+            )
+            self._thread.start()
+
+    def _boucle(self, file, intervalle, taille_lot, reglages):
+        try:
+            arret = False
+            while not arret:
+                lot = []
+                try:
+                    premiere = file.get()
+                except Exception:
+                    break
+                if premiere is _ARRET:
+                    break
+                lot.append(premiere)
+                echeance = time.monotonic() + intervalle
+                while len(lot) < taille_lot:
+                    reste = echeance - time.monotonic()
+                    if reste <= 0:
+                        break
+                    try:
+                        entree = file.get(timeout=reste)
+                    except queue.Empty:
+                        break
+                    if entree is _ARRET:
+                        arret = True
+                        break
+                    lot.append(entree)
+                self._vider_lot(lot, reglages["TENTATIVES"], reglages["RETRY_DELAY_MS"] / 1000)
+        finally:
+            connection.close()
+
+    def _vider_lot(self, lot, tentatives, delai):
+        for essai in range(1, tentatives + 1):
+            try:
+                _ecrire(lot)
+                return
+            except Exception:
+                logger.warning(
+                    "Écriture de %d entrée(s) d'audit impossible (essai %d/%d).",
+                    len(lot), essai, tentatives, exc_info=True,
+                )
+                # Connexion peut-être rompue : la suivante est rouverte.
+                connection.close()
+                if essai < tentatives:
+                    time.sleep(delai * 2 ** (essai - 1))
+        # Une entrée invalide ne doit pas emporter tout le lot.
+        for entree in lot:
+            try:
+                _ecrire([entree])
+            except Exception:
+                logger.exception(
+                    "Entrée d'audit perdue : type=%s module=%s reference_id=%s montant=%s description=%r",
+                    entree.type, entree.module, entree.reference_id, entree.montant, entree.description,
+                )
+                connection.close()
+
+    def _mettre_en_file(self, entrees):
+        self._demarrer()
+        for position, entree in enumerate(entrees):
+            try:
+                self._file.put_nowait(entree)
+            except queue.Full:
+                logger.warning("File d'audit pleine : écriture synchrone.")
+                _ecrire(entrees[position:])
+                return
+
+    def enregistrer(self, entrees):
+        """Journalise une liste d'instances Transaction non sauvegardées."""
+        if not entrees:
+            return
+        if _reglages()["MODE"] == "sync":
+            # Même transaction que l'écriture métier : annulées ensemble.
+            _ecrire(entrees)
+            return
+        transaction.on_commit(lambda: self._mettre_en_file(entrees))
+
+    def arreter(self, timeout=5):
+        """Écrit les entrées en attente et arrête le thread du processus courant."""
+        thread = self._thread
+        if thread is None or self._pid != os.getpid() or not thread.is_alive():
+            return
+        self._file.put(_ARRET)
+        thread.join(timeout)
+        if thread.is_alive():
+            logger.warning("Thread d'audit non terminé après %ss.", timeout)
+
+
+writer = AuditWriter()
+atexit.register(writer.arreter)
+
+
+def enregistrer(*entrees):
+    writer.enregistrer(list(entrees))
@@ -1,12 +1,118 @@
+import copy
+import hashlib
 import logging
+import threading
+import time
+from collections import OrderedDict
+
 from rest_framework import authentication, exceptions
+from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db.models.signals import post_delete, post_save
 from firebase_admin import auth as fb_auth
 from . import firebase  # noqa: ensure app initialized
+from .metrics import registre
 
 logger = logging.getLogger(__name__)
 User = get_user_model()
 
+
+class VerifiedTokenCache:
+    """
+    Cache LRU borné des ID-tokens Firebase déjà vérifiés.
+
+    Clé : empreinte SHA-256 du token (le token brut n'est jamais conservé).
+    Valeur : claims décodés + utilisateur résolu. Une entrée expire au `exp`
+    du token, ou au plus tard après `max_ttl` secondes pour qu'un compte
+    modifié ne reste pas servi trop longtemps depuis le cache.
+
+    `stats()` (succès, échecs, taille) est exposé par /metrics
+    (auth_token_cache_*).
+
+    Les certificats publics Google, eux, sont déjà gardés en mémoire par
+    firebase_admin (requête HTTP avec CacheControl sur le client partagé).
+    """
+
+    def __init__(self, max_entries=1024, max_ttl=300):
+        self.max_entries = max_entries
+        self.max_ttl = max_ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def digest(token):
+        return hashlib.sha256(token.encode()).hexdigest()
+
+    def get(self, token):
+        key = self.digest(token)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            _, decoded, user = entry
+        # Copie : les vues ne doivent pas partager la même instance entre requêtes.
+        return decoded, copy.copy(user)
+
+    def set(self, token, decoded, user):
+        expires = min(decoded.get("exp", 0), time.time() + self.max_ttl)
+        if expires <= time.time() or self.max_entries <= 0:
+            return
+        key = self.digest(token)
+        with self._lock:
+            self._entries[key] = (expires, decoded, user)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_user(self, user_pk):
+        with self._lock:
+            stale = [key for key, (_, _, user) in self._entries.items() if user.pk == user_pk]
+            for key in stale:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
+
+
+_cache_config = getattr(settings, "FIREBASE_TOKEN_CACHE", {})
+token_cache = VerifiedTokenCache(
+    max_entries=_cache_config.get("MAX_ENTRIES", 1024),
+    max_ttl=_cache_config.get("MAX_TTL", 300),
+)
+
+
+def _invalider_utilisateur(sender, instance, **kwargs):
+    token_cache.invalidate_user(instance.pk)
+
+
+@registre.collecteur
+def _mesures_cache():
+    stats = token_cache.stats()
+    return {
+        "auth_token_cache_hits_total": stats["hits"],
+        "auth_token_cache_misses_total": stats["misses"],
+        "auth_token_cache_entries": stats["size"],
+    }
+
+
+post_save.connect(_invalider_utilisateur, sender=User, dispatch_uid="firebase_token_cache_save")
+post_delete.connect(_invalider_utilisateur, sender=User, dispatch_uid="firebase_token_cache_delete")
+
+
 class FirebaseAuthentication(authentication.BaseAuthentication):
     """Authentifie via ID-token Firebase."""
     keyword = "Bearer"
@@ -17,6 +123,11 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
             return None
 
         token = header.split(" ", 1)[1]
+        cached = token_cache.get(token)
+        if cached is not None:
+            _, user = cached
+            return (user, None)
+
         try:
             decoded = fb_auth.verify_id_token(token)
         except Exception as e:
@@ -30,6 +141,9 @@ class FirebaseAuthentication(authentication.BaseAuthentication):
             username=uid,
             defaults={"email": email, "is_active": True},
         )
+        if user.is_active:
+            token_cache.set(token, decoded, user)
 
-        request.successful_authenticator = self
+        # DRF mémorise lui-même l'authentificateur retenu
+        # (request.successful_authenticator est une propriété en lecture seule).
         return (user, None)
@@ -0,0 +1,54 @@
+"""
+Cache des réponses de lecture de l'API, invalidé par numéro de version.
+
+Chaque modèle a une version stockée dans le cache ; les clés de réponse
+l'incluent. Une écriture sur le modèle change sa version : les anciennes
+entrées ne sont plus jamais lues et expirent d'elles-mêmes. L'ETag des
+réponses dérive de la même clé, ce qui permet de répondre 304 sans relire
+le cache ni resérialiser.
+"""
+import hashlib
+import time
+from urllib.parse import urlencode
+
+from django.core.cache import cache
+from django.db import transaction
+
+PREFIXE = "api"
+
+
+def _cle_version(model):
+    return f"{PREFIXE}:version:{model._meta.label_lower}"
+
+
+def version(model):
+    # Valeur initiale horodatée : une version évincée du cache ne peut pas
+    # retomber sur un numéro déjà utilisé par des entrées encore présentes.
+    return cache.get_or_set(_cle_version(model), time.time_ns(), None)
+
+
+def _incrementer(*models):
+    for model in models:
+        try:
+            cache.incr(_cle_version(model))
+        except ValueError:
+            cache.set(_cle_version(model), time.time_ns(), None)
+
+
+def invalider(*models):
+    """
+    Change la version des modèles donnés, après le commit de la transaction
+    courante pour qu'aucune lecture concurrente ne remette en cache un état
+    non encore validé.
+    """
+    transaction.on_commit(lambda: _incrementer(*models))
+
+
+def cle_reponse(request, models, *parties):
+    """Clé de cache (et ETag) d'une réponse de lecture."""
+    user = request.user
+    role = getattr(user, "role", "") if user.is_authenticated else "anonyme"
+    versions = ",".join(str(version(model)) for model in models)
+    params = urlencode(sorted(request.GET.lists()), doseq=True)
+    brut = "|".join([request.get_host(), request.path, params, role, versions, *map(str, parties)])
+    return f"{PREFIXE}:reponse:{hashlib.sha1(brut.encode()).hexdigest()}"
@@ -0,0 +1,113 @@
+"""
+Filtres des documents (ventes, achats) par numéro et par tiers.
+
+Le numéro d'un document est son id (« Vente #123 »). Un préfixe de numéro
+est converti en plages de clé primaire — « 12 » devient 12, 120-129,
+1200-1299, ... — lues par l'index de la clé primaire, sans le
+`CAST(id AS text) LIKE '%12%'` qu'engendre SearchFilter sur `id`.
+La recherche par nom du tiers passe par core.search (sous-requête indexée
+sur la table des clients / fournisseurs).
+"""
+import re
+
+from django.db.models import Q
+from django_filters import rest_framework as django_filters
+from rest_framework import filters
+
+from core import search
+from core.models import Achat, Client, Fournisseur, Vente
+
+_NUMERO = re.compile(r"^#?(\d+)$")
+
+# Plus grand id d'un BigAutoField.
+ID_MAX = 2**63 - 1
+
+
+def numero(terme):
+    """Chiffres d'un numéro de document (« 123 », « #123 »), ou None."""
+    match = _NUMERO.match(terme.strip())
+    return match.group(1) if match else None
+
+
+def plages_prefixe(prefixe):
+    """Plages d'id (bornes incluses) dont l'écriture décimale commence par `prefixe`."""
+    if prefixe.startswith("0"):
+        return []
+    debut, fin = int(prefixe), int(prefixe)
+    plages = []
+    while debut <= ID_MAX:
+        plages.append((debut, min(fin, ID_MAX)))
+        debut, fin = debut * 10, fin * 10 + 9
+    return plages
+
+
+def filtre_numero(prefixe):
+    condition = Q(pk__in=[])
+    for debut, fin in plages_prefixe(prefixe):
+        condition |= Q(pk=debut) if debut == fin else Q(pk__range=(debut, fin))
+    return condition
+
+
+class DocumentFilterSet(django_filters.FilterSet):
+    id = django_filters.NumberFilter(field_name="id")
+    id_min = django_filters.NumberFilter(field_name="id", lookup_expr="gte")
+    id_max = django_filters.NumberFilter(field_name="id", lookup_expr="lte")
+    numero = django_filters.CharFilter(method="filtrer_numero", label="Début du numéro (#123)")
+
+    # Champ de clé étrangère vers le tiers et modèle du tiers.
+    tiers = None
+
+    def filtrer_numero(self, queryset, name, value):
+        chiffres = numero(value)
+        if chiffres is None:
+            return queryset.none()
+        return queryset.filter(filtre_numero(chiffres))
+
+    def filtrer_tiers(self, queryset, name, value):
+        champ, model = self.tiers
+        return queryset.filter(**{f"{champ}__in": search.correspondances(model, value)})
+
+
+class VenteFilter(DocumentFilterSet):
+    client_nom = django_filters.CharFilter(method="filtrer_tiers", label="Nom, téléphone ou email du client")
+    tiers = ("client", Client)
+
+    class Meta:
+        model = Vente
+        fields = {"statut": ["exact"], "client": ["exact"], "date": ["gte", "lt"]}
+
+
+class AchatFilter(DocumentFilterSet):
+    fournisseur_nom = django_filters.CharFilter(
+        method="filtrer_tiers", label="Nom, téléphone ou email du fournisseur",
+    )
+    tiers = ("fournisseur", Fournisseur)
+
+    class Meta:
+        model = Achat
+        fields = {"statut": ["exact"], "fournisseur": ["exact"], "date": ["gte", "lt"]}
+
+
+class DocumentSearchFilter(filters.SearchFilter):
+    """
+    `?search=` sur les documents : les mots numériques (« 123 », « #123 »)
+    sont des débuts de numéro, les autres cherchés dans le tiers
+    (`filterset_class.tiers`) ; tous doivent correspondre.
+    """
+    search_description = "Début du numéro (#123) et/ou nom, téléphone ou email du tiers"
+
+    def filter_queryset(self, request, queryset, view):
+        termes = self.get_search_terms(request)
+        if not termes:
+            return queryset
+        champ, model = view.filterset_class.tiers
+        texte = []
+        for terme in termes:
+            chiffres = numero(terme)
+            if chiffres is not None:
+                queryset = queryset.filter(filtre_numero(chiffres))
+            else:
+                texte.append(terme)
+        if texte:
+            queryset = queryset.filter(**{f"{champ}__in": search.correspondances(model, " ".join(texte))})
+        return queryset
@@ -0,0 +1,98 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.db import connection, transaction
+from django.utils import timezone
+
+from core.models import Achat, MouvementStock, Salaire, Transaction, Vente
+
+# Index composites ajoutés pour les requêtes ci-dessous (migration 0004).
+# Le salaire d'un employé pour une période est servi par la contrainte
+# d'unicité `core_salaire_periode_uniq`, qui reste en place.
+INDEX_COMPOSITES = {
+    Vente: ["core_vente_statut_date_idx"],
+    Achat: ["core_achat_statut_date_idx"],
+    MouvementStock: ["core_mvt_produit_date_idx"],
+    Transaction: ["core_trans_module_ref_idx", "core_transaction_type_date_idx"],
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Affiche le plan d'exécution des requêtes chaudes (filtres de liste, "
+        "tableau de bord) avec et sans les index composites, ainsi que l'effet "
+        "d'un filtre __date par rapport à une plage semi-ouverte. "
+        "À lancer sur une base peuplée pour des plans représentatifs."
+    )
+
+    def handle(self, *args, **options):
+        fin = timezone.now()
+        debut = fin - timedelta(days=30)
+
+        # SQLite garde en cache le plan des instructions déjà préparées :
+        # on repart d'une connexion neuve avant et après la suppression des index.
+        connection.close()
+        self._section("Avant : sans les index composites")
+        if connection.features.can_rollback_ddl:
+            # Le schema editor de SQLite exige des clés étrangères non
+            # vérifiées, ce qui ne peut se régler qu'hors transaction.
+            with connection.constraint_checks_disabled(), transaction.atomic():
+                self._supprimer_index()
+                for libelle, queryset in self._requetes(debut, fin):
+                    self._plan(libelle, queryset)
+                transaction.set_rollback(True)
+            connection.close()
+        else:
+            self.stdout.write("Base sans DDL transactionnel : section ignorée.")
+
+        self._section("Après : index composites + plages semi-ouvertes")
+        for libelle, queryset in self._requetes(debut, fin):
+            self._plan(libelle, queryset)
+
+        self._section("Filtre date__date (cast de la colonne)")
+        self._plan(
+            "ventes payées sur une période (date__date__range)",
+            Vente.objects.filter(statut="PAYEE", date__date__range=[debut.date(), fin.date()]),
+        )
+
+    def _requetes(self, debut, fin):
+        return [
+            (
+                "ventes payées sur une période",
+                Vente.objects.filter(statut="PAYEE", date__gte=debut, date__lt=fin),
+            ),
+            (
+                "achats payés sur une période",
+                Achat.objects.filter(statut__in=["PAYE", "PARTIEL"], date__gte=debut, date__lt=fin),
+            ),
+            (
+                "mouvements d'un produit depuis une date",
+                MouvementStock.objects.filter(produit_id=1, date__gte=debut).order_by("date"),
+            ),
+            (
+                "transactions d'un document",
+                Transaction.objects.filter(module="VENTE", reference_id=1),
+            ),
+            (
+                "recettes sur une période",
+                Transaction.objects.filter(type="RECETTE", date__gte=debut, date__lt=fin),
+            ),
+            (
+                "salaire d'un employé pour une période",
+                Salaire.objects.filter(employe_id=1, periode="2025-06"),
+            ),
+        ]
+
+    def _supprimer_index(self):
+        with connection.schema_editor(atomic=False) as editor:
+            for model, noms in INDEX_COMPOSITES.items():
+                for index in model._meta.indexes:
+                    if index.name in noms:
+                        editor.execute(index.remove_sql(model, editor))
+
+    def _plan(self, libelle, queryset):
+        self.stdout.write(self.style.MIGRATE_LABEL(f"\n# {libelle}"))
+        self.stdout.write(queryset.explain())
+
+    def _section(self, titre):
+        self.stdout.write(self.style.SUCCESS(f"\n===== {titre} ====="))
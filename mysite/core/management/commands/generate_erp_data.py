@@ -0,0 +1,48 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from core import synthetic
+
+
+class Command(BaseCommand):
+    help = (
+        "Génère un jeu de données ERP synthétique (produits, tiers, ventes et "
+        "achats avec lignes, mouvements, salaires, transactions) par insertions "
+        "en bloc. Les volumes s'ajoutent aux données existantes."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scale", type=float, default=1,
+            help="Multiplie tous les volumes par défaut (ex. 10 pour 10 000 ventes)",
+        )
+        for nom, defaut in synthetic.VOLUMES.items():
+            parser.add_argument(f"--{nom}", type=int, help=f"Volume de {nom} (défaut {defaut} x scale)")
+        parser.add_argument("--lignes", type=int, default=3, help="Lignes par vente / achat")
+        parser.add_argument("--jours", type=int, default=90, help="Étendue des dates, en jours")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--batch-size", type=int, default=2000)
+
+    def handle(self, *args, **options):
+        volumes = {
+            nom: options[nom] if options[nom] is not None else round(defaut * options["scale"])
+            for nom, defaut in synthetic.VOLUMES.items()
+        }
+        # Les périodes de paie ne se multiplient pas avec l'échelle.
+        if options["periodes"] is None:
+            volumes["periodes"] = synthetic.VOLUMES["periodes"]
+
+        debut = time.perf_counter()
+        crees = synthetic.generer(
+            volumes, lignes_par_document=options["lignes"], jours=options["jours"],
+            graine=options["seed"], taille_lot=options["batch_size"],
+        )
+        duree = time.perf_counter() - debut
+
+        for nom, nombre in crees.items():
+            self.stdout.write(f"{nom:15} {nombre:>10}")
+        total = sum(crees.values())
+        self.stdout.write(self.style.SUCCESS(
+            f"{total} lignes insérées en {duree:.1f}s ({total / duree if duree else 0:.0f} lignes/s)."
+        ))
@@ -0,0 +1,37 @@
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services import catalogue
+
+
+class Command(BaseCommand):
+    help = "Importe en masse un fichier CSV ou JSON de produits, clients ou fournisseurs."
+
+    def add_arguments(self, parser):
+        parser.add_argument("catalogue", choices=sorted(catalogue.CATALOGUES))
+        parser.add_argument("fichier", help="Chemin du fichier .csv ou .json")
+        parser.add_argument("--batch-size", type=int, default=catalogue.TAILLE_LOT)
+
+    def handle(self, *args, **options):
+        chemin = options["fichier"]
+        format_fichier = "json" if chemin.lower().endswith(".json") else "csv"
+        debut = time.perf_counter()
+        try:
+            with open(chemin, "rb") as fichier:
+                rapport = catalogue.importer(
+                    options["catalogue"],
+                    catalogue.lire_lignes(fichier, format_fichier),
+                    taille_lot=options["batch_size"],
+                )
+        except (OSError, ValueError) as e:
+            raise CommandError(str(e))
+        duree = time.perf_counter() - debut
+
+        for erreur in rapport["erreurs"]:
+            self.stderr.write(f"Ligne {erreur['ligne']} : {erreur['erreurs']}")
+        self.stdout.write(self.style.SUCCESS(
+            f"{rapport['importes']}/{rapport['total']} lignes importées en {duree:.2f}s "
+            f"({rapport['total'] / duree if duree else 0:.0f} lignes/s), "
+            f"{len(rapport['erreurs'])} en erreur."
+        ))
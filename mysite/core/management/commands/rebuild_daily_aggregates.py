@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from core.services import agregats
+
+
+class Command(BaseCommand):
+    help = "Recalcule entièrement la table AgregatJournalier à partir des ventes et achats."
+
+    def handle(self, *args, **options):
+        nombre = agregats.reconstruire()
+        self.stdout.write(self.style.SUCCESS(f"{nombre} cumuls journaliers reconstruits."))
@@ -0,0 +1,20 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from core import search
+
+
+class Command(BaseCommand):
+    help = (
+        "Pose les index de recherche des modèles de core.search.CHAMPS : "
+        "trigrammes PostgreSQL manquants, tables FTS5 et triggers SQLite "
+        "recréés et remplis."
+    )
+
+    def handle(self, *args, **options):
+        for label, colonnes in search.CHAMPS.items():
+            table = apps.get_model(label)._meta.db_table
+            search.installer(connection, table, colonnes)
+            self.stdout.write(f"{table} : {', '.join(colonnes)}")
+        self.stdout.write(self.style.SUCCESS(f"Index de recherche reconstruits ({connection.vendor})."))
@@ -0,0 +1,32 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services import soldes
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcule les soldes clients et fournisseurs (une requête groupée par "
+        "type de document) et signale les écarts avec les soldes enregistrés ; "
+        "--fix les corrige. Sans --fix, échoue s'il existe des écarts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Corrige les soldes faux")
+        parser.add_argument("--limit", type=int, default=50, help="Nombre d'écarts affichés")
+
+    def handle(self, *args, **options):
+        ecarts = soldes.reconcilier(corriger=options["fix"])
+        for model, pk, enregistre, calcule in ecarts[:options["limit"]]:
+            self.stdout.write(
+                f"{model._meta.verbose_name} {pk} : enregistré {enregistre}, calculé {calcule} "
+                f"(écart {enregistre - calcule:+})"
+            )
+        if len(ecarts) > options["limit"]:
+            self.stdout.write(f"... et {len(ecarts) - options['limit']} autre(s).")
+
+        if not ecarts:
+            self.stdout.write(self.style.SUCCESS("Tous les soldes sont justes."))
+        elif options["fix"]:
+            self.stdout.write(self.style.SUCCESS(f"{len(ecarts)} solde(s) corrigé(s)."))
+        else:
+            raise CommandError(f"{len(ecarts)} solde(s) faux ; relancer avec --fix pour corriger.")
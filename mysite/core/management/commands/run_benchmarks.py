@@ -0,0 +1,209 @@
+import json
+import platform
+import statistics
+import subprocess
+import time
+from datetime import timedelta
+from urllib.parse import urlencode
+
+import django
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from core import synthetic
+from core.middleware import _releve_courant
+from core.models import Client, Produit
+from users.models import User
+
+
+def _centile(valeurs, p):
+    valeurs = sorted(valeurs)
+    rang = max(0, min(len(valeurs) - 1, round(p / 100 * len(valeurs)) - 1))
+    return valeurs[rang]
+
+
+def _scenarios():
+    """(nom, méthode, url, fabrique du corps) ; les URL dépendent des données."""
+    filtre = urlencode({"statut": "PAYEE", "date__gte": (timezone.now() - timedelta(days=30)).isoformat()})
+    client = Client.objects.order_by("pk").values_list("pk", flat=True).first()
+    produits = list(Produit.objects.order_by("pk").values_list("pk", flat=True)[:5])
+
+    def vente():
+        return {
+            "client_id": client, "total": "50.00", "statut": "PAYEE", "mode_paiement": "ESPECES",
+            "lignes": [{"produit_id": pk, "quantite": "1", "prix_unitaire": "10.00"} for pk in produits],
+        }
+
+    return [
+        ("ventes_list", "get", "/api/ventes/", None),
+        ("ventes_list_filtree", "get", f"/api/ventes/?{filtre}", None),
+        ("vente_create", "post", "/api/ventes/", vente),
+        ("produits_list", "get", "/api/produits/", None),
+        ("mouvements_list", "get", "/api/mouvements/", None),
+        ("transactions_list", "get", "/api/transactions/", None),
+        ("dashboard", "get", "/api/dashboard-stats/", None),
+        ("historique", "get", "/api/stats/historique-ventes/?jours=90", None),
+    ]
+
+
+class Command(BaseCommand):
+    help = (
+        "Mesure les principaux endpoints (listes, liste filtrée, création de "
+        "vente, tableau de bord, historique) en processus : débit, latences "
+        "p50/p95/p99 et requêtes SQL par appel, au format JSON. Par défaut sur "
+        "une base de test peuplée par core.synthetic, avec le moteur configuré "
+        "(SQLite en dev ; ENV=prod et DB_* pour un Postgres local)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=200)
+        parser.add_argument("--warmup", type=int, default=20)
+        parser.add_argument("--scale", type=float, default=1, help="Échelle des données générées")
+        parser.add_argument("--only", nargs="*", help="Scénarios à lancer (tous par défaut)")
+        parser.add_argument(
+            "--existing-db", action="store_true",
+            help="Utilise la base configurée telle quelle au lieu d'une base de test",
+        )
+        parser.add_argument("--cache", action="store_true", help="Garde le cache configuré (désactivé par défaut)")
+        parser.add_argument("--output", help="Fichier JSON de sortie (stdout sinon)")
+        parser.add_argument("--compare", nargs=2, metavar=("AVANT", "APRES"), help="Compare deux résultats JSON")
+
+    def handle(self, *args, **options):
+        if options["compare"]:
+            self._comparer(*options["compare"])
+            return
+
+        reglages = {"AUDIT_WRITER": {"MODE": "sync"}}
+        if not options["cache"]:
+            reglages["CACHES"] = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
+
+        ancien_nom = None
+        if not options["existing_db"]:
+            setup_test_environment()
+            ancien_nom = connection.settings_dict["NAME"]
+            connection.creation.create_test_db(verbosity=0, autoclobber=True)
+        try:
+            with override_settings(**reglages):
+                if not options["existing_db"]:
+                    volumes = {
+                        nom: round(defaut * options["scale"])
+                        for nom, defaut in synthetic.VOLUMES.items() if nom != "periodes"
+                    }
+                    synthetic.generer(volumes)
+                resultat = self._mesurer(options)
+        finally:
+            if ancien_nom is not None:
+                connection.creation.destroy_test_db(ancien_nom, verbosity=0)
+                teardown_test_environment()
+
+        sortie = json.dumps(resultat, indent=2, ensure_ascii=False)
+        if options["output"]:
+            with open(options["output"], "w") as fichier:
+                fichier.write(sortie + "\n")
+            self.stderr.write(f"Résultats écrits dans {options['output']}.")
+        else:
+            self.stdout.write(sortie)
+
+    def _mesurer(self, options):
+        admin, _ = User.objects.get_or_create(username="benchmark", defaults={"role": "admin"})
+        client = APIClient()
+        client.force_authenticate(admin)
+
+        scenarios = _scenarios()
+        if options["only"]:
+            inconnus = set(options["only"]) - {nom for nom, *_ in scenarios}
+            if inconnus:
+                raise CommandError(f"Scénarios inconnus : {', '.join(sorted(inconnus))}")
+            scenarios = [s for s in scenarios if s[0] in options["only"]]
+
+        resultats = {}
+        for nom, methode, url, corps in scenarios:
+            for _ in range(options["warmup"]):
+                self._appeler(client, methode, url, corps)
+            latences, requetes = [], []
+            debut = time.perf_counter()
+            for _ in range(options["iterations"]):
+                duree, nombre = self._appeler(client, methode, url, corps)
+                latences.append(duree)
+                requetes.append(nombre)
+            total = time.perf_counter() - debut
+            resultats[nom] = {
+                "url": url,
+                "method": methode.upper(),
+                "iterations": options["iterations"],
+                "rps": round(options["iterations"] / total, 1),
+                "p50_ms": round(_centile(latences, 50) * 1000, 2),
+                "p95_ms": round(_centile(latences, 95) * 1000, 2),
+                "p99_ms": round(_centile(latences, 99) * 1000, 2),
+                "mean_ms": round(statistics.fmean(latences) * 1000, 2),
+                "queries_per_request": round(statistics.fmean(requetes), 2),
+            }
+            self.stderr.write(
+                f"{nom:22} {resultats[nom]['rps']:>8} req/s  p50 {resultats[nom]['p50_ms']:>7} ms  "
+                f"p99 {resultats[nom]['p99_ms']:>7} ms  {resultats[nom]['queries_per_request']} requêtes"
+            )
+
+        return {
+            "meta": {
+                "commit": self._commit(),
+                "date": timezone.now().isoformat(),
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "django": django.get_version(),
+                "scale": options["scale"] if not options["existing_db"] else None,
+                "cache": options["cache"],
+            },
+            "scenarios": resultats,
+        }
+
+    @staticmethod
+    def _appeler(client, methode, url, corps):
+        debut = time.perf_counter()
+        if corps is not None:
+            response = getattr(client, methode)(url, corps(), format="json")
+        else:
+            response = getattr(client, methode)(url)
+        releve = response.wsgi_request.releve_sql
+        if response.streaming:
+            jeton = _releve_courant.set(releve)
+            try:
+                b"".join(response.streaming_content)
+            finally:
+                _releve_courant.reset(jeton)
+        duree = time.perf_counter() - debut
+        if response.status_code >= 400:
+            raise CommandError(f"{methode.upper()} {url} : HTTP {response.status_code} {response.content[:300]!r}")
+        return duree, releve.requetes
+
+    @staticmethod
+    def _commit():
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True,
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    def _comparer(self, avant, apres):
+        with open(avant) as a, open(apres) as b:
+            avant, apres = json.load(a), json.load(b)
+        self.stdout.write(
+            f"{avant['meta'].get('commit')} -> {apres['meta'].get('commit')} "
+            f"({avant['meta'].get('database')} -> {apres['meta'].get('database')})"
+        )
+        self.stdout.write(f"{'scénario':22}{'req/s':>18}{'p50 ms':>18}{'p99 ms':>18}{'requêtes':>12}")
+        for nom, mesure in apres["scenarios"].items():
+            ancienne = avant["scenarios"].get(nom)
+            if ancienne is None:
+                self.stdout.write(f"{nom:22} (nouveau)")
+                continue
+            colonnes = []
+            for cle in ("rps", "p50_ms", "p99_ms"):
+                a, b = ancienne[cle], mesure[cle]
+                ecart = f"{(b - a) / a * 100:+.0f}%" if a else "-"
+                colonnes.append(f"{a:>7}->{b:<7}{ecart:>4}")
+            colonnes.append(f"{ancienne['queries_per_request']:>5}->{mesure['queries_per_request']:<5}")
+            self.stdout.write(f"{nom:22}" + "".join(f"{c:>18}" for c in colonnes))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services import paie
+
+
+class Command(BaseCommand):
+    help = (
+        "Calcule et enregistre les salaires d'une période (AAAA-MM) pour tous "
+        "les employés actifs, en une passe ; relancer une période met à jour "
+        "ses salaires sans les dupliquer."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("periode", help="Période au format AAAA-MM")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        try:
+            rapport = paie.lancer(options["periode"], taille_lot=options["batch_size"])
+        except ValueError as e:
+            raise CommandError(str(e))
+        self.stdout.write(self.style.SUCCESS(
+            f"Paie {rapport['periode']} : {rapport['employes']} employé(s), {rapport['crees']} salaire(s) "
+            f"créé(s), {rapport['modifies']} modifié(s), {rapport['a_regulariser']} à régulariser ; "
+            f"brut {rapport['total_brut']}, net {rapport['total_net']}."
+        ))
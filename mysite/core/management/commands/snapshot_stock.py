@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from core.services import inventaire
+
+
+class Command(BaseCommand):
+    help = (
+        "Photographie le stock actuel de tous les produits (StockSnapshot) : "
+        "point de reprise de l'endpoint stock-at, qui ne relit que les "
+        "mouvements postérieurs à la dernière photo. À planifier (cron)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=5000)
+
+    def handle(self, *args, **options):
+        nombre = inventaire.photographier(taille_lot=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Stock de {nombre} produit(s) photographié(s)."))
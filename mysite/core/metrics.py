@@ -0,0 +1,138 @@
+"""
+Registre de métriques en mémoire (par processus), exposé au format texte
+Prometheus par `metrics_view`.
+
+Alimenté par core.middleware.InstrumentationMiddleware : nombre de requêtes,
+latences, requêtes SQL, temps SQL et de rendu, détections N+1, par endpoint
+(nom de la route) ; core.authentication y ajoute les compteurs de son cache
+d'ID-tokens. Avec plusieurs workers gunicorn, chaque processus a son
+propre registre : Prometheus agrège les cibles.
+"""
+import hmac
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.http import Http404, HttpResponse
+
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+_AIDE = {
+    "http_requests_total": ("counter", "Requêtes HTTP traitées."),
+    "http_request_duration_seconds": ("histogram", "Durée de traitement des requêtes HTTP."),
+    "db_queries_total": ("counter", "Requêtes SQL exécutées."),
+    "db_query_duration_seconds_total": ("counter", "Temps passé dans les requêtes SQL."),
+    "render_duration_seconds_total": ("counter", "Temps de rendu des réponses (JSON, HTML)."),
+    "db_repeated_queries_total": ("counter", "Requêtes HTTP signalées N+1 (même SQL répété)."),
+    "auth_token_cache_hits_total": ("counter", "ID-tokens Firebase servis par le cache (sans vérification)."),
+    "auth_token_cache_misses_total": ("counter", "ID-tokens Firebase absents ou expirés du cache."),
+    "auth_token_cache_entries": ("gauge", "ID-tokens Firebase en cache."),
+}
+
+
+class Registre:
+
+    def __init__(self):
+        self._verrou = threading.Lock()
+        self._compteurs = defaultdict(float)
+        self._histogrammes = {}
+        self._collecteurs = []
+
+    def collecteur(self, fonction):
+        """
+        Enregistre `fonction() -> {nom: valeur}`, lue à chaque export : pour
+        des valeurs tenues ailleurs (compteurs du cache des tokens...).
+        """
+        with self._verrou:
+            self._collecteurs.append(fonction)
+        return fonction
+
+    def incrementer(self, nom, valeur=1, **labels):
+        with self._verrou:
+            self._compteurs[(nom, tuple(sorted(labels.items())))] += valeur
+
+    def observer(self, nom, valeur, **labels):
+        cle = (nom, tuple(sorted(labels.items())))
+        with self._verrou:
+            histo = self._histogrammes.get(cle)
+            if histo is None:
+                histo = self._histogrammes[cle] = [[0] * len(BUCKETS), 0.0, 0]
+            for i, borne in enumerate(BUCKETS):
+                if valeur <= borne:
+                    histo[0][i] += 1
+            histo[1] += valeur
+            histo[2] += 1
+
+    def exporter(self):
+        """Texte au format d'exposition Prometheus 0.0.4."""
+        with self._verrou:
+            compteurs = dict(self._compteurs)
+            histogrammes = {cle: (list(h[0]), h[1], h[2]) for cle, h in self._histogrammes.items()}
+            collecteurs = list(self._collecteurs)
+        for collecteur in collecteurs:
+            compteurs.update(((nom, ()), valeur) for nom, valeur in collecteur().items())
+
+        lignes, declares = [], set()
+
+        def declarer(nom):
+            if nom not in declares:
+                declares.add(nom)
+                type_, aide = _AIDE.get(nom, ("untyped", ""))
+                lignes.append(f"# HELP {nom} {aide}")
+                lignes.append(f"# TYPE {nom} {type_}")
+
+        for (nom, labels), valeur in sorted(compteurs.items()):
+            declarer(nom)
+            lignes.append(f"{nom}{_labels(labels)} {_nombre(valeur)}")
+        for (nom, labels), (seaux, somme, total) in sorted(histogrammes.items()):
+            declarer(nom)
+            for borne, nombre in zip(BUCKETS, seaux):
+                lignes.append(f"{nom}_bucket{_labels(labels + (('le', str(borne)),))} {nombre}")
+            lignes.append(f"{nom}_bucket{_labels(labels + (('le', '+Inf'),))} {total}")
+            lignes.append(f"{nom}_sum{_labels(labels)} {_nombre(somme)}")
+            lignes.append(f"{nom}_count{_labels(labels)} {total}")
+        return "\n".join(lignes) + "\n"
+
+    def reinitialiser(self):
+        with self._verrou:
+            self._compteurs.clear()
+            self._histogrammes.clear()
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{cle}="{_echapper(valeur)}"' for cle, valeur in labels) + "}"
+
+
+def _echapper(valeur):
+    return str(valeur).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _nombre(valeur):
+    return str(int(valeur)) if float(valeur).is_integer() else repr(float(valeur))
+
+
+registre = Registre()
+
+
+def _autorise(request):
+    # Derrière un proxy, REMOTE_ADDR est celle du proxy (souvent 127.0.0.1) :
+    # seul le jeton identifie alors le collecteur. Les adresses de
+    # METRICS_ALLOWED_IPS ne valent qu'en DEBUG, sans jeton configuré.
+    jeton = getattr(settings, "METRICS_TOKEN", "")
+    if jeton:
+        schema, _, fourni = request.META.get("HTTP_AUTHORIZATION", "").partition(" ")
+        return schema.lower() == "bearer" and hmac.compare_digest(fourni.encode(), jeton.encode())
+    return settings.DEBUG and request.META.get("REMOTE_ADDR") in settings.METRICS_ALLOWED_IPS
+
+
+def metrics_view(request):
+    """
+    Expose le registre ; réservé au porteur de METRICS_TOKEN
+    (`Authorization: Bearer ...`) ou, en DEBUG sans jeton configuré, aux
+    adresses de METRICS_ALLOWED_IPS (404 sinon).
+    """
+    if not _autorise(request):
+        raise Http404
+    return HttpResponse(registre.exporter(), content_type="text/plain; version=0.0.4; charset=utf-8")
@@ -0,0 +1,159 @@
+"""
+Instrumentation par requête : nombre et durée des requêtes SQL, temps de
+rendu, détection des motifs N+1.
+
+Un `execute_wrapper` est posé sur chaque connexion à sa création ; il
+rattache les requêtes SQL au relevé de la requête HTTP courante via une
+ContextVar, ce qui suit aussi les vues asynchrones (sync_to_async propage le
+contexte). Les totaux sont renvoyés dans l'en-tête `Server-Timing` et
+cumulés dans core.metrics ; le relevé reste disponible sur
+`request.releve_sql` (utilisé par la commande run_benchmarks).
+
+Une requête HTTP qui exécute plus de `N_PLUS_ONE_THRESHOLD` fois le même
+gabarit SQL de lecture (paramètres et listes IN neutralisés) est signalée
+dans les logs, les métriques et l'en-tête `Server-Timing`.
+"""
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.db import connections
+from django.db.backends.signals import connection_created
+
+from core.metrics import registre
+
+logger = logging.getLogger(__name__)
+
+_releve_courant = ContextVar("releve_sql", default=None)
+
+_LISTE_IN = re.compile(r"IN \((?:%s, )*%s\)")
+
+
+def _gabarit(sql):
+    return _LISTE_IN.sub("IN (...)", sql)
+
+
+class Releve:
+    """Mesures d'une requête HTTP."""
+
+    def __init__(self):
+        self.verrou = threading.Lock()
+        self.requetes = 0
+        self.duree_sql = 0.0
+        self.duree_rendu = 0.0
+        self.gabarits = Counter()
+
+    def ajouter(self, sql, duree):
+        with self.verrou:
+            self.requetes += 1
+            self.duree_sql += duree
+            self.gabarits[_gabarit(sql)] += 1
+
+
+def _instrumenter(execute, sql, params, many, context):
+    releve = _releve_courant.get()
+    if releve is None:
+        return execute(sql, params, many, context)
+    debut = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        releve.ajouter(sql, time.perf_counter() - debut)
+
+
+def _poser_wrapper(connection, **kwargs):
+    if _instrumenter not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_instrumenter)
+
+
+class InstrumentationMiddleware:
+    """
+    À placer en tête de MIDDLEWARE. Synchrone et asynchrone : sous ASGI, la
+    chaîne reste asynchrone jusqu'aux vues async au lieu d'être adaptée en
+    bloc par Django (async_to_sync dans un thread).
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(self.get_response):
+            markcoroutinefunction(self)
+        reglages = getattr(settings, "QUERY_INSTRUMENTATION", {})
+        self.seuil = reglages.get("N_PLUS_ONE_THRESHOLD", 10)
+        connection_created.connect(_poser_wrapper, dispatch_uid="core.middleware.instrumentation")
+        for connection in connections.all(initialized_only=True):
+            _poser_wrapper(connection)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        releve = request.releve_sql = Releve()
+        jeton = _releve_courant.set(releve)
+        debut = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _releve_courant.reset(jeton)
+        duree = time.perf_counter() - debut
+        self._publier(request, response, releve, duree)
+        return response
+
+    async def __acall__(self, request):
+        releve = request.releve_sql = Releve()
+        jeton = _releve_courant.set(releve)
+        debut = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _releve_courant.reset(jeton)
+        duree = time.perf_counter() - debut
+        self._publier(request, response, releve, duree)
+        return response
+
+    def process_template_response(self, request, response):
+        # Appelé juste avant le rendu (réponses DRF comprises).
+        releve = _releve_courant.get()
+        if releve is not None:
+            debut = time.perf_counter()
+
+            def fin_rendu(rendue):
+                releve.duree_rendu += time.perf_counter() - debut
+
+            response.add_post_render_callback(fin_rendu)
+        return response
+
+    def _publier(self, request, response, releve, duree):
+        match = getattr(request, "resolver_match", None)
+        endpoint = match.view_name if match and match.view_name else "inconnu"
+        labels = {"endpoint": endpoint, "method": request.method}
+
+        timings = [
+            f'db;dur={releve.duree_sql * 1000:.1f};desc="{releve.requetes} requêtes"',
+            f"render;dur={releve.duree_rendu * 1000:.1f}",
+            f"app;dur={duree * 1000:.1f}",
+        ]
+
+        # Lectures seulement : un bulk_create découpé en lots répète son INSERT.
+        lectures = [(sql, nombre) for sql, nombre in releve.gabarits.most_common() if sql.startswith("SELECT")]
+        gabarit, repetitions = (lectures or [(None, 0)])[0]
+        if repetitions > self.seuil:
+            logger.warning(
+                "N+1 probable sur %s %s (%s) : %d exécutions de « %s »",
+                request.method, request.path, endpoint, repetitions, gabarit,
+            )
+            registre.incrementer("db_repeated_queries_total", **labels)
+            timings.append(f'nplus1;desc="{repetitions} requêtes identiques"')
+
+        response["Server-Timing"] = ", ".join(timings)
+
+        registre.incrementer("http_requests_total", **labels, status=response.status_code)
+        registre.observer("http_request_duration_seconds", duree, **labels)
+        registre.incrementer("db_queries_total", releve.requetes, **labels)
+        registre.incrementer("db_query_duration_seconds_total", releve.duree_sql, **labels)
+        registre.incrementer("render_duration_seconds_total", releve.duree_rendu, **labels)
@@ -0,0 +1,29 @@
+# Generated by Django 5.0.13 on 2026-10-17 11:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='achat',
+            index=models.Index(fields=['date', 'id'], name='core_achat_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mouvementstock',
+            index=models.Index(fields=['date', 'id'], name='core_mvt_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['date', 'id'], name='core_transaction_date_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vente',
+            index=models.Index(fields=['date', 'id'], name='core_vente_date_id_idx'),
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.0.13 on 2026-10-17 11:11
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+from django.db.models.functions import TruncDate
+
+# (modèle de document, module de l'agrégat)
+MODULES = [
+    ("Vente", "VENTE"),
+    ("Achat", "ACHAT"),
+]
+
+
+def remplir_agregats(apps, schema_editor):
+    # Cumuls des documents existants, comme core.services.agregats.reconstruire ;
+    # les signaux les tiennent à jour ensuite.
+    AgregatJournalier = apps.get_model("core", "AgregatJournalier")
+    for document, module in MODULES:
+        Document = apps.get_model("core", document)
+        lignes = (
+            Document.objects.annotate(jour=TruncDate("date"))
+            .values("jour", "statut")
+            .annotate(somme=Sum("total"), nb=Count("id"))
+            .order_by()
+        )
+        AgregatJournalier.objects.bulk_create(
+            [
+                AgregatJournalier(
+                    module=module, jour=ligne["jour"], statut=ligne["statut"],
+                    total=ligne["somme"], nombre=ligne["nb"],
+                )
+                for ligne in lignes
+            ],
+            batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_keyset_date_id_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgregatJournalier',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('jour', models.DateField()),
+                ('module', models.CharField(choices=[('VENTE', 'Vente'), ('ACHAT', 'Achat')], max_length=10)),
+                ('statut', models.CharField(max_length=20)),
+                ('total', models.DecimalField(decimal_places=2, default=0, max_digits=14)),
+                ('nombre', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddConstraint(
+            model_name='agregatjournalier',
+            constraint=models.UniqueConstraint(fields=('module', 'statut', 'jour'), name='core_agregat_module_statut_jour'),
+        ),
+        migrations.RunPython(remplir_agregats, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.0.13 on 2026-10-17 11:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0003_agregat_journalier'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='achat',
+            index=models.Index(fields=['statut', 'date'], name='core_achat_statut_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='mouvementstock',
+            index=models.Index(fields=['produit', 'date'], name='core_mvt_produit_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='salaire',
+            index=models.Index(fields=['employe', 'periode'], name='core_salaire_employe_per_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['module', 'reference_id'], name='core_trans_module_ref_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='transaction',
+            index=models.Index(fields=['type', 'date'], name='core_transaction_type_date_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='vente',
+            index=models.Index(fields=['statut', 'date'], name='core_vente_statut_date_idx'),
+        ),
+    ]
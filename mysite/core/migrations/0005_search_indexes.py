@@ -0,0 +1,33 @@
+from django.db import migrations
+
+from core import search
+
+# Tables et colonnes figées à la date de la migration (voir core.search.CHAMPS).
+INDEX = [
+    ("core_produit", ("nom",)),
+    ("core_client", ("nom", "telephone", "email")),
+    ("core_fournisseur", ("nom", "telephone", "email")),
+]
+
+
+def creer(apps, schema_editor):
+    for table, colonnes in INDEX:
+        search.installer(schema_editor.connection, table, colonnes)
+
+
+def supprimer(apps, schema_editor):
+    for table, colonnes in INDEX:
+        search.desinstaller(schema_editor.connection, table, colonnes)
+
+
+class Migration(migrations.Migration):
+    # CREATE INDEX CONCURRENTLY ne peut pas s'exécuter dans une transaction.
+    atomic = False
+
+    dependencies = [
+        ('core', '0004_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(creer, supprimer),
+    ]
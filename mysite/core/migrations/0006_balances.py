@@ -0,0 +1,47 @@
+# Generated by Django 5.0.13 on 2026-10-17 12:15
+
+from django.db import migrations, models
+from django.db.models import F, Sum
+
+# (modèle de document, clé étrangère, modèle du tiers, statut d'annulation)
+DOCUMENTS = [
+    ("Vente", "client", "Client", "ANNULEE"),
+    ("Achat", "fournisseur", "Fournisseur", "ANNULE"),
+]
+
+
+def calculer_soldes(apps, schema_editor):
+    # Soldes jusqu'ici jamais tenus : calcul initial, ensuite maintenu par
+    # core.services.soldes.
+    for document, champ, tiers, statut_annule in DOCUMENTS:
+        Document = apps.get_model("core", document)
+        Tiers = apps.get_model("core", tiers)
+        soldes = (
+            Document.objects.exclude(statut=statut_annule)
+            .filter(**{f"{champ}__isnull": False})
+            .values_list(champ)
+            .annotate(du=Sum(F("total") - F("montant_paye")))
+            .order_by()
+        )
+        Tiers.objects.bulk_update(
+            [Tiers(pk=pk, solde=du) for pk, du in soldes], ["solde"], batch_size=1000,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_search_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='client',
+            index=models.Index(condition=models.Q(('solde__gt', 0)), fields=['-solde', 'id'], name='core_client_encours_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='fournisseur',
+            index=models.Index(condition=models.Q(('solde__gt', 0)), fields=['-solde', 'id'], name='core_fournisseur_encours_idx'),
+        ),
+        migrations.RunPython(calculer_soldes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 5.0.13 on 2026-10-17 12:17
+
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def verifier_doublons(apps, schema_editor):
+    # Des bulletins en double ne sont pas supprimés d'office : à régler à la main.
+    Salaire = apps.get_model("core", "Salaire")
+    doublons = list(
+        Salaire.objects.values_list("employe_id", "periode")
+        .annotate(nombre=Count("id")).filter(nombre__gt=1).order_by()[:20]
+    )
+    if doublons:
+        liste = ", ".join(f"employé {employe} / {periode} ({nombre})" for employe, periode, nombre in doublons)
+        raise RuntimeError(f"Salaires en double, à fusionner avant la migration : {liste}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_balances'),
+    ]
+
+    operations = [
+        migrations.RunPython(verifier_doublons, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='salaire',
+            name='core_salaire_employe_per_idx',
+        ),
+        migrations.AddConstraint(
+            model_name='salaire',
+            constraint=models.UniqueConstraint(fields=('periode', 'employe'), name='core_salaire_periode_uniq'),
+        ),
+    ]
@@ -0,0 +1,22 @@
+# Generated by Django 5.0.13 on 2026-10-17 12:18
+
+import django.db.models.expressions
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0007_payroll_unique_period'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='produit',
+            index=models.Index(django.db.models.expressions.CombinedExpression(models.F('stock_actuel'), '-', models.F('seuil_min')), models.F('id'), condition=models.Q(('stock_actuel__lt', models.F('seuil_min'))), name='core_produit_alerte_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='produit',
+            index=models.Index(models.F('categorie'), django.db.models.expressions.CombinedExpression(models.F('stock_actuel'), '-', models.F('seuil_min')), models.F('id'), condition=models.Q(('stock_actuel__lt', models.F('seuil_min'))), name='core_produit_alerte_cat_idx'),
+        ),
+    ]
@@ -14,6 +14,23 @@ class Produit(models.Model):
     seuil_min      = models.IntegerField(default=0)
     stock_actuel   = models.IntegerField(default=0)
 
+    class Meta:
+        # Index partiels : seuls les produits sous leur seuil y figurent, triés
+        # par écart (stock_actuel - seuil_min, le plus négatif en tête) ;
+        # servent l'action low-stock, avec ou sans filtre de catégorie.
+        indexes = [
+            models.Index(
+                models.F("stock_actuel") - models.F("seuil_min"), "id",
+                condition=models.Q(stock_actuel__lt=models.F("seuil_min")),
+                name="core_produit_alerte_idx",
+            ),
+            models.Index(
+                "categorie", models.F("stock_actuel") - models.F("seuil_min"), "id",
+                condition=models.Q(stock_actuel__lt=models.F("seuil_min")),
+                name="core_produit_alerte_cat_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.nom
 
@@ -24,6 +41,14 @@ class Client(models.Model):
     adresse   = models.TextField(blank=True)
     solde     = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
+    class Meta:
+        indexes = [
+            # Encours (solde > 0) du plus élevé au plus faible ; voir core.services.soldes.
+            models.Index(
+                fields=["-solde", "id"], condition=models.Q(solde__gt=0), name="core_client_encours_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.nom
 
@@ -34,6 +59,14 @@ class Fournisseur(models.Model):
     adresse   = models.TextField(blank=True)
     solde     = models.DecimalField(max_digits=12, decimal_places=2, default=0)
 
+    class Meta:
+        indexes = [
+            # Encours (solde > 0) du plus élevé au plus faible ; voir core.services.soldes.
+            models.Index(
+                fields=["-solde", "id"], condition=models.Q(solde__gt=0), name="core_fournisseur_encours_idx",
+            ),
+        ]
+
     def __str__(self):
         return self.nom
 
@@ -50,6 +83,12 @@ class Vente(models.Model):
     mode_paiement  = models.CharField(max_length=50, blank=True)
     statut         = models.CharField(max_length=20, choices=STATUT_CHOICES, default='EN_COURS')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "id"], name="core_vente_date_id_idx"),
+            models.Index(fields=["statut", "date"], name="core_vente_statut_date_idx"),
+        ]
+
     def __str__(self):
         return f"Vente #{self.id} - {self.client.nom if self.client else 'N/A'}"
 
@@ -73,6 +112,12 @@ class Achat(models.Model):
     montant_paye   = models.DecimalField(max_digits=12, decimal_places=2, default=0)
     statut         = models.CharField(max_length=20, choices=STATUT_CHOICES, default='EN_ATTENTE')
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "id"], name="core_achat_date_id_idx"),
+            models.Index(fields=["statut", "date"], name="core_achat_statut_date_idx"),
+        ]
+
     def __str__(self):
         return f"Achat #{self.id} - {self.fournisseur.nom if self.fournisseur else 'N/A'}"
 
@@ -88,9 +133,30 @@ class MouvementStock(models.Model):
     date         = models.DateTimeField(auto_now_add=True)
     type         = models.CharField(max_length=10, choices=TYPE_CHOICES)
     quantite     = models.DecimalField(max_digits=10, decimal_places=2)
-    source_type  = models.CharField(max_length=30, blank=True)  # VENTE / ACHAT / MANUEL
+    source_type  = models.CharField(max_length=30, blank=True)  # VENTE / ACHAT / MANUEL / IMPORT
     source_id    = models.IntegerField(blank=True, null=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "id"], name="core_mvt_date_id_idx"),
+            models.Index(fields=["produit", "date"], name="core_mvt_produit_date_idx"),
+        ]
+
+class StockSnapshot(models.Model):
+    """
+    Photo de Produit.stock_actuel à une date : point de reprise de la
+    reconstitution du stock passé (core.services.inventaire).
+    """
+    produit  = models.ForeignKey(Produit, on_delete=models.CASCADE, related_name="snapshots", db_index=False)
+    date     = models.DateTimeField()
+    quantite = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            # Sert aussi la recherche de la dernière photo d'un produit avant une date.
+            models.UniqueConstraint(fields=["produit", "date"], name="core_snapshot_produit_date"),
+        ]
+
 class Employe(models.Model):
     nom           = models.CharField(max_length=120)
     poste         = models.CharField(max_length=80)
@@ -109,6 +175,12 @@ class Salaire(models.Model):
     montant_paye  = models.DecimalField(max_digits=10, decimal_places=2)
     date_paiement = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        constraints = [
+            # Un salaire par employé et par période (upsert de core.services.paie).
+            models.UniqueConstraint(fields=["periode", "employe"], name="core_salaire_periode_uniq"),
+        ]
+
 class Transaction(models.Model):
     TYPE_CHOICES = [('RECETTE','Recette'), ('DEPENSE','Dépense')]
     date          = models.DateTimeField(auto_now_add=True)
@@ -117,3 +189,24 @@ class Transaction(models.Model):
     reference_id  = models.IntegerField()
     montant       = models.DecimalField(max_digits=12, decimal_places=2)
     description   = models.TextField(blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "id"], name="core_transaction_date_id_idx"),
+            models.Index(fields=["module", "reference_id"], name="core_trans_module_ref_idx"),
+            models.Index(fields=["type", "date"], name="core_transaction_type_date_idx"),
+        ]
+
+class AgregatJournalier(models.Model):
+    """Cumul quotidien des ventes / achats par statut (alimente le tableau de bord)."""
+    MODULE_CHOICES = [('VENTE','Vente'), ('ACHAT','Achat')]
+    jour    = models.DateField()
+    module  = models.CharField(max_length=10, choices=MODULE_CHOICES)
+    statut  = models.CharField(max_length=20)
+    total   = models.DecimalField(max_digits=14, decimal_places=2, default=0)
+    nombre  = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["module", "statut", "jour"], name="core_agregat_module_statut_jour"),
+        ]
@@ -0,0 +1,130 @@
+from django.db.models import Q
+from django.utils.dateparse import parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination, LimitOffsetPagination
+from rest_framework.utils.urls import remove_query_param
+
+
+class StandardLimitOffsetPagination(LimitOffsetPagination):
+    """
+    Pagination limit/offset pour les petites tables de référence
+    (produits, clients, fournisseurs...).
+    """
+    max_limit = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        # Un OFFSET sans ORDER BY ne garantit pas des pages stables.
+        if not queryset.ordered:
+            queryset = queryset.order_by("pk")
+        return super().paginate_queryset(queryset, request, view)
+
+
+class DateIdCursorPagination(CursorPagination):
+    """
+    Pagination par curseur (keyset) sur le couple (date, id).
+
+    Le curseur encode la date et l'id du dernier élément servi ; la page
+    suivante est obtenue, sans OFFSET, par
+    `WHERE date <= d AND (date < d OR (date = d AND id < i))`. La borne
+    `date <= d` est un intervalle de l'index (date, id) ; la disjonction, qui
+    seule ne s'y prête pas, ne fait qu'écarter les lignes de même date déjà
+    servies. Le coût d'une page reste donc le même quelle que soit la
+    profondeur de défilement.
+    """
+    ordering = ("-date", "-id")
+    page_size_query_param = "page_size"
+    max_page_size = 500
+
+    def paginate_queryset(self, queryset, request, view=None):
+        queryset = self._preparer(queryset, request)
+        if queryset is None:
+            return None
+        # Un élément de plus pour savoir s'il existe une page au-delà.
+        return self._terminer(list(queryset[:self.page_size + 1]))
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """Variante asynchrone (vues ASGI) : la page est lue avec `async for`."""
+        queryset = self._preparer(queryset, request)
+        if queryset is None:
+            return None
+        return self._terminer([item async for item in queryset[:self.page_size + 1]])
+
+    def _preparer(self, queryset, request):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        self.reverse = bool(self.cursor and self.cursor.reverse)
+        self.position = self.cursor.position if self.cursor else None
+
+        if self.reverse:
+            queryset = queryset.order_by("date", "id")
+        else:
+            queryset = queryset.order_by("-date", "-id")
+
+        if self.position is not None:
+            date, pk = self._decode_position(self.position)
+            # Borne simple sur date (parcours d'intervalle de l'index), puis
+            # départage des égalités par id.
+            if self.reverse:
+                queryset = queryset.filter(date__gte=date).filter(Q(date__gt=date) | Q(date=date, id__gt=pk))
+            else:
+                queryset = queryset.filter(date__lte=date).filter(Q(date__lt=date) | Q(date=date, id__lt=pk))
+        return queryset
+
+    def _terminer(self, results):
+        self.page = results[:self.page_size]
+        has_more = len(results) > len(self.page)
+
+        if self.reverse:
+            self.page.reverse()
+            self.has_next = True
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = self.position is not None
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        if not self.page:
+            # Page « précédente » vide : on repart du début de la liste.
+            return remove_query_param(self.base_url, self.cursor_query_param)
+        return self._link(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        if not self.page:
+            return self.encode_cursor(Cursor(offset=0, reverse=True, position=self.cursor.position))
+        return self._link(self.page[0], reverse=True)
+
+    def _link(self, item, reverse):
+        cursor = Cursor(offset=0, reverse=reverse, position=self._encode_position(item))
+        return self.encode_cursor(cursor)
+
+    @staticmethod
+    def _encode_position(item):
+        if isinstance(item, dict):
+            date, pk = item["date"], item["id"]
+        else:
+            date, pk = item.date, item.pk
+        return f"{date.isoformat()}|{pk}"
+
+    def _decode_position(self, position):
+        try:
+            date, pk = position.rsplit("|", 1)
+            date, pk = parse_datetime(date), int(pk)
+        except (AttributeError, TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        if date is None:
+            raise NotFound(self.invalid_cursor_message)
+        return date, pk
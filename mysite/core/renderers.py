@@ -0,0 +1,53 @@
+"""
+Rendu et lecture JSON de l'API avec orjson.
+
+orjson (extension Rust) encode nativement dict, list, str, datetime, date,
+time et UUID ; les autres types (Decimal, QuerySet, textes traduits...)
+passent par l'encodeur de DRF, ce qui garde exactement le JSON du
+JSONRenderer standard. Sans orjson installé, les deux classes se comportent
+comme celles de DRF.
+"""
+from rest_framework import renderers
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.utils import encoders
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    orjson = None
+
+_encodeur = encoders.JSONEncoder()
+
+if orjson is not None:
+    # Z pour UTC et microsecondes conservées : identique à l'encodeur DRF.
+    OPTIONS = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS
+
+
+class ORJSONRenderer(renderers.JSONRenderer):
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if orjson is None or data is None:
+            return super().render(data, accepted_media_type, renderer_context)
+        renderer_context = renderer_context or {}
+        # Indentation demandée (API navigable, ?indent) : chemin standard.
+        if self.get_indent(accepted_media_type, renderer_context):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        ret = orjson.dumps(data, default=_encodeur.default, option=OPTIONS)
+        # Comme DRF : U+2028 / U+2029 échappés, valides en JSON mais pas en JavaScript.
+        if b"\xe2\x80\xa8" in ret or b"\xe2\x80\xa9" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(b"\xe2\x80\xa9", b"\\u2029")
+        return ret
+
+
+class ORJSONParser(JSONParser):
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        if orjson is None:
+            return super().parse(stream, media_type, parser_context)
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError(f"JSON parse error - {exc}")
@@ -0,0 +1,233 @@
+"""
+Recherche sur les référentiels (produits, clients, fournisseurs).
+
+Le backend dépend du moteur de la base :
+
+- PostgreSQL : index GIN trigrammes (pg_trgm) sur `UPPER(champ)`, ceux que
+  l'ORM interroge pour `icontains` / `istartswith` ; classement par
+  `word_similarity`. Un B-tree `text_pattern_ops` sur `UPPER(nom)` sert les
+  préfixes d'un ou deux caractères de l'autocomplétion, que les trigrammes
+  couvrent mal.
+- SQLite : table FTS5 externe `<table>_fts` tenue à jour par triggers ;
+  recherche par préfixes de mots.
+- autre moteur (ou SQLite sans FTS5) : `icontains`, comme SearchFilter.
+
+Les index sont posés par la migration 0005 avec `installer` ; `CHAMPS` doit
+rester aligné avec elle. Sous SQLite, une migration qui reconstruit l'une de
+ces tables supprime ses triggers : relancer `rebuild_search_index`.
+`SEARCH_BACKEND` (chemin pointé) force un backend.
+"""
+import re
+import sqlite3
+from functools import lru_cache
+
+from django.conf import settings
+from django.contrib.postgres.search import TrigramWordSimilarity
+from django.db import connections, router
+from django.db.models import Case, Q, Value, When
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Greatest, Upper
+from django.utils.module_loading import import_string
+from rest_framework import filters
+
+# Champs indexés par modèle, le premier étant le libellé (autocomplétion).
+CHAMPS = {
+    "core.produit": ("nom",),
+    "core.client": ("nom", "telephone", "email"),
+    "core.fournisseur": ("nom", "telephone", "email"),
+}
+
+_MOT = re.compile(r"\w+")
+
+
+def champs(model):
+    return CHAMPS.get(model._meta.label_lower)
+
+
+class IContainsBackend:
+    """Recherche portable : chaque mot doit figurer dans l'un des champs."""
+
+    def rechercher(self, queryset, champs, terme, classer=True):
+        queryset = self.filtrer(queryset, champs, terme)
+        if classer:
+            queryset = queryset.annotate(pertinence=self._pertinence(champs, terme))
+            queryset = queryset.order_by("-pertinence", "pk")
+        return queryset
+
+    def suggerer(self, queryset, champs, terme):
+        libelle = champs[0]
+        return self.filtrer_debut(queryset, champs, terme).annotate(
+            debut=Case(When(**{f"{libelle}__istartswith": terme}, then=Value(0)), default=Value(1)),
+        ).order_by("debut", Upper(libelle), "pk")
+
+    def filtrer(self, queryset, champs, terme):
+        for mot in terme.split():
+            condition = Q()
+            for champ in champs:
+                condition |= Q(**{f"{champ}__icontains": mot})
+            queryset = queryset.filter(condition)
+        return queryset
+
+    def filtrer_debut(self, queryset, champs, terme):
+        """Un champ, ou un mot du libellé, commence par `terme`."""
+        condition = Q(**{f"{champs[0]}__icontains": f" {terme}"})
+        for champ in champs:
+            condition |= Q(**{f"{champ}__istartswith": terme})
+        return queryset.filter(condition)
+
+    def _pertinence(self, champs, terme):
+        # Libellé commençant par le terme d'abord.
+        return Case(When(**{f"{champs[0]}__istartswith": terme}, then=Value(1.0)), default=Value(0.0))
+
+
+class PostgresBackend(IContainsBackend):
+    """
+    Mêmes filtres que IContainsBackend : sous PostgreSQL, `icontains`
+    s'écrit `UPPER(champ::text) LIKE UPPER('%mot%')`, servi par les index
+    GIN trigrammes. Seul le classement change.
+    """
+
+    def _pertinence(self, champs, terme):
+        similarites = [TrigramWordSimilarity(terme, champ) for champ in champs]
+        return Greatest(*similarites) if len(similarites) > 1 else similarites[0]
+
+
+class SQLiteFTSBackend(IContainsBackend):
+    """
+    Filtre par la table FTS5 `<table>_fts`, chaque mot cherché comme
+    préfixe. Le classement reste celui d'IContainsBackend : un `rank` bm25
+    exigerait une sous-requête MATCH corrélée, réévaluée pour chaque ligne.
+    """
+
+    def filtrer(self, queryset, champs, terme):
+        mots = _MOT.findall(terme)
+        if not mots:
+            return queryset.none()
+        fts = f"{queryset.model._meta.db_table}_fts"
+        requete = " ".join(f'"{mot}"*' for mot in mots)
+        return queryset.filter(pk__in=RawSQL(f"SELECT rowid FROM {fts} WHERE {fts} MATCH %s", [requete]))
+
+    filtrer_debut = filtrer
+
+
+@lru_cache(maxsize=None)
+def fts5_disponible():
+    try:
+        sqlite3.connect(":memory:").execute("CREATE VIRTUAL TABLE t USING fts5(x)")
+    except sqlite3.OperationalError:
+        return False
+    return True
+
+
+def backend(using="default"):
+    chemin = getattr(settings, "SEARCH_BACKEND", None)
+    if chemin:
+        return import_string(chemin)()
+    vendor = connections[using].vendor
+    if vendor == "postgresql":
+        return PostgresBackend()
+    if vendor == "sqlite" and fts5_disponible():
+        return SQLiteFTSBackend()
+    return IContainsBackend()
+
+
+def rechercher(queryset, terme, classer=True):
+    """
+    Filtre `queryset` sur `terme` ; avec `classer`, l'annote d'une
+    `pertinence` et le trie par pertinence décroissante.
+    """
+    return backend(router.db_for_read(queryset.model)).rechercher(
+        queryset, champs(queryset.model), terme, classer,
+    )
+
+
+def suggerer(queryset, terme, limite=10):
+    """Autocomplétion : débuts de libellé en tête."""
+    return backend(router.db_for_read(queryset.model)).suggerer(
+        queryset, champs(queryset.model), terme,
+    )[:limite]
+
+
+def correspondances(model, terme):
+    """Sous-requête des pk de `model` correspondant à `terme` (filtre `xxx__in`)."""
+    return rechercher(model._default_manager.all(), terme, classer=False).values("pk")
+
+
+class RechercheFilter(filters.SearchFilter):
+    """
+    SearchFilter passant par le backend de recherche pour les modèles de
+    `CHAMPS` (résultats triés par pertinence) ; `search_fields` sinon.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        termes = self.get_search_terms(request)
+        if not termes or champs(queryset.model) is None:
+            return super().filter_queryset(request, queryset, view)
+        return rechercher(queryset, " ".join(termes))
+
+
+# ─── Index (migration 0005, commande rebuild_search_index) ───────────────
+
+def _sql_postgres(table, colonnes):
+    yield "CREATE EXTENSION IF NOT EXISTS pg_trgm"
+    for colonne in colonnes:
+        yield (
+            f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_{colonne}_trgm "
+            f"ON {table} USING gin (UPPER({colonne}::text) gin_trgm_ops)"
+        )
+    yield (
+        f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {table}_{colonnes[0]}_prefixe "
+        f"ON {table} (UPPER({colonnes[0]}::text) text_pattern_ops)"
+    )
+
+
+def _sql_sqlite(table, colonnes):
+    fts = f"{table}_fts"
+    liste = ", ".join(colonnes)
+    nouveau = ", ".join(f"new.{colonne}" for colonne in colonnes)
+    ancien = ", ".join(f"old.{colonne}" for colonne in colonnes)
+    supprimer = f"INSERT INTO {fts}({fts}, rowid, {liste}) VALUES ('delete', old.id, {ancien});"
+    inserer = f"INSERT INTO {fts}(rowid, {liste}) VALUES (new.id, {nouveau});"
+    yield from _sql_sqlite_suppression(table)
+    yield (
+        f"CREATE VIRTUAL TABLE {fts} USING fts5({liste}, content='{table}', content_rowid='id', "
+        f"tokenize='unicode61 remove_diacritics 2', prefix='1 2 3')"
+    )
+    yield f"CREATE TRIGGER {fts}_ai AFTER INSERT ON {table} BEGIN {inserer} END"
+    yield f"CREATE TRIGGER {fts}_ad AFTER DELETE ON {table} BEGIN {supprimer} END"
+    yield f"CREATE TRIGGER {fts}_au AFTER UPDATE OF {liste} ON {table} BEGIN {supprimer} {inserer} END"
+    yield f"INSERT INTO {fts}({fts}) VALUES ('rebuild')"
+
+
+def _sql_sqlite_suppression(table):
+    fts = f"{table}_fts"
+    for suffixe in ("ai", "ad", "au"):
+        yield f"DROP TRIGGER IF EXISTS {fts}_{suffixe}"
+    yield f"DROP TABLE IF EXISTS {fts}"
+
+
+def installer(connection, table, colonnes):
+    """Crée (ou recrée) les index de recherche de `table` sur `connection`."""
+    if connection.vendor == "postgresql":
+        instructions = _sql_postgres(table, colonnes)
+    elif connection.vendor == "sqlite" and fts5_disponible():
+        instructions = _sql_sqlite(table, colonnes)
+    else:
+        return
+    with connection.cursor() as cursor:
+        for sql in instructions:
+            cursor.execute(sql)
+
+
+def desinstaller(connection, table, colonnes):
+    if connection.vendor == "postgresql":
+        instructions = [
+            f"DROP INDEX CONCURRENTLY IF EXISTS {table}_{colonne}_trgm" for colonne in colonnes
+        ] + [f"DROP INDEX CONCURRENTLY IF EXISTS {table}_{colonnes[0]}_prefixe"]
+    elif connection.vendor == "sqlite":
+        instructions = _sql_sqlite_suppression(table)
+    else:
+        return
+    with connection.cursor() as cursor:
+        for sql in instructions:
+            cursor.execute(sql)
@@ -1,12 +1,12 @@
 # core/serializers/__init__.py
 from .base import (
-    CategorieProduitSerializer, ProduitSerializer,
+    CategorieProduitSerializer, ProduitSerializer, ProduitAlerteSerializer, ProduitStockSerializer,
     ClientSerializer, FournisseurSerializer
 )
-from .vente import VenteSerializer, LigneVenteSerializer
-from .achat import AchatSerializer, LigneAchatSerializer
+from .vente import VenteSerializer, LigneVenteSerializer, VENTE_PROJECTION
+from .achat import AchatSerializer, LigneAchatSerializer, ACHAT_PROJECTION
 from .stock import MouvementStockSerializer
-from .rh import EmployeSerializer, SalaireSerializer
+from .rh import EmployeSerializer, LancerPaieSerializer, SalaireSerializer
 from .transaction import TransactionSerializer
 
 # Ajoutez cette ligne pour importer le sérialiseur du dashboard
@@ -14,12 +14,12 @@ from .dashboard import DashboardStatsSerializer
 
 # Optionnel : vous pouvez l'ajouter à __all__ si vous voulez l'exporter explicitement
 __all__ = [
-    'CategorieProduitSerializer', 'ProduitSerializer',
+    'CategorieProduitSerializer', 'ProduitSerializer', 'ProduitAlerteSerializer', 'ProduitStockSerializer',
     'ClientSerializer', 'FournisseurSerializer',
-    'VenteSerializer', 'LigneVenteSerializer',
-    'AchatSerializer', 'LigneAchatSerializer',
+    'VenteSerializer', 'LigneVenteSerializer', 'VENTE_PROJECTION',
+    'AchatSerializer', 'LigneAchatSerializer', 'ACHAT_PROJECTION',
     'MouvementStockSerializer',
-    'EmployeSerializer', 'SalaireSerializer',
+    'EmployeSerializer', 'LancerPaieSerializer', 'SalaireSerializer',
     'TransactionSerializer',
     'DashboardStatsSerializer'  # Ajout du nouveau sérialiseur
 ]
\ No newline at end of file
@@ -1,9 +1,13 @@
+from django.db import transaction
 from rest_framework import serializers
 from core.models import LigneAchat, Achat, Produit, Fournisseur
+from core.services import stock
+from .projection import Projection
+from .lignes import BulkPrimaryKeyRelatedField, BulkRelatedListSerializer, attacher_lignes
 
 class LigneAchatSerializer(serializers.ModelSerializer):
     produit = serializers.StringRelatedField(read_only=True)
-    produit_id = serializers.PrimaryKeyRelatedField(
+    produit_id = BulkPrimaryKeyRelatedField(
         source="produit",
         queryset=Produit.objects.all(),
         write_only=True
@@ -11,6 +15,8 @@ class LigneAchatSerializer(serializers.ModelSerializer):
     class Meta:
         model = LigneAchat
         fields = "__all__"
+        read_only_fields = ("achat",)
+        list_serializer_class = BulkRelatedListSerializer
 
 class AchatSerializer(serializers.ModelSerializer):
     fournisseur = serializers.StringRelatedField(read_only=True)
@@ -28,7 +34,32 @@ class AchatSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         lignes_data = validated_data.pop("lignes")
-        achat = Achat.objects.create(**validated_data)
-        for line in lignes_data:
-            LigneAchat.objects.create(achat=achat, **line)
-        return achat
+        with transaction.atomic():
+            achat = Achat.objects.create(**validated_data)
+            lignes = LigneAchat.objects.bulk_create(
+                [LigneAchat(achat=achat, **line) for line in lignes_data]
+            )
+            stock.enregistrer_document(achat, lignes)
+        return attacher_lignes(achat, lignes)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            # Verrou sur l'en-tête : deux annulations simultanées ne doivent
+            # pas remettre deux fois le stock en place.
+            ancien_statut = (
+                Achat.objects.select_for_update()
+                .values_list("statut", flat=True).get(pk=instance.pk)
+            )
+            instance = super().update(instance, validated_data)
+            stock.suivre_statut(instance, ancien_statut)
+        return instance
+
+
+# Lecture rapide (list / retrieve) : même JSON que AchatSerializer.
+ACHAT_PROJECTION = Projection(
+    AchatSerializer,
+    libelles={"fournisseur": "fournisseur__nom"},
+    imbriques={
+        "lignes": Projection(LigneAchatSerializer, libelles={"produit": "produit__nom"}, parent="achat"),
+    },
+)
@@ -17,12 +17,47 @@ class ProduitSerializer(serializers.ModelSerializer):
         model = Produit
         fields = "__all__"
 
-class ClientSerializer(serializers.ModelSerializer):
+class ProduitAlerteSerializer(ProduitSerializer):
+    """Produit sous son seuil : `manque` = seuil_min - stock_actuel."""
+    manque = serializers.IntegerField(read_only=True)
+
+
+class ProduitStockSerializer(serializers.ModelSerializer):
+    """
+    Stock d'un produit à une date (core.services.inventaire.annoter_stock) :
+    photo de départ et stock reconstitué.
+    """
+    date_reference = serializers.DateTimeField(read_only=True, allow_null=True)
+    stock_reference = serializers.IntegerField(read_only=True)
+    stock = serializers.DecimalField(max_digits=14, decimal_places=2, read_only=True)
+
+    class Meta:
+        model = Produit
+        fields = ["id", "nom", "categorie", "unite", "date_reference", "stock_reference", "stock"]
+
+
+class TiersSerializer(serializers.ModelSerializer):
+    """
+    Client / fournisseur : `solde` est tenu par core.services.soldes. Une
+    modification n'écrit que les champs reçus, pour ne pas écraser un solde
+    mis à jour entre la lecture et l'enregistrement.
+    """
+
+    def update(self, instance, validated_data):
+        for attr, value in validated_data.items():
+            setattr(instance, attr, value)
+        instance.save(update_fields=list(validated_data))
+        return instance
+
+
+class ClientSerializer(TiersSerializer):
     class Meta:
         model = Client
         fields = "__all__"
+        read_only_fields = ("solde",)
 
-class FournisseurSerializer(serializers.ModelSerializer):
+class FournisseurSerializer(TiersSerializer):
     class Meta:
         model = Fournisseur
         fields = "__all__"
+        read_only_fields = ("solde",)
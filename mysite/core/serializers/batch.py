@@ -0,0 +1,42 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+class SousRequeteSerializer(serializers.Serializer):
+    methode = serializers.ChoiceField(choices=["GET", "POST", "PUT", "PATCH", "DELETE"])
+    chemin = serializers.CharField(help_text="Chemin de l'API, chaîne de requête comprise (/api/produits/?search=eau)")
+    corps = serializers.JSONField(required=False, allow_null=True, help_text="Corps JSON (écritures)")
+
+    def validate_chemin(self, value):
+        # Le lot lui-même est refusé à l'exécution, d'après la vue résolue.
+        if not value.startswith("/api/") or "#" in value:
+            raise serializers.ValidationError("Chemin de l'API attendu (/api/...), sans fragment (#).")
+        return value
+
+
+class BatchSerializer(serializers.Serializer):
+    """
+    Sous-requêtes exécutées dans l'ordre. Avec `atomique`, elles partagent
+    une transaction annulée dès la première réponse en erreur.
+    """
+    requetes = SousRequeteSerializer(many=True, allow_empty=False)
+    atomique = serializers.BooleanField(default=False)
+
+    def validate_requetes(self, value):
+        if len(value) > settings.BATCH_MAX_REQUESTS:
+            raise serializers.ValidationError(f"{settings.BATCH_MAX_REQUESTS} sous-requêtes au plus.")
+        return value
+
+
+class SousReponseSerializer(serializers.Serializer):
+    statut = serializers.IntegerField()
+    entetes = serializers.DictField(child=serializers.CharField())
+    corps = serializers.JSONField(allow_null=True)
+
+
+class BatchReponseSerializer(serializers.Serializer):
+    reponses = SousReponseSerializer(many=True)
+    annule = serializers.BooleanField(
+        help_text="Mode atomique : une sous-requête a échoué, toutes ses écritures et celles des précédentes "
+                  "ont été annulées et les suivantes n'ont pas été exécutées",
+    )
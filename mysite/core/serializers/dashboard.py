@@ -44,4 +44,27 @@ class HistoriqueVentesSerializer(serializers.Serializer):
     )
 
     class Meta:
-        fields = ['date', 'total_ventes', 'nombre_ventes', 'montant_moyen']
\ No newline at end of file
+        fields = ['date', 'total_ventes', 'nombre_ventes', 'montant_moyen']
+
+
+class ValorisationSerializer(serializers.Serializer):
+    """Quantité et valeur d'un ensemble de produits."""
+    produits = serializers.IntegerField(help_text="Nombre de produits")
+    quantite = serializers.DecimalField(max_digits=16, decimal_places=2, help_text="Somme des stocks")
+    valeur = serializers.DecimalField(
+        max_digits=18, decimal_places=2, help_text="Somme de stock × prix_unitaire"
+    )
+
+
+class ValorisationCategorieSerializer(ValorisationSerializer):
+    categorie = serializers.IntegerField(allow_null=True, help_text="Id de la catégorie (null : sans catégorie)")
+    nom = serializers.CharField(allow_null=True)
+
+
+class ValorisationStockSerializer(serializers.Serializer):
+    """
+    Valorisation du stock par catégorie, actuelle ou à une date (`date`).
+    """
+    date = serializers.DateTimeField(allow_null=True, help_text="Date demandée (null : stock actuel)")
+    categories = ValorisationCategorieSerializer(many=True)
+    total = ValorisationSerializer()
@@ -0,0 +1,79 @@
+from django.db import models
+from django.db.models import prefetch_related_objects
+from rest_framework import serializers
+
+# Attribut posé par attacher_lignes sur le document créé.
+ATTRIBUT_LIGNES_ECRITES = "lignes_ecrites"
+
+
+class BulkRelatedListSerializer(serializers.ListSerializer):
+    """
+    ListSerializer des lignes (vente, achat) : résout en une seule requête
+    `IN` tous les objets référencés par `bulk_field` avant de valider les
+    lignes une à une, au lieu d'un SELECT par ligne.
+    """
+    bulk_field = "produit_id"
+
+    def to_internal_value(self, data):
+        self.bulk_objects = {}
+        if isinstance(data, list):
+            ids = set()
+            for row in data:
+                value = row.get(self.bulk_field) if isinstance(row, dict) else None
+                if value is None or isinstance(value, bool):
+                    continue
+                try:
+                    ids.add(int(value))
+                except (TypeError, ValueError):
+                    continue
+            if ids:
+                queryset = self.child.fields[self.bulk_field].get_queryset()
+                self.bulk_objects = queryset.in_bulk(ids)
+        return super().to_internal_value(data)
+
+    def get_attribute(self, instance):
+        # Lignes que le sérialiseur parent vient d'écrire (attacher_lignes) :
+        # sérialisées telles quelles, sans relire la base.
+        ecrites = getattr(instance, ATTRIBUT_LIGNES_ECRITES, None)
+        if ecrites is not None:
+            return ecrites
+        return super().get_attribute(instance)
+
+    def to_representation(self, data):
+        # Après un update, DRF vide le cache de prefetch de l'en-tête : on
+        # recharge alors les objets liés en une requête plutôt qu'une par ligne.
+        if isinstance(data, models.manager.BaseManager):
+            data = list(data.all())
+            prefetch_related_objects(data, self.child.fields[self.bulk_field].source)
+        return super().to_representation(data)
+
+
+class BulkPrimaryKeyRelatedField(serializers.PrimaryKeyRelatedField):
+    """
+    PrimaryKeyRelatedField qui lit d'abord les objets pré-chargés par
+    `BulkRelatedListSerializer` ; se comporte normalement hors de ce contexte.
+    """
+
+    def to_internal_value(self, data):
+        list_serializer = getattr(self.parent, "parent", None)
+        preloaded = getattr(list_serializer, "bulk_objects", None)
+        if preloaded is None or isinstance(data, bool):
+            return super().to_internal_value(data)
+        try:
+            pk = int(data)
+        except (TypeError, ValueError):
+            return super().to_internal_value(data)
+        try:
+            return preloaded[pk]
+        except KeyError:
+            self.fail("does_not_exist", pk_value=data)
+
+
+def attacher_lignes(instance, lignes):
+    """
+    Attache à `instance` les lignes déjà en mémoire (attribut simple, comme
+    un Prefetch(to_attr=...)) : BulkRelatedListSerializer les sérialise sans
+    relire la base.
+    """
+    setattr(instance, ATTRIBUT_LIGNES_ECRITES, list(lignes))
+    return instance
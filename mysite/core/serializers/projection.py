@@ -0,0 +1,101 @@
+from collections import defaultdict
+
+from django.utils.functional import cached_property
+from rest_framework import serializers
+
+
+class Projection:
+    """
+    Chemin de lecture rapide d'un ModelSerializer : lit les lignes avec
+    `.values()` et les convertit en dict sans instancier de modèles ni
+    parcourir l'arbre de champs DRF pour chaque objet.
+
+    Le plan (colonnes à lire, conversion de chaque champ) est calculé une
+    fois à partir des champs lisibles du sérialiseur, dans le même ordre :
+    le JSON produit est identique à celui du sérialiseur.
+
+    - `libelles` : champs StringRelatedField -> colonne donnant le même texte
+      que `__str__` (ex. {"client": "client__nom"}) ;
+    - `imbriques` : champs imbriqués (many=True) -> Projection des enfants,
+      lus en une requête pour tous les parents ;
+    - `parent` : pour une projection imbriquée, nom de la clé étrangère vers
+      le parent.
+    """
+
+    def __init__(self, serializer_class, libelles=None, imbriques=None, parent=None):
+        self.serializer_class = serializer_class
+        self.libelles = libelles or {}
+        self.imbriques = imbriques or {}
+        self.parent = parent
+
+    @cached_property
+    def model(self):
+        return self.serializer_class.Meta.model
+
+    @cached_property
+    def _plan(self):
+        champs = []
+        for field in self.serializer_class()._readable_fields:
+            nom = field.field_name
+            if nom in self.imbriques:
+                champs.append((nom, None, self.imbriques[nom]))
+            elif nom in self.libelles:
+                champs.append((nom, self.libelles[nom], None))
+            elif "." in field.source or field.source == "*":
+                raise ValueError(f"{self.serializer_class.__name__}.{nom} : source non projetable.")
+            elif isinstance(field, serializers.PrimaryKeyRelatedField):
+                champs.append((nom, f"{field.source}_id", None))
+            elif isinstance(field, serializers.RelatedField):
+                raise ValueError(f"{self.serializer_class.__name__}.{nom} : ajoutez-le à `libelles`.")
+            else:
+                champs.append((nom, field.source, field.to_representation))
+        return champs
+
+    @cached_property
+    def colonnes(self):
+        colonnes = ["id"]
+        for _, colonne, _ in self._plan:
+            if colonne is not None and colonne not in colonnes:
+                colonnes.append(colonne)
+        if self.parent is not None and f"{self.parent}_id" not in colonnes:
+            colonnes.append(f"{self.parent}_id")
+        return colonnes
+
+    def serialiser(self, lignes):
+        """Convertit des dicts lus avec `.values(*self.colonnes)`."""
+        lignes = list(lignes)
+        enfants = {
+            nom: projection.par_parent([ligne["id"] for ligne in lignes])
+            for nom, projection in self.imbriques.items()
+        }
+        plan = self._plan
+        resultat = []
+        for ligne in lignes:
+            data = {}
+            for nom, colonne, conversion in plan:
+                if colonne is None:
+                    data[nom] = enfants[nom].get(ligne["id"], [])
+                    continue
+                valeur = ligne[colonne]
+                if valeur is not None and conversion is not None:
+                    valeur = conversion(valeur)
+                data[nom] = valeur
+            resultat.append(data)
+        return resultat
+
+    def par_parent(self, ids):
+        """{id parent: [enfants sérialisés]} en une requête."""
+        if not ids:
+            return {}
+        cle = f"{self.parent}_id"
+        lignes = list(
+            self.model.objects.filter(**{f"{cle}__in": ids}).order_by("pk").values(*self.colonnes)
+        )
+        groupes = defaultdict(list)
+        for ligne, data in zip(lignes, self.serialiser(lignes)):
+            groupes[ligne[cle]].append(data)
+        return groupes
+
+    def queryset(self, queryset):
+        """Le queryset (déjà filtré) réduit aux colonnes de la projection."""
+        return queryset.select_related(None).prefetch_related(None).values(*self.colonnes)
@@ -1,5 +1,6 @@
 from rest_framework import serializers
 from core.models import Employe, Salaire
+from core.services import paie
 
 class EmployeSerializer(serializers.ModelSerializer):
     class Meta:
@@ -16,3 +17,22 @@ class SalaireSerializer(serializers.ModelSerializer):
     class Meta:
         model = Salaire
         fields = "__all__"
+
+    def validate_periode(self, value):
+        try:
+            paie.bornes(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
+
+
+class LancerPaieSerializer(serializers.Serializer):
+    """Corps de l'action run-payroll."""
+    periode = serializers.CharField(help_text="Période au format AAAA-MM (ex. 2025-06)")
+
+    def validate_periode(self, value):
+        try:
+            paie.bornes(value)
+        except ValueError as e:
+            raise serializers.ValidationError(str(e))
+        return value
@@ -1,9 +1,13 @@
+from django.db import transaction
 from rest_framework import serializers
 from core.models import LigneVente, Vente, Produit, Client
+from core.services import stock
+from .projection import Projection
+from .lignes import BulkPrimaryKeyRelatedField, BulkRelatedListSerializer, attacher_lignes
 
 class LigneVenteSerializer(serializers.ModelSerializer):
     produit = serializers.StringRelatedField(read_only=True)
-    produit_id = serializers.PrimaryKeyRelatedField(
+    produit_id = BulkPrimaryKeyRelatedField(
         source="produit",
         queryset=Produit.objects.all(),
         write_only=True
@@ -11,6 +15,8 @@ class LigneVenteSerializer(serializers.ModelSerializer):
     class Meta:
         model = LigneVente
         fields = "__all__"
+        read_only_fields = ("vente",)
+        list_serializer_class = BulkRelatedListSerializer
 
 class VenteSerializer(serializers.ModelSerializer):
     client = serializers.StringRelatedField(read_only=True)
@@ -28,7 +34,32 @@ class VenteSerializer(serializers.ModelSerializer):
 
     def create(self, validated_data):
         lignes_data = validated_data.pop("lignes")
-        vente = Vente.objects.create(**validated_data)
-        for line in lignes_data:
-            LigneVente.objects.create(vente=vente, **line)
-        return vente
+        with transaction.atomic():
+            vente = Vente.objects.create(**validated_data)
+            lignes = LigneVente.objects.bulk_create(
+                [LigneVente(vente=vente, **line) for line in lignes_data]
+            )
+            stock.enregistrer_document(vente, lignes)
+        return attacher_lignes(vente, lignes)
+
+    def update(self, instance, validated_data):
+        with transaction.atomic():
+            # Verrou sur l'en-tête : deux annulations simultanées ne doivent
+            # pas remettre deux fois le stock en place.
+            ancien_statut = (
+                Vente.objects.select_for_update()
+                .values_list("statut", flat=True).get(pk=instance.pk)
+            )
+            instance = super().update(instance, validated_data)
+            stock.suivre_statut(instance, ancien_statut)
+        return instance
+
+
+# Lecture rapide (list / retrieve) : même JSON que VenteSerializer.
+VENTE_PROJECTION = Projection(
+    VenteSerializer,
+    libelles={"client": "client__nom"},
+    imbriques={
+        "lignes": Projection(LigneVenteSerializer, libelles={"produit": "produit__nom"}, parent="vente"),
+    },
+)
@@ -0,0 +1,6 @@
+"""
+Services métier de l'application core.
+
+Logique partagée entre serializers, vues et commandes de gestion
+(mise à jour du stock, agrégats, soldes...).
+"""
@@ -0,0 +1,69 @@
+"""
+Cumuls quotidiens des ventes et achats (table AgregatJournalier).
+
+Chaque vente / achat compte dans la case (module, statut, jour local) de sa
+date. Les signaux de core.signals maintiennent ces cases à chaque écriture ;
+la commande `rebuild_daily_aggregates` les recalcule de zéro.
+"""
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F, Sum
+from django.db.models.functions import TruncDate
+from django.utils import timezone
+
+from core.models import Achat, AgregatJournalier, Vente
+
+MODULES = {
+    Vente: "VENTE",
+    Achat: "ACHAT",
+}
+
+
+def cumuler(module, jour, statut, total, nombre):
+    """Ajoute (total, nombre) à la case (module, statut, jour), créée au besoin."""
+    if not total and not nombre:
+        return
+    case = AgregatJournalier.objects.filter(module=module, statut=statut, jour=jour)
+    if case.update(total=F("total") + total, nombre=F("nombre") + nombre):
+        return
+    try:
+        with transaction.atomic():
+            AgregatJournalier.objects.create(
+                module=module, statut=statut, jour=jour, total=total, nombre=nombre,
+            )
+    except IntegrityError:
+        # Créée entre-temps par une transaction concurrente.
+        case.update(total=F("total") + total, nombre=F("nombre") + nombre)
+
+
+def ajouter(document, signe=1):
+    """Compte (signe=1) ou décompte (signe=-1) un document dans sa case."""
+    cumuler(
+        MODULES[type(document)],
+        timezone.localdate(document.date),
+        document.statut,
+        signe * document.total,
+        signe,
+    )
+
+
+def reconstruire():
+    """Recalcule toute la table à partir des ventes et achats. Renvoie le nombre de cases."""
+    with transaction.atomic():
+        cases = []
+        for model, module in MODULES.items():
+            lignes = (
+                model.objects.annotate(jour=TruncDate("date"))
+                .values("jour", "statut")
+                .annotate(somme=Sum("total"), nb=Count("id"))
+                .order_by()
+            )
+            cases.extend(
+                AgregatJournalier(
+                    module=module, jour=ligne["jour"], statut=ligne["statut"],
+                    total=ligne["somme"], nombre=ligne["nb"],
+                )
+                for ligne in lignes
+            )
+        AgregatJournalier.objects.all().delete()
+        AgregatJournalier.objects.bulk_create(cases, batch_size=1000)
+    return len(cases)
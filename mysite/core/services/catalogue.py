@@ -0,0 +1,197 @@
+"""
+Import en masse des référentiels (produits, clients, fournisseurs).
+
+Les lignes (CSV ou JSON) sont validées par lots avec les champs du modèle.
+Une ligne sans `id` est créée par `bulk_create` (colonnes absentes :
+valeur par défaut du champ) ; une ligne portant l'`id` d'un enregistrement
+existant le met à jour par `bulk_update`, en ne réécrivant que les colonnes
+présentes dans la ligne (l'en-tête pour un CSV).
+Les catégories de produits sont résolues par nom en une requête par lot et
+les catégories manquantes créées en bloc.
+
+`stock_actuel` n'est jamais écrit directement : la quantité importée est
+atteinte par des mouvements d'écart (core.services.stock.ajuster), pour
+que le journal MouvementStock reste la source du stock.
+"""
+import csv
+import io
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from core import cache as cache_api
+from core.models import CategorieProduit, Client, Fournisseur, Produit
+from core.services import stock
+
+CATALOGUES = {
+    "produits": (Produit, ("nom", "unite", "prix_unitaire", "seuil_min", "stock_actuel")),
+    "clients": (Client, ("nom", "telephone", "email", "adresse")),
+    "fournisseurs": (Fournisseur, ("nom", "telephone", "email", "adresse")),
+}
+
+TAILLE_LOT = 2000
+
+
+def lire_lignes(source, format_fichier):
+    """
+    Itère sur les lignes (dict) d'un fichier CSV ou JSON (binaire ou texte).
+    ValueError si le fichier n'est pas lisible (encodage autre que UTF-8,
+    CSV ou JSON malformé).
+
+    Un CSV est parcouru une première fois avant d'être rendu : l'erreur est
+    levée ici, avant qu'un lot soit importé, plutôt qu'au milieu de l'import.
+    """
+    if isinstance(source, (bytes, str)):
+        source = io.BytesIO(source.encode() if isinstance(source, str) else source)
+    texte = io.TextIOWrapper(source, encoding="utf-8-sig", newline="")
+    if format_fichier == "csv":
+        numero = 0
+        try:
+            for numero, _ in enumerate(csv.reader(texte, strict=True), start=1):
+                pass
+        except UnicodeDecodeError:
+            raise ValueError("Fichier illisible : encodage UTF-8 attendu.")
+        except csv.Error as e:
+            raise ValueError(f"CSV illisible (ligne {numero + 1}) : {e}")
+        texte.seek(0)
+        return csv.DictReader(texte)
+    donnees = json.load(texte)
+    if isinstance(donnees, dict):
+        donnees = donnees.get("rows", [])
+    return donnees
+
+
+def _nettoyer(field, brut):
+    if isinstance(brut, str):
+        brut = brut.strip()
+    if brut is None or brut == "":
+        if field.null:
+            return None
+        if field.has_default():
+            return field.get_default()
+        if field.blank:
+            return ""
+    return field.clean(brut, None)
+
+
+class _ResolveurCategories:
+    """Résout les catégories par nom, avec un cache partagé entre les lots."""
+
+    def __init__(self):
+        self.par_nom = {}
+
+    def resoudre(self, noms):
+        inconnus = {nom for nom in noms if nom not in self.par_nom}
+        if not inconnus:
+            return
+        self.par_nom.update(
+            CategorieProduit.objects.filter(nom__in=inconnus).values_list("nom", "id")
+        )
+        manquants = inconnus - self.par_nom.keys()
+        if manquants:
+            CategorieProduit.objects.bulk_create(
+                [CategorieProduit(nom=nom) for nom in manquants], ignore_conflicts=True
+            )
+            self.par_nom.update(
+                CategorieProduit.objects.filter(nom__in=manquants).values_list("nom", "id")
+            )
+
+
+def importer(catalogue, lignes, taille_lot=TAILLE_LOT):
+    """
+    Importe les lignes dans le catalogue donné ("produits", "clients",
+    "fournisseurs"). Renvoie {"total", "importes", "erreurs": [...]}, chaque
+    erreur indiquant le numéro de ligne (à partir de 1) et les messages par champ.
+    """
+    model, noms_champs = CATALOGUES[catalogue]
+    champs = [model._meta.get_field(nom) for nom in noms_champs]
+    categories = _ResolveurCategories() if model is Produit else None
+    rapport = {"total": 0, "importes": 0, "erreurs": []}
+
+    lot = []
+    for numero, ligne in enumerate(lignes, start=1):
+        rapport["total"] += 1
+        lot.append((numero, ligne))
+        if len(lot) >= taille_lot:
+            _importer_lot(model, champs, categories, lot, rapport)
+            lot = []
+    if lot:
+        _importer_lot(model, champs, categories, lot, rapport)
+
+    if rapport["importes"]:
+        cache_api.invalider(model, CategorieProduit)
+    return rapport
+
+
+def _importer_lot(model, champs, categories, lot, rapport):
+    if categories is not None:
+        categories.resoudre({
+            str(ligne["categorie"]).strip() for _, ligne in lot
+            if isinstance(ligne, dict) and str(ligne.get("categorie") or "").strip()
+        })
+
+    ids_demandes = set()
+    for _, ligne in lot:
+        try:
+            ids_demandes.add(int(ligne.get("id")))
+        except (AttributeError, TypeError, ValueError):
+            continue
+    ids_existants = set(
+        model.objects.filter(pk__in=ids_demandes).values_list("pk", flat=True)
+    ) if ids_demandes else set()
+
+    creations = []
+    # Mises à jour groupées par colonnes présentes : un bulk_update par groupe.
+    mises_a_jour = {}
+    stocks = []
+    for numero, ligne in lot:
+        if not isinstance(ligne, dict):
+            rapport["erreurs"].append({"ligne": numero, "erreurs": {"__all__": ["Objet attendu."]}})
+            continue
+        modification = ligne.get("id") not in (None, "")
+        valeurs, erreurs = {}, {}
+        for field in champs:
+            if modification and field.name not in ligne:
+                continue
+            try:
+                valeurs[field.name] = _nettoyer(field, ligne.get(field.name))
+            except ValidationError as e:
+                erreurs[field.name] = e.messages
+        if modification:
+            try:
+                valeurs["id"] = int(ligne["id"])
+            except (TypeError, ValueError):
+                erreurs["id"] = ["Entier attendu."]
+            else:
+                if valeurs["id"] not in ids_existants:
+                    erreurs["id"] = ["Aucun enregistrement avec cet id."]
+        if categories is not None and (not modification or "categorie" in ligne):
+            nom = str(ligne.get("categorie") or "").strip()
+            valeurs["categorie_id"] = categories.par_nom.get(nom) if nom else None
+        if erreurs:
+            rapport["erreurs"].append({"ligne": numero, "erreurs": erreurs})
+            continue
+        stock_voulu = valeurs.pop("stock_actuel", None)
+        objet = model(**valeurs)
+        if stock_voulu is not None:
+            stocks.append((objet, stock_voulu))
+        if modification:
+            colonnes = tuple(
+                "categorie" if nom == "categorie_id" else nom for nom in valeurs if nom != "id"
+            )
+            mises_a_jour.setdefault(colonnes, []).append(objet)
+        else:
+            creations.append(objet)
+
+    if not creations and not mises_a_jour:
+        return
+    with transaction.atomic():
+        if creations:
+            model.objects.bulk_create(creations)
+        for colonnes, objets in mises_a_jour.items():
+            if colonnes:
+                model.objects.bulk_update(objets, list(colonnes), batch_size=500)
+        if stocks:
+            stock.ajuster({objet.pk: quantite for objet, quantite in stocks}, source_type="IMPORT")
+    rapport["importes"] += len(creations) + sum(len(objets) for objets in mises_a_jour.values())
@@ -0,0 +1,159 @@
+"""
+Stock d'un produit à une date passée, reconstitué à partir des photos
+(StockSnapshot) et du journal MouvementStock.
+
+Le stock à la date D est la dernière photo du produit prise à D ou avant,
+plus la somme signée (ENTREE +, SORTIE -) des mouvements postérieurs à
+cette photo et antérieurs ou égaux à D. Les deux lectures sont des
+sous-requêtes corrélées servies par les index (produit, date) de
+StockSnapshot et de MouvementStock : le coût d'un produit dépend du nombre
+de mouvements depuis sa dernière photo, pas de la longueur de l'historique.
+Sans photo antérieure, on part de zéro et tout l'historique est relu.
+
+La commande `snapshot_stock` prend les photos (à planifier, par exemple
+chaque nuit). Une photo recopie `stock_actuel` : elle intègre aussi les
+corrections faites sans mouvement (saisie directe).
+
+`valorisation` agrège quantités et valeurs (stock × prix_unitaire) par
+catégorie, pour le stock actuel ou à une date.
+"""
+from datetime import datetime, time, timezone as dt_timezone
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import (
+    Case, Count, DecimalField, ExpressionWrapper, F, OuterRef, Subquery, Sum, Value, When,
+)
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+
+from core import cache as cache_api
+from core.models import MouvementStock, Produit, StockSnapshot
+from core.utils import par_paquets
+
+# Borne basse des mouvements d'un produit jamais photographié.
+ORIGINE = datetime(1, 1, 1, tzinfo=dt_timezone.utc)
+
+CENTIME = Decimal("0.01")
+
+
+def _quantite():
+    return DecimalField(max_digits=14, decimal_places=2)
+
+
+def instant(valeur):
+    """
+    Date d'un paramètre « AAAA-MM-JJ » (fin de journée) ou ISO 8601 complet,
+    dans le fuseau courant si elle n'en précise pas ; ValueError sinon.
+    """
+    # parse_datetime accepte aussi « AAAA-MM-JJ » (minuit) : le jour seul d'abord.
+    try:
+        jour = parse_date(valeur or "")
+        moment = datetime.combine(jour, time.max) if jour else parse_datetime(valeur or "")
+    except ValueError:
+        moment = None
+    if moment is None:
+        raise ValueError("Date attendue au format AAAA-MM-JJ ou AAAA-MM-JJTHH:MM[:SS].")
+    if timezone.is_naive(moment):
+        moment = timezone.make_aware(moment)
+    return moment
+
+
+def photographier(taille_lot=5000):
+    """
+    Enregistre le stock_actuel de tous les produits. Renvoie le nombre de
+    photos prises.
+
+    Les produits sont traités par paquets de `taille_lot`, chacun dans sa
+    transaction : ses lignes sont verrouillées (select_for_update, ordre des
+    clés primaires, comme core.services.stock) avant la lecture de
+    stock_actuel, et la date de la photo est prise une fois le verrou obtenu.
+    Un mouvement validé avant le verrou est donc compris dans la photo et
+    daté avant elle ; un mouvement en attente du verrou est écrit ensuite,
+    avec une date postérieure (le moteur de stock date ses mouvements après
+    avoir verrouillé les produits). Les ventes ne sont bloquées que le temps
+    d'un paquet.
+    """
+    nombre = 0
+    for paquet in par_paquets(Produit.objects.all(), [], taille_lot):
+        with transaction.atomic():
+            stocks = list(
+                Produit.objects.select_for_update()
+                .filter(pk__gte=paquet[0][0], pk__lte=paquet[-1][0])
+                .order_by("pk").values_list("pk", "stock_actuel")
+            )
+            date = timezone.now()
+            lot = [StockSnapshot(produit_id=pk, date=date, quantite=stock) for pk, stock in stocks]
+            nombre += len(StockSnapshot.objects.bulk_create(lot, ignore_conflicts=True))
+            cache_api.invalider(StockSnapshot)
+    return nombre
+
+
+def annoter_stock(queryset, date):
+    """
+    Annote chaque produit de `queryset` de son stock à `date` :
+    `date_reference` (photo de départ, None sans photo), `stock_reference`
+    et `stock` (photo + mouvements jusqu'à `date`). Une seule requête.
+    """
+    photo = StockSnapshot.objects.filter(produit=OuterRef("pk"), date__lte=date).order_by("-date")
+    variation = (
+        MouvementStock.objects.filter(produit=OuterRef("pk"), date__lte=date)
+        .filter(date__gt=Coalesce(OuterRef("date_reference"), Value(ORIGINE)))
+        .order_by()
+        .values("produit")
+        .annotate(total=Sum(Case(
+            When(type="ENTREE", then=F("quantite")),
+            default=-F("quantite"),
+            output_field=_quantite(),
+        )))
+        .values("total")
+    )
+    return queryset.annotate(
+        date_reference=Subquery(photo.values("date")[:1]),
+        stock_reference=Coalesce(Subquery(photo.values("quantite")[:1]), Value(0)),
+    ).annotate(
+        stock=ExpressionWrapper(
+            F("stock_reference") + Coalesce(Subquery(variation), Value(0), output_field=_quantite()),
+            output_field=_quantite(),
+        ),
+    )
+
+
+def valorisation(date=None):
+    """
+    Stock par catégorie en une requête groupée : liste de
+    {categorie, nom, produits, quantite, valeur}, triée par nom de catégorie.
+
+    Sans `date`, à partir de stock_actuel ; avec, à partir du stock
+    reconstitué par `annoter_stock`. La valeur utilise le prix_unitaire
+    actuel : les prix ne sont pas historisés.
+    """
+    produits = Produit.objects.all()
+    stock = F("stock_actuel")
+    if date is not None:
+        produits = annoter_stock(produits, date)
+        stock = F("stock")
+    lignes = (
+        produits.order_by()
+        .values("categorie", "categorie__nom")
+        .annotate(
+            produits=Count("pk"),
+            quantite=Sum(stock, output_field=_quantite()),
+            valeur=Sum(ExpressionWrapper(
+                stock * F("prix_unitaire"), output_field=DecimalField(max_digits=18, decimal_places=2),
+            )),
+        )
+        .order_by(F("categorie__nom").asc(nulls_last=True), "categorie")
+    )
+    # SQLite renvoie les sommes sans l'échelle des champs.
+    return [
+        {
+            "categorie": ligne["categorie"],
+            "nom": ligne["categorie__nom"],
+            "produits": ligne["produits"],
+            "quantite": Decimal(ligne["quantite"] or 0).quantize(CENTIME),
+            "valeur": Decimal(ligne["valeur"] or 0).quantize(CENTIME),
+        }
+        for ligne in lignes
+    ]
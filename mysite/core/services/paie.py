@@ -0,0 +1,128 @@
+"""
+Paie d'une période (« AAAA-MM ») pour tous les employés actifs en une passe.
+
+Les employés sont lus en une requête, les salaires calculés en mémoire
+selon `PAYROLL_RULES` puis écrits par `bulk_create` en upsert sur la
+contrainte unique (periode, employe) : relancer une période met à jour le
+brut et le net de ses salaires au lieu de les dupliquer. `montant_paye`
+n'est renseigné (au net) qu'à la création : un montant déjà payé ou
+corrigé n'est jamais réécrit. Les dépenses journalisées en Transaction
+(DEPENSE, module PAIE) suivent `montant_paye`, donc les seuls salaires
+créés ; un écart entre net et montant payé est signalé dans le rapport.
+
+Règles (settings.PAYROLL_RULES, chaque clé est facultative) :
+
+- PRIMES : {poste: montant} ajouté au salaire de base ;
+- TAUX_RETENUES : part du brut retenue (net = brut - brut × taux) ; nulle
+  par défaut, toute retenue doit être configurée ;
+- PRORATA : un employé embauché en cours de mois est payé au prorata des
+  jours restants.
+"""
+import calendar
+import re
+from datetime import date
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.conf import settings
+from django.db import transaction
+
+from core.models import Employe, Salaire
+from core.utils import log_transactions
+
+DEFAUTS = {
+    "PRIMES": {},
+    "TAUX_RETENUES": "0",
+    "PRORATA": True,
+}
+
+CENTIME = Decimal("0.01")
+
+_PERIODE = re.compile(r"^(\d{4})-(\d{2})$")
+
+
+def _regles():
+    return {**DEFAUTS, **getattr(settings, "PAYROLL_RULES", {})}
+
+
+def bornes(periode):
+    """Premier et dernier jour d'une période « AAAA-MM » ; ValueError sinon."""
+    match = _PERIODE.match(periode) if isinstance(periode, str) else None
+    if not match or not 1 <= int(match.group(2)) <= 12:
+        raise ValueError("Période attendue au format AAAA-MM.")
+    annee, mois = int(match.group(1)), int(match.group(2))
+    return date(annee, mois, 1), date(annee, mois, calendar.monthrange(annee, mois)[1])
+
+
+def calculer(employe, debut, fin, regles):
+    """(brut, net) d'un employé pour la période [debut, fin]."""
+    brut = Decimal(employe.salaire_base) + Decimal(regles["PRIMES"].get(employe.poste, 0))
+    if regles["PRORATA"] and employe.date_embauche > debut:
+        jours = (fin - employe.date_embauche).days + 1
+        brut = brut * jours / ((fin - debut).days + 1)
+    brut = brut.quantize(CENTIME, ROUND_HALF_UP)
+    retenues = (brut * Decimal(regles["TAUX_RETENUES"])).quantize(CENTIME, ROUND_HALF_UP)
+    return brut, brut - retenues
+
+
+def lancer(periode, user=None, taille_lot=1000):
+    """
+    Calcule et enregistre les salaires de `periode`. Renvoie un rapport
+    (nombre d'employés, salaires créés / modifiés, totaux brut et net,
+    salaires dont le montant payé diffère du net).
+    """
+    debut, fin = bornes(periode)
+    regles = _regles()
+
+    with transaction.atomic():
+        # Verrou des employés payés, dans l'ordre des clés : deux lancements
+        # concurrents de la même période s'exécutent l'un après l'autre, et
+        # le second lit les salaires du premier au lieu de les recréer (et de
+        # journaliser deux fois les dépenses).
+        employes = list(
+            Employe.objects.select_for_update()
+            .filter(actif=True, date_embauche__lte=fin)
+            .only("id", "nom", "poste", "salaire_base", "date_embauche")
+            .order_by("pk")
+        )
+        anciens = {
+            employe_id: (net, montant_paye)
+            for employe_id, net, montant_paye in Salaire.objects.filter(periode=periode)
+            .values_list("employe_id", "net", "montant_paye")
+        }
+        salaires = []
+        for employe in employes:
+            brut, net = calculer(employe, debut, fin, regles)
+            salaires.append(Salaire(employe=employe, periode=periode, brut=brut, net=net, montant_paye=net))
+        # montant_paye hors de update_fields : seule l'insertion le renseigne.
+        Salaire.objects.bulk_create(
+            salaires, batch_size=taille_lot,
+            update_conflicts=True, unique_fields=["periode", "employe"],
+            update_fields=["brut", "net"],
+        )
+
+        log_transactions(user, [
+            {
+                "type": "DEPENSE", "module": "PAIE", "reference_id": salaire.pk, "montant": salaire.montant_paye,
+                "description": f"Salaire {periode} - {salaire.employe.nom}",
+            }
+            for salaire in salaires
+            if salaire.employe_id not in anciens and salaire.montant_paye
+        ])
+
+    crees = [salaire for salaire in salaires if salaire.employe_id not in anciens]
+    modifies = [
+        salaire for salaire in salaires
+        if salaire.employe_id in anciens and salaire.net != anciens[salaire.employe_id][0]
+    ]
+    return {
+        "periode": periode,
+        "employes": len(salaires),
+        "crees": len(crees),
+        "modifies": len(modifies),
+        "a_regulariser": sum(
+            1 for salaire in salaires
+            if salaire.employe_id in anciens and salaire.net != anciens[salaire.employe_id][1]
+        ),
+        "total_brut": sum((salaire.brut for salaire in salaires), Decimal(0)),
+        "total_net": sum((salaire.net for salaire in salaires), Decimal(0)),
+    }
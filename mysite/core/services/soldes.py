@@ -0,0 +1,107 @@
+"""
+Soldes des clients et des fournisseurs (Client.solde, Fournisseur.solde).
+
+Le solde d'un tiers est la somme de `total - montant_paye` sur ses
+documents non annulés : ce que le client nous doit, ce que nous devons au
+fournisseur. Les signaux de core.signals y répercutent chaque création,
+paiement, annulation, changement de tiers ou suppression par un
+`UPDATE ... SET solde = solde + écart` ; la commande `reconcile_balances`
+recalcule tous les soldes et signale les écarts.
+"""
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import F, Sum
+
+from core import cache as cache_api
+from core.models import Achat, Client, Fournisseur, Vente
+
+# Modèle de document -> (clé étrangère du tiers, modèle du tiers, statut d'annulation)
+TIERS = {
+    Vente: ("client", Client, "ANNULEE"),
+    Achat: ("fournisseur", Fournisseur, "ANNULE"),
+}
+
+CENTIME = Decimal("0.01")
+
+
+def part(document):
+    """(id du tiers, montant restant dû) d'un document ; rien pour un document annulé."""
+    champ, _, statut_annule = TIERS[type(document)]
+    tiers_id = getattr(document, f"{champ}_id")
+    if tiers_id is None or document.statut == statut_annule:
+        return None, Decimal(0)
+    return tiers_id, Decimal(document.total) - Decimal(document.montant_paye)
+
+
+def ajuster(model_tiers, tiers_id, ecart):
+    if tiers_id is None or not ecart:
+        return
+    model_tiers.objects.filter(pk=tiers_id).update(solde=F("solde") + ecart)
+    cache_api.invalider(model_tiers)
+
+
+def appliquer(document, precedent=None):
+    """
+    Répercute une écriture : `precedent` est le document tel qu'il était en
+    base avant (None à la création).
+    """
+    _, model_tiers, _ = TIERS[type(document)]
+    nouveau_id, nouveau = part(document)
+    ancien_id, ancien = part(precedent) if precedent is not None else (None, Decimal(0))
+    if nouveau_id == ancien_id:
+        ajuster(model_tiers, nouveau_id, nouveau - ancien)
+    else:
+        ajuster(model_tiers, ancien_id, -ancien)
+        ajuster(model_tiers, nouveau_id, nouveau)
+
+
+def retirer(document):
+    _, model_tiers, _ = TIERS[type(document)]
+    tiers_id, du = part(document)
+    ajuster(model_tiers, tiers_id, -du)
+
+
+def soldes_calcules(model_document):
+    """{id du tiers: solde} recalculé en une requête groupée."""
+    champ, _, statut_annule = TIERS[model_document]
+    lignes = (
+        model_document.objects.exclude(statut=statut_annule)
+        .filter(**{f"{champ}__isnull": False})
+        .values_list(champ)
+        .annotate(du=Sum(F("total") - F("montant_paye")))
+        .order_by()
+    )
+    # SQLite renvoie la somme sans l'échelle du champ.
+    return {pk: Decimal(du).quantize(CENTIME) for pk, du in lignes}
+
+
+def reconcilier(corriger=False):
+    """
+    Compare chaque solde enregistré au solde recalculé. Renvoie les écarts
+    `(modèle du tiers, id, enregistré, calculé)` ; avec `corriger`, réécrit
+    les soldes faux.
+
+    En correction, les tiers sont verrouillés avant le calcul : une écriture
+    concurrente validée avant est comptée dans le calcul, une écriture
+    ultérieure applique son écart au solde corrigé.
+    """
+    ecarts = []
+    with transaction.atomic():
+        for model_document, (_, model_tiers, _) in TIERS.items():
+            enregistres = model_tiers.objects.order_by()
+            if corriger:
+                enregistres = enregistres.select_for_update()
+            enregistres = list(enregistres.values_list("pk", "solde"))
+            calcules = soldes_calcules(model_document)
+            faux = [
+                (pk, solde, calcules.get(pk, Decimal(0)))
+                for pk, solde in enregistres if solde != calcules.get(pk, Decimal(0))
+            ]
+            ecarts.extend((model_tiers, *ecart) for ecart in faux)
+            if corriger and faux:
+                model_tiers.objects.bulk_update(
+                    [model_tiers(pk=pk, solde=calcule) for pk, _, calcule in faux], ["solde"], batch_size=1000,
+                )
+                cache_api.invalider(model_tiers)
+    return ecarts
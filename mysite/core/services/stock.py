@@ -0,0 +1,157 @@
+"""
+Moteur de stock : génère les MouvementStock d'une vente ou d'un achat et
+répercute les quantités sur Produit.stock_actuel.
+
+Les variations sont appliquées en un seul UPDATE ensembliste
+(`stock_actuel = stock_actuel + CASE id WHEN ... END`) : la base fait
+l'addition, il n'y a donc pas de lecture-modification-écriture côté Python
+et deux caisses qui vendent le même produit ne perdent aucune mise à jour.
+La suppression d'une vente ou d'un achat (signal pre_delete de
+core.signals) écrit ses mouvements inverses.
+Toutes les fonctions doivent être appelées dans un `transaction.atomic()`.
+"""
+from collections import defaultdict
+from decimal import Decimal, ROUND_HALF_UP
+
+from django.db.models import Case, F, IntegerField, Value, When
+
+from core import cache as cache_api
+from core.models import Achat, MouvementStock, Produit, Vente
+
+ENTREE = "ENTREE"
+SORTIE = "SORTIE"
+
+# Modèle -> (source_type, type de mouvement, statut d'annulation)
+SOURCES = {
+    Vente: ("VENTE", SORTIE, "ANNULEE"),
+    Achat: ("ACHAT", ENTREE, "ANNULE"),
+}
+
+
+def appliquer_variations(deltas):
+    """
+    Applique {produit_id: variation} à Produit.stock_actuel en une requête.
+
+    Les lignes produit sont d'abord verrouillées dans l'ordre des clés
+    primaires pour que deux transactions concurrentes ne s'interbloquent pas.
+    stock_actuel étant un entier, les variations sont arrondies à l'unité.
+    """
+    deltas = {
+        pk: int(Decimal(delta).to_integral_value(ROUND_HALF_UP))
+        for pk, delta in deltas.items()
+    }
+    deltas = {pk: delta for pk, delta in deltas.items() if delta}
+    if not deltas:
+        return 0
+
+    ids = sorted(deltas)
+    list(
+        Produit.objects.select_for_update()
+        .filter(pk__in=ids).order_by("pk").values_list("pk", flat=True)
+    )
+    variation = Case(
+        *[When(pk=pk, then=Value(delta)) for pk, delta in deltas.items()],
+        default=Value(0),
+        output_field=IntegerField(),
+    )
+    modifies = Produit.objects.filter(pk__in=ids).update(stock_actuel=F("stock_actuel") + variation)
+    # UPDATE ensembliste : pas de post_save, on invalide le cache produits ici.
+    cache_api.invalider(Produit)
+    return modifies
+
+
+def ajuster(cibles, source_type="MANUEL"):
+    """
+    Amène le stock_actuel des produits de `cibles` ({produit_id: quantité})
+    aux quantités voulues en écrivant les mouvements d'écart (ENTREE ou
+    SORTIE) : un inventaire ou un import passe par le journal au lieu
+    d'écraser stock_actuel.
+    """
+    actuels = Produit.objects.select_for_update().filter(pk__in=cibles).order_by("pk")
+    mouvements = []
+    deltas = {}
+    for pk, actuel in actuels.values_list("pk", "stock_actuel"):
+        ecart = cibles[pk] - actuel
+        if not ecart:
+            continue
+        mouvements.append(MouvementStock(
+            produit_id=pk,
+            type=ENTREE if ecart > 0 else SORTIE,
+            quantite=abs(ecart),
+            source_type=source_type,
+        ))
+        deltas[pk] = ecart
+
+    MouvementStock.objects.bulk_create(mouvements)
+    cache_api.invalider(MouvementStock)
+    appliquer_variations(deltas)
+    return mouvements
+
+
+def enregistrer_mouvements(document, lignes, annulation=False):
+    """
+    Crée en bloc les mouvements d'un document (vente ou achat) et met le
+    stock à jour. Avec `annulation=True`, écrit les mouvements inverses.
+    """
+    source_type, type_mouvement, _ = SOURCES[type(document)]
+    if annulation:
+        type_mouvement = ENTREE if type_mouvement == SORTIE else SORTIE
+    signe = 1 if type_mouvement == ENTREE else -1
+
+    mouvements = []
+    deltas = defaultdict(Decimal)
+    for ligne in lignes:
+        if ligne.produit_id is None:
+            continue
+        mouvements.append(MouvementStock(
+            produit_id=ligne.produit_id,
+            type=type_mouvement,
+            quantite=ligne.quantite,
+            source_type=source_type,
+            source_id=document.pk,
+        ))
+        deltas[ligne.produit_id] += signe * ligne.quantite
+
+    # Mouvements écrits après le verrou des produits : leur date suit celle
+    # d'une photo de stock prise pendant qu'on l'attendait (inventaire.photographier).
+    appliquer_variations(deltas)
+    MouvementStock.objects.bulk_create(mouvements)
+    # Un mouvement arrondi à zéro ne touche pas stock_actuel mais change le stock à date (stock-at).
+    cache_api.invalider(MouvementStock)
+    return mouvements
+
+
+def enregistrer_document(document, lignes):
+    """Mouvements initiaux d'un document qui vient d'être créé."""
+    _, _, statut_annule = SOURCES[type(document)]
+    if document.statut == statut_annule:
+        return []
+    return enregistrer_mouvements(document, lignes)
+
+
+def suivre_statut(document, ancien_statut):
+    """
+    Répercute un changement de statut : l'annulation remet le stock en
+    l'état, la réactivation d'un document annulé le mouvemente à nouveau.
+    """
+    _, _, statut_annule = SOURCES[type(document)]
+    etait_annule = ancien_statut == statut_annule
+    est_annule = document.statut == statut_annule
+    if etait_annule == est_annule:
+        return []
+    return enregistrer_mouvements(document, document.lignes.all(), annulation=est_annule)
+
+
+def retirer_document(document):
+    """
+    Mouvements inverses d'un document sur le point d'être supprimé (ses
+    lignes existent encore) : le stock revient à son état sans lui, et le
+    journal garde la trace de l'aller et du retour.
+    """
+    _, _, statut_annule = SOURCES[type(document)]
+    # Statut relu sous verrou, comme à la mise à jour : une annulation
+    # concurrente ne remet pas le stock en place une seconde fois.
+    statut = type(document).objects.select_for_update().values_list("statut", flat=True).get(pk=document.pk)
+    if statut == statut_annule:
+        return []
+    return enregistrer_mouvements(document, document.lignes.all(), annulation=True)
@@ -0,0 +1,79 @@
+"""
+Signaux de l'application core (chargés par CoreConfig.ready).
+"""
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from core import cache as cache_api
+from core.models import Achat, CategorieProduit, Client, Employe, Fournisseur, Produit, Vente
+from core.services import agregats, soldes, stock
+
+
+@receiver(pre_save, sender=Vente)
+@receiver(pre_save, sender=Achat)
+def memoriser_etat_precedent(sender, instance, **kwargs):
+    """
+    Garde les champs suivis par les agrégats et les soldes (date, statut,
+    total, montant payé, tiers) tels qu'en base pour calculer les écarts au
+    post_save.
+    """
+    instance._etat_precedent = None
+    if instance.pk is not None:
+        champ_tiers = soldes.TIERS[sender][0]
+        instance._etat_precedent = (
+            sender.objects.filter(pk=instance.pk)
+            .values("date", "statut", "total", "montant_paye", f"{champ_tiers}_id").first()
+        )
+
+
+@receiver(post_save, sender=Vente)
+@receiver(post_save, sender=Achat)
+def maj_agregats(sender, instance, created, **kwargs):
+    precedent = getattr(instance, "_etat_precedent", None)
+    if not created and precedent is not None:
+        if (precedent["date"], precedent["statut"], precedent["total"]) == (
+            instance.date, instance.statut, instance.total
+        ):
+            return
+        agregats.ajouter(sender(**precedent), signe=-1)
+    agregats.ajouter(instance)
+
+
+@receiver(post_save, sender=Vente)
+@receiver(post_save, sender=Achat)
+def maj_soldes(sender, instance, created, **kwargs):
+    precedent = getattr(instance, "_etat_precedent", None)
+    soldes.appliquer(instance, sender(**precedent) if not created and precedent is not None else None)
+
+
+@receiver(post_delete, sender=Vente)
+@receiver(post_delete, sender=Achat)
+def retirer_des_agregats(sender, instance, **kwargs):
+    agregats.ajouter(instance, signe=-1)
+
+
+@receiver(post_delete, sender=Vente)
+@receiver(post_delete, sender=Achat)
+def retirer_des_soldes(sender, instance, **kwargs):
+    soldes.retirer(instance)
+
+
+@receiver(pre_delete, sender=Vente)
+@receiver(pre_delete, sender=Achat)
+def retirer_du_stock(sender, instance, **kwargs):
+    # Avant la suppression en cascade des lignes, qui portent les quantités.
+    stock.retirer_document(instance)
+
+
+@receiver(post_save, sender=CategorieProduit)
+@receiver(post_delete, sender=CategorieProduit)
+@receiver(post_save, sender=Produit)
+@receiver(post_delete, sender=Produit)
+@receiver(post_save, sender=Client)
+@receiver(post_delete, sender=Client)
+@receiver(post_save, sender=Fournisseur)
+@receiver(post_delete, sender=Fournisseur)
+@receiver(post_save, sender=Employe)
+@receiver(post_delete, sender=Employe)
+def invalider_cache_api(sender, **kwargs):
+    cache_api.invalider(sender)
@@ -0,0 +1,166 @@
+"""
+Génération de données ERP synthétiques (produits, tiers, ventes, achats,
+mouvements, salaires, transactions) par insertions en bloc.
+
+Sert à la commande `generate_erp_data` et aux tests (core.tests). Les
+volumes s'ajoutent à ce qui existe déjà ; les dates sont réparties sur les
+`jours` derniers jours. Les insertions en bloc ne déclenchant pas les signaux, les
+cumuls journaliers et les soldes des tiers sont recalculés à la fin.
+"""
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.utils import timezone
+
+from core import cache as cache_api
+from core.models import (
+    Achat, CategorieProduit, Client, Employe, Fournisseur, LigneAchat, LigneVente,
+    MouvementStock, Produit, Salaire, Transaction, Vente,
+)
+from core.services import agregats, soldes
+
+VOLUMES = {
+    "categories": 10,
+    "produits": 200,
+    "clients": 100,
+    "fournisseurs": 20,
+    "ventes": 1000,
+    "achats": 200,
+    "employes": 20,
+    "periodes": 6,
+    "transactions": 1000,
+}
+
+
+def _montant(alea, minimum, maximum):
+    return Decimal(alea.randint(minimum * 100, maximum * 100)) / 100
+
+
+def generer(volumes=None, lignes_par_document=3, jours=90, graine=0, taille_lot=2000):
+    """
+    Insère les volumes demandés (clés de VOLUMES, valeurs manquantes prises
+    dans VOLUMES) et renvoie le nombre de lignes créées par modèle.
+    """
+    volumes = {**VOLUMES, **(volumes or {})}
+    alea = random.Random(graine)
+    maintenant = timezone.now()
+
+    def date_passee():
+        return maintenant - timedelta(seconds=alea.randint(0, jours * 86400))
+
+    def inserer(model, objets):
+        return model.objects.bulk_create(objets, batch_size=taille_lot)
+
+    def inserer_date(model, objets, champ="date"):
+        # auto_now_add impose la date courante à l'insertion : les dates
+        # passées voulues sont remises ensuite par bulk_update.
+        dates = [getattr(objet, champ) for objet in objets]
+        objets = inserer(model, objets)
+        for objet, date in zip(objets, dates):
+            setattr(objet, champ, date)
+        model.objects.bulk_update(objets, [champ], batch_size=taille_lot)
+        return objets
+
+    with transaction.atomic():
+        base = CategorieProduit.objects.count()
+        categories = inserer(CategorieProduit, [
+            CategorieProduit(nom=f"Catégorie {base + i}") for i in range(volumes["categories"])
+        ])
+        produits = inserer(Produit, [
+            Produit(
+                nom=f"Produit {i}", unite="pièce",
+                categorie=alea.choice(categories) if categories else None,
+                prix_unitaire=_montant(alea, 1, 500), seuil_min=alea.randint(0, 20),
+                stock_actuel=alea.randint(0, 500),
+            )
+            for i in range(volumes["produits"])
+        ])
+        clients = inserer(Client, [
+            Client(nom=f"Client {i}", telephone=f"+2250700{i:06d}") for i in range(volumes["clients"])
+        ])
+        fournisseurs = inserer(Fournisseur, [
+            Fournisseur(nom=f"Fournisseur {i}") for i in range(volumes["fournisseurs"])
+        ])
+
+        ventes = inserer_date(Vente, [
+            Vente(
+                client=alea.choice(clients) if clients else None, date=date_passee(),
+                total=0, statut=alea.choice(["PAYEE", "PAYEE", "EN_COURS", "ANNULEE"]),
+                mode_paiement=alea.choice(["ESPECES", "MOBILE_MONEY", "CARTE"]),
+            )
+            for _ in range(volumes["ventes"])
+        ])
+        achats = inserer_date(Achat, [
+            Achat(
+                fournisseur=alea.choice(fournisseurs) if fournisseurs else None, date=date_passee(),
+                total=0, statut=alea.choice(["PAYE", "PARTIEL", "EN_ATTENTE", "ANNULE"]),
+            )
+            for _ in range(volumes["achats"])
+        ])
+
+        lignes_vente, lignes_achat, mouvements = [], [], []
+        for documents, Ligne, cle, lignes, sortie in (
+            (ventes, LigneVente, "vente", lignes_vente, True),
+            (achats, LigneAchat, "achat", lignes_achat, False),
+        ):
+            for document in documents:
+                total = Decimal(0)
+                for produit in alea.sample(produits, min(lignes_par_document, len(produits))):
+                    quantite = Decimal(alea.randint(1, 10))
+                    lignes.append(Ligne(**{cle: document}, produit=produit, quantite=quantite,
+                                        prix_unitaire=produit.prix_unitaire))
+                    total += quantite * produit.prix_unitaire
+                    if document.statut in ("ANNULEE", "ANNULE"):
+                        continue
+                    mouvements.append(MouvementStock(
+                        produit=produit, date=document.date, quantite=quantite,
+                        type="SORTIE" if sortie else "ENTREE",
+                        source_type="VENTE" if sortie else "ACHAT", source_id=document.pk,
+                    ))
+                document.total = total
+                document.montant_paye = total if document.statut in ("PAYEE", "PAYE") else Decimal(0)
+        inserer(LigneVente, lignes_vente)
+        inserer(LigneAchat, lignes_achat)
+        inserer_date(MouvementStock, mouvements)
+        Vente.objects.bulk_update(ventes, ["total", "montant_paye"], batch_size=taille_lot)
+        Achat.objects.bulk_update(achats, ["total", "montant_paye"], batch_size=taille_lot)
+
+        employes = inserer(Employe, [
+            Employe(
+                nom=f"Employé {i}", poste=alea.choice(["Vendeur", "Magasinier", "Comptable"]),
+                salaire_base=_montant(alea, 100, 1000),
+                date_embauche=(maintenant - timedelta(days=alea.randint(30, 3000))).date(),
+            )
+            for i in range(volumes["employes"])
+        ])
+        salaires = inserer_date(Salaire, [
+            Salaire(
+                employe=employe, periode=f"{(maintenant - timedelta(days=31 * mois)):%Y-%m}",
+                brut=employe.salaire_base, net=employe.salaire_base * Decimal("0.8"),
+                montant_paye=employe.salaire_base * Decimal("0.8"),
+                date_paiement=maintenant - timedelta(days=31 * mois),
+            )
+            for employe in employes for mois in range(volumes["periodes"])
+        ], champ="date_paiement")
+        transactions = inserer_date(Transaction, [
+            Transaction(
+                date=date_passee(), type=alea.choice(["RECETTE", "DEPENSE"]),
+                module=alea.choice(["VENTE", "ACHAT", "PAIE"]), reference_id=alea.randint(1, 10000),
+                montant=_montant(alea, 1, 5000), description="Donnée synthétique",
+            )
+            for _ in range(volumes["transactions"])
+        ])
+
+        agregats.reconstruire()
+        soldes.reconcilier(corriger=True)
+        # Insertions en bloc : pas de signaux, on invalide le cache de l'API ici.
+        cache_api.invalider(CategorieProduit, Produit, Client, Fournisseur, Employe, MouvementStock)
+
+    return {
+        "categories": len(categories), "produits": len(produits), "clients": len(clients),
+        "fournisseurs": len(fournisseurs), "ventes": len(ventes), "lignes_vente": len(lignes_vente),
+        "achats": len(achats), "lignes_achat": len(lignes_achat), "mouvements": len(mouvements),
+        "employes": len(employes), "salaires": len(salaires), "transactions": len(transactions),
+    }
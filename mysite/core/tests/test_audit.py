@@ -0,0 +1,114 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.db import transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+
+from core import audit
+from core.models import Transaction
+
+
+def entrees(nombre):
+    return [
+        Transaction(type="DEPENSE", module="PAIE", reference_id=i, montant=Decimal("1.00"))
+        for i in range(nombre)
+    ]
+
+
+@override_settings(AUDIT_WRITER={"MODE": "async"})
+class ModeAsynchroneTests(TestCase):
+
+    def test_ecriture_annulee_sans_audit(self):
+        writer = audit.AuditWriter()
+
+        with mock.patch.object(writer, "_mettre_en_file") as mettre_en_file, \
+                self.captureOnCommitCallbacks(execute=True) as callbacks:
+            try:
+                with transaction.atomic():
+                    writer.enregistrer(entrees(2))
+                    raise RuntimeError("écriture métier en échec")
+            except RuntimeError:
+                pass
+
+        self.assertEqual(callbacks, [])
+        mettre_en_file.assert_not_called()
+        self.assertFalse(Transaction.objects.exists())
+
+    def test_rien_en_file_avant_le_commit(self):
+        writer = audit.AuditWriter()
+
+        with mock.patch.object(writer, "_mettre_en_file") as mettre_en_file, \
+                self.captureOnCommitCallbacks(execute=True):
+            writer.enregistrer(entrees(2))
+            mettre_en_file.assert_not_called()
+
+        mettre_en_file.assert_called_once()
+
+
+@override_settings(AUDIT_WRITER={"MODE": "async", "BATCH_SIZE": 2, "FLUSH_INTERVAL_MS": 1000})
+class ThreadAuditTests(TransactionTestCase):
+    """Le thread écrit par sa propre connexion : pas de TestCase ici."""
+
+    def test_arreter_vide_la_file_par_lots(self):
+        writer = audit.AuditWriter()
+        lots = []
+        ecrire = audit._ecrire
+
+        def ecrire_et_noter(lot):
+            lots.append(len(lot))
+            ecrire(lot)
+
+        with mock.patch.object(audit, "_ecrire", side_effect=ecrire_et_noter):
+            # Hors transaction, on_commit met en file immédiatement.
+            writer.enregistrer(entrees(5))
+            writer.arreter()
+
+        self.assertFalse(writer._thread.is_alive())
+        self.assertEqual(sum(lots), 5)
+        self.assertLessEqual(max(lots), 2)
+        self.assertEqual(
+            sorted(Transaction.objects.values_list("reference_id", flat=True)), [0, 1, 2, 3, 4],
+        )
+
+
+@mock.patch.object(audit.time, "sleep")
+@mock.patch.object(audit, "connection")
+class VidageLotTests(TestCase):
+
+    def lot(self):
+        return [
+            Transaction(type="DEPENSE", module="PAIE", reference_id=i, montant=Decimal(i or -1))
+            for i in range(3)
+        ]
+
+    def test_lot_reessaye_apres_un_echec(self, connection, sleep):
+        ecrire = audit._ecrire
+        essais = []
+
+        def echouer_une_fois(entrees):
+            essais.append(len(entrees))
+            if len(essais) == 1:
+                raise RuntimeError("base indisponible")
+            ecrire(entrees)
+
+        with mock.patch.object(audit, "_ecrire", side_effect=echouer_une_fois):
+            audit.writer._vider_lot(self.lot(), 3, 0)
+
+        self.assertEqual(essais, [3, 3])
+
+        self.assertEqual(Transaction.objects.count(), 3)
+
+    def test_lot_en_echec_ecrit_entree_par_entree(self, connection, sleep):
+        ecrire = audit._ecrire
+
+        def refuser_montant_negatif(entrees):
+            if any(entree.montant < 0 for entree in entrees):
+                raise RuntimeError("entrée invalide")
+            ecrire(entrees)
+
+        with mock.patch.object(audit, "_ecrire", side_effect=refuser_montant_negatif), \
+                self.assertLogs("core.audit", "ERROR") as journal:
+            audit.writer._vider_lot(self.lot(), 3, 0)
+
+        self.assertEqual(sorted(Transaction.objects.values_list("reference_id", flat=True)), [1, 2])
+        self.assertIn("reference_id=0", journal.output[0])
@@ -0,0 +1,93 @@
+import time
+from unittest import mock
+
+from django.test import RequestFactory, TestCase, override_settings
+
+from core import authentication
+from core.authentication import FirebaseAuthentication, VerifiedTokenCache, token_cache
+from users.models import User
+
+
+def requete(token):
+    return RequestFactory().get("/", HTTP_AUTHORIZATION=f"Bearer {token}")
+
+
+class FirebaseAuthenticationTests(TestCase):
+
+    def setUp(self):
+        token_cache.clear()
+        self.addCleanup(token_cache.clear)
+        verification = mock.patch.object(
+            authentication.fb_auth, "verify_id_token",
+            return_value={"uid": "uid-awa", "email": "awa@example.com", "exp": time.time() + 3600},
+        )
+        self.verify_id_token = verification.start()
+        self.addCleanup(verification.stop)
+
+    def test_token_en_cache_sans_verification_ni_requete(self):
+        utilisateur, _ = FirebaseAuthentication().authenticate(requete("jeton"))
+        self.assertEqual(utilisateur.username, "uid-awa")
+
+        with self.assertNumQueries(0):
+            encore, _ = FirebaseAuthentication().authenticate(requete("jeton"))
+
+        self.assertEqual(encore.pk, utilisateur.pk)
+        self.assertIsNot(encore, utilisateur)
+        self.verify_id_token.assert_called_once_with("jeton")
+        self.assertEqual(token_cache.stats(), {"hits": 1, "misses": 1, "size": 1})
+
+    def test_utilisateur_modifie_ou_supprime_invalide_le_cache(self):
+        utilisateur, _ = FirebaseAuthentication().authenticate(requete("jeton"))
+
+        utilisateur.first_name = "Awa"
+        utilisateur.save()
+        self.assertIsNone(token_cache.get("jeton"))
+
+        FirebaseAuthentication().authenticate(requete("jeton"))
+        User.objects.get(pk=utilisateur.pk).delete()
+        self.assertIsNone(token_cache.get("jeton"))
+        self.assertEqual(self.verify_id_token.call_count, 2)
+
+    @override_settings(DEBUG=True, METRICS_TOKEN="")
+    def test_compteurs_exposes_par_metrics(self):
+        FirebaseAuthentication().authenticate(requete("jeton"))
+        FirebaseAuthentication().authenticate(requete("jeton"))
+
+        texte = self.client.get("/metrics/").content.decode()
+        self.assertIn("auth_token_cache_hits_total 1", texte)
+        self.assertIn("auth_token_cache_misses_total 1", texte)
+        self.assertIn("auth_token_cache_entries 1", texte)
+
+
+class VerifiedTokenCacheTests(TestCase):
+
+    def utilisateur(self, pk):
+        return User(pk=pk, username=f"u{pk}")
+
+    def test_expiration_au_plus_tot_entre_exp_et_max_ttl(self):
+        cache = VerifiedTokenCache(max_ttl=300)
+        maintenant = 1_000_000.0
+        with mock.patch.object(authentication.time, "time", return_value=maintenant) as horloge:
+            cache.set("court", {"exp": maintenant + 10}, self.utilisateur(1))
+            cache.set("long", {"exp": maintenant + 3600}, self.utilisateur(2))
+            cache.set("expire", {"exp": maintenant - 1}, self.utilisateur(3))
+
+            horloge.return_value = maintenant + 11
+            self.assertIsNone(cache.get("court"))
+            self.assertIsNotNone(cache.get("long"))
+            horloge.return_value = maintenant + 301
+            self.assertIsNone(cache.get("long"))
+        self.assertIsNone(cache.get("expire"))
+
+    def test_eviction_lru(self):
+        cache = VerifiedTokenCache(max_entries=2)
+        exp = {"exp": time.time() + 3600}
+        cache.set("a", exp, self.utilisateur(1))
+        cache.set("b", exp, self.utilisateur(2))
+        cache.get("a")
+        cache.set("c", exp, self.utilisateur(3))
+
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNotNone(cache.get("c"))
+        self.assertEqual(cache.stats()["size"], 2)
@@ -0,0 +1,112 @@
+from django.core.cache import cache
+from django.test import override_settings
+from rest_framework.test import APITestCase
+
+from core.models import CategorieProduit, Client, Produit
+from users.models import User
+
+URL = "/api/batch/"
+
+
+def get(chemin):
+    return {"methode": "GET", "chemin": chemin}
+
+
+def post(chemin, corps):
+    return {"methode": "POST", "chemin": chemin, "corps": corps}
+
+
+class BatchTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create(username="admin", role="admin")
+        self.client.force_authenticate(self.user)
+
+    def lot(self, requetes, atomique=False):
+        return self.client.post(URL, {"requetes": requetes, "atomique": atomique}, format="json")
+
+    def test_lectures_groupees(self):
+        categorie = CategorieProduit.objects.create(nom="Boissons")
+        Produit.objects.create(nom="Eau", categorie=categorie, unite="u", prix_unitaire=1, stock_actuel=3)
+        Client.objects.create(nom="Awa")
+
+        response = self.lot([
+            get("/api/produits/?search=eau"), get("/api/clients/"),
+            get("/api/categories/"), get("/api/transactions/"),
+        ])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.data["annule"])
+        reponses = response.data["reponses"]
+        self.assertEqual([reponse["statut"] for reponse in reponses], [200, 200, 200, 200])
+        self.assertEqual(reponses[0]["corps"]["results"][0]["nom"], "Eau")
+        self.assertEqual(reponses[1]["corps"]["count"], 1)
+        # Vue asynchrone (AsyncListAPIView) exécutée depuis le lot.
+        self.assertEqual(reponses[3]["corps"]["results"], [])
+
+    def test_authentification_requise(self):
+        self.client.force_authenticate(None)
+        response = self.lot([get("/api/clients/")])
+        self.assertIn(response.status_code, (401, 403))
+
+    def test_lot_non_atomique_garde_les_ecritures_reussies(self):
+        response = self.lot([post("/api/clients/", {"nom": "Binta"}), post("/api/clients/", {"email": "x"})])
+
+        self.assertEqual([reponse["statut"] for reponse in response.data["reponses"]], [201, 400])
+        self.assertFalse(response.data["annule"])
+        self.assertEqual(list(Client.objects.values_list("nom", flat=True)), ["Binta"])
+
+    def test_lot_atomique_valide(self):
+        response = self.lot(
+            [post("/api/clients/", {"nom": "Binta"}), post("/api/clients/", {"nom": "Coumba"})], atomique=True,
+        )
+
+        self.assertFalse(response.data["annule"])
+        self.assertEqual(Client.objects.count(), 2)
+
+    def test_lot_atomique_annule_tout_et_ne_met_rien_en_cache(self):
+        response = self.lot([
+            post("/api/clients/", {"nom": "Fantome"}),
+            get("/api/clients/"),
+            post("/api/clients/", {"email": "x"}),
+            get("/api/categories/"),
+        ], atomique=True)
+
+        self.assertTrue(response.data["annule"])
+        # Arrêt à la première erreur : la dernière sous-requête n'est pas exécutée.
+        self.assertEqual([reponse["statut"] for reponse in response.data["reponses"]], [201, 200, 400])
+        self.assertEqual(response.data["reponses"][1]["corps"]["count"], 1)
+        self.assertFalse(Client.objects.exists())
+        # La lecture faite dans le lot n'a pas été mise en cache.
+        self.assertEqual(self.client.get("/api/clients/").data["count"], 0)
+
+    def test_vue_asynchrone_refusee_en_atomique(self):
+        response = self.lot([
+            post("/api/clients/", {"nom": "Binta"}),
+            get("/api/dashboard-stats/"),
+        ], atomique=True)
+
+        self.assertTrue(response.data["annule"])
+        self.assertEqual([reponse["statut"] for reponse in response.data["reponses"]], [201, 400])
+        self.assertFalse(Client.objects.exists())
+        self.assertEqual(
+            self.lot([get("/api/transactions/")], atomique=True).data["reponses"][0]["statut"], 400,
+        )
+
+    @override_settings(BATCH_MAX_REQUESTS=3)
+    def test_nombre_de_sous_requetes_limite(self):
+        self.assertEqual(self.lot([get("/api/clients/")] * 3).status_code, 200)
+        self.assertEqual(self.lot([get("/api/clients/")] * 4).status_code, 400)
+
+    def test_lot_imbrique_refuse(self):
+        interne = {"requetes": [get("/api/clients/")]}
+        response = self.lot([post("/api/batch/", interne), post("/api/batch/?x=1", interne)])
+        self.assertEqual([reponse["statut"] for reponse in response.data["reponses"]], [400, 400])
+
+        self.assertEqual(self.lot([post("/api/batch/#x", interne)]).status_code, 400)
+
+    def test_chemins_invalides(self):
+        self.assertEqual(self.lot([get("/admin/")]).status_code, 400)
+        response = self.lot([get("/api/inconnu/")])
+        self.assertEqual(response.data["reponses"][0]["statut"], 404)
@@ -0,0 +1,164 @@
+from unittest import mock
+
+from asgiref.sync import sync_to_async
+from django.db import connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core import synthetic
+from core.middleware import _gabarit
+from core.models import CategorieProduit, Client, Employe, Fournisseur, Produit
+from core.urls import router as core_router
+from users.models import User
+from users.urls import router as users_router
+
+# Données ajoutées à chaque palier : la seconde passe multiplie les volumes
+# (pages pleines, documents à nombreuses lignes) ; les budgets doivent tenir
+# sur les deux sans augmenter.
+PALIERS = [
+    ("petit", {"volumes": {
+        "categories": 2, "produits": 5, "clients": 3, "fournisseurs": 2, "ventes": 3,
+        "achats": 3, "employes": 2, "periodes": 1, "transactions": 3,
+    }, "lignes_par_document": 1}),
+    ("grand", {"volumes": {
+        "categories": 20, "produits": 120, "clients": 80, "fournisseurs": 60, "ventes": 150,
+        "achats": 150, "employes": 60, "periodes": 2, "transactions": 150,
+    }, "lignes_par_document": 12}),
+]
+
+# Nombre maximal de requêtes SQL par (route, action). Pour `export`, les
+# paquets du keyset au-delà du premier (une requête chacun, voir
+# core.utils.par_paquets) ne sont pas comptés.
+BUDGETS = {
+    ("categorie", "list"): 2, ("categorie", "retrieve"): 1, ("categorie", "create"): 2,
+    ("produit", "list"): 2, ("produit", "retrieve"): 1, ("produit", "create"): 2,
+    ("mouvement", "list"): 1, ("mouvement", "retrieve"): 1, ("mouvement", "export"): 1,
+    ("client", "list"): 2, ("client", "retrieve"): 1, ("client", "create"): 1,
+    ("vente", "list"): 2, ("vente", "retrieve"): 2, ("vente", "create"): 13, ("vente", "export"): 1,
+    ("fournisseur", "list"): 2, ("fournisseur", "retrieve"): 1, ("fournisseur", "create"): 1,
+    ("achat", "list"): 2, ("achat", "retrieve"): 2, ("achat", "create"): 13, ("achat", "export"): 1,
+    ("employe", "list"): 2, ("employe", "retrieve"): 1, ("employe", "create"): 1,
+    ("salaire", "list"): 2, ("salaire", "retrieve"): 1, ("salaire", "create"): 3,
+    ("transaction", "list"): 1, ("transaction", "retrieve"): 1, ("transaction", "export"): 1,
+    ("user", "list"): 2, ("user", "retrieve"): 1, ("user", "create"): 2,
+    ("dashboard-stats", "get"): 3, ("historique-ventes", "get"): 1, ("ping", "get"): 0,
+}
+
+VUES = ["dashboard-stats", "historique-ventes", "ping"]
+
+# Points de sauvegarde : des BEGIN / COMMIT hors de la transaction du test.
+POINTS_DE_SAUVEGARDE = ("SAVEPOINT", "RELEASE SAVEPOINT", "ROLLBACK TO SAVEPOINT")
+
+
+def _lignes(nombre):
+    produits = Produit.objects.order_by("-pk").values_list("pk", flat=True)[:nombre]
+    return [{"produit_id": pk, "quantite": "2", "prix_unitaire": "10.00"} for pk in produits]
+
+
+def _charge(basename, nombre_lignes, numero):
+    """Corps de création pour une route, ou None si elle n'accepte pas POST."""
+    derniere = lambda model: model.objects.order_by("-pk").values_list("pk", flat=True)[0]  # noqa: E731
+    charges = {
+        "categorie": lambda: {"nom": f"Budget {numero}"},
+        "produit": lambda: {
+            "nom": "Budget", "unite": "u", "prix_unitaire": "1.00",
+            "categorie_id": derniere(CategorieProduit),
+        },
+        "client": lambda: {"nom": "Budget"},
+        "fournisseur": lambda: {"nom": "Budget"},
+        "vente": lambda: {
+            "client_id": derniere(Client), "total": "20.00", "statut": "PAYEE",
+            "lignes": _lignes(nombre_lignes),
+        },
+        "achat": lambda: {
+            "fournisseur_id": derniere(Fournisseur), "total": "20.00", "statut": "PAYE",
+            "lignes": _lignes(nombre_lignes),
+        },
+        "employe": lambda: {
+            "nom": "Budget", "poste": "Vendeur", "salaire_base": "100.00", "date_embauche": "2024-01-01",
+        },
+        "salaire": lambda: {
+            "employe_id": derniere(Employe), "periode": "2020-01",
+            "brut": "100.00", "net": "80.00", "montant_paye": "80.00",
+        },
+        "user": lambda: {"username": f"budget{numero}", "email": f"budget{numero}@example.com"},
+    }
+    return charges[basename]() if basename in charges else None
+
+
+async def _en_serie(*appels):
+    # Les appels de en_parallele sur le thread du test, dont la connexion est
+    # celle que CaptureQueriesContext observe (et qui voit les données du test).
+    return [await sync_to_async(appel)() for appel in appels]
+
+
+# Sans cache : on mesure le coût réel des vues.
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}})
+@mock.patch("core.views.dashboard.en_parallele", _en_serie)
+class BudgetsRequetesTests(APITestCase):
+    """
+    Nombre de requêtes SQL de chaque route des routeurs core et users (list,
+    retrieve, create, export) et des vues de VUES, sur une base peuplée à deux
+    volumes : le budget doit être respecté et ne pas croître avec le nombre
+    de lignes.
+    """
+
+    def setUp(self):
+        admin = User.objects.create(username="budget-admin", role="admin", is_staff=True)
+        self.client.force_authenticate(admin)
+
+    def test_budgets(self):
+        mesures = {}
+        for numero, (palier, generation) in enumerate(PALIERS):
+            synthetic.generer(graine=numero, **generation)
+            for cle, appel in self._appels(generation["lignes_par_document"], numero):
+                mesures.setdefault(cle, []).append(self._mesurer(palier, *appel))
+
+        for cle, resultats in mesures.items():
+            with self.subTest(route=cle[0], action=cle[1]):
+                self.assertIn(cle, BUDGETS, "pas de budget déclaré")
+                comptes = [len(requetes) for requetes in resultats]
+                plus_lourde = max(resultats, key=len)
+                self.assertLessEqual(max(comptes), BUDGETS[cle], self._sql(plus_lourde))
+                self.assertLessEqual(comptes[-1], comptes[0], "croît avec le volume\n" + self._sql(plus_lourde))
+
+    def _appels(self, nombre_lignes, numero):
+        for prefixe, viewset, basename in core_router.registry + users_router.registry:
+            model = viewset.queryset.model
+            dernier = model.objects.order_by("-pk").values_list("pk", flat=True).first()
+            yield (basename, "list"), ("get", reverse(f"{basename}-list"))
+            if dernier is not None:
+                yield (basename, "retrieve"), ("get", reverse(f"{basename}-detail", args=[dernier]))
+            if hasattr(viewset, "export_fields"):
+                yield (basename, "export"), ("get", reverse(f"{basename}-export"), None, viewset.export_chunk_size)
+            if hasattr(viewset, "create"):
+                yield (basename, "create"), ("post", reverse(f"{basename}-list"), (basename, nombre_lignes, numero))
+        for nom in VUES:
+            yield (nom, "get"), ("get", reverse(nom))
+
+    def _mesurer(self, palier, methode, url, charge=None, taille_paquet=None):
+        """Requêtes SQL d'un appel (flux compris), sans les points de sauvegarde."""
+        corps = _charge(*charge) if charge is not None else None
+        with CaptureQueriesContext(connection) as capture:
+            if corps is not None:
+                response = self.client.post(url, corps, format="json")
+            else:
+                response = getattr(self.client, methode)(url)
+            contenu = b"".join(response.streaming_content) if response.streaming else response.content
+        self.assertLess(response.status_code, 400, f"{methode.upper()} {url} ({palier}) : {contenu[:500]!r}")
+
+        requetes = [q["sql"] for q in capture.captured_queries if not q["sql"].startswith(POINTS_DE_SAUVEGARDE)]
+        if taille_paquet:
+            # Export CSV : une ligne d'en-tête, puis une ligne par enregistrement.
+            paquets_suivants = (contenu.count(b"\n") - 1) // taille_paquet
+            requetes = requetes[:len(requetes) - paquets_suivants]
+        return requetes
+
+    @staticmethod
+    def _sql(requetes):
+        gabarits = {}
+        for sql in requetes:
+            gabarits[_gabarit(sql)] = gabarits.get(_gabarit(sql), 0) + 1
+        return "\n".join(f"{nombre:>4} x {sql}" for sql, nombre in gabarits.items())
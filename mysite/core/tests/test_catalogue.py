@@ -0,0 +1,86 @@
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import TestCase
+from rest_framework.test import APITestCase
+
+from core.models import CategorieProduit, MouvementStock, Produit
+from core.services import catalogue
+from users.models import User
+
+
+def importer_csv(texte):
+    return catalogue.importer("produits", catalogue.lire_lignes(texte, "csv"))
+
+
+class ImportProduitsTests(TestCase):
+
+    def setUp(self):
+        importer_csv(
+            "nom,unite,prix_unitaire,seuil_min,stock_actuel,categorie\n"
+            "Eau,u,1.00,5,10,Boissons\n"
+        )
+        self.produit = Produit.objects.get()
+
+    def test_creation_passe_le_stock_par_le_journal(self):
+        self.assertEqual(self.produit.stock_actuel, 10)
+        self.assertEqual(self.produit.categorie.nom, "Boissons")
+        self.assertEqual(
+            list(MouvementStock.objects.values_list("produit_id", "type", "quantite", "source_type")),
+            [(self.produit.pk, "ENTREE", 10, "IMPORT")],
+        )
+
+    def test_ligne_partielle_ne_modifie_que_ses_colonnes(self):
+        rapport = importer_csv(f"id,nom,prix_unitaire\n{self.produit.pk},Eau minérale,1.20\n")
+
+        self.assertEqual(rapport["erreurs"], [])
+        self.produit.refresh_from_db()
+        self.assertEqual(self.produit.nom, "Eau minérale")
+        self.assertEqual(str(self.produit.prix_unitaire), "1.20")
+        self.assertEqual(self.produit.seuil_min, 5)
+        self.assertEqual(self.produit.stock_actuel, 10)
+        self.assertEqual(self.produit.categorie, CategorieProduit.objects.get(nom="Boissons"))
+        self.assertEqual(MouvementStock.objects.count(), 1)
+
+    def test_stock_importe_ecrit_un_mouvement_d_ecart(self):
+        importer_csv(f"id,stock_actuel\n{self.produit.pk},7\n")
+
+        self.produit.refresh_from_db()
+        self.assertEqual(self.produit.stock_actuel, 7)
+        self.assertEqual(
+            MouvementStock.objects.filter(type="SORTIE", source_type="IMPORT").get().quantite, 3,
+        )
+
+    def test_categorie_videe_seulement_si_la_colonne_est_presente(self):
+        importer_csv(f"id,categorie\n{self.produit.pk},\n")
+
+        self.produit.refresh_from_db()
+        self.assertIsNone(self.produit.categorie)
+
+
+class ImportFichierTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create(username="admin", role="admin"))
+
+    def envoyer(self, contenu, nom="produits.csv"):
+        fichier = SimpleUploadedFile(nom, contenu, content_type="text/csv")
+        return self.client.post("/api/produits/import/", {"fichier": fichier}, format="multipart")
+
+    def test_fichier_utf8(self):
+        response = self.envoyer("nom,unite,prix_unitaire\nEau gazéifiée,u,1.00\n".encode())
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["importes"], 1)
+
+    def test_fichier_latin1_refuse_sans_rien_importer(self):
+        lignes = "nom,unite,prix_unitaire\n" + "Eau,u,1.00\n" * 3 + "Eau gazéifiée,u,1.00\n"
+        response = self.envoyer(lignes.encode("latin-1"))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fichier", response.data)
+        self.assertFalse(Produit.objects.exists())
+
+    def test_csv_malforme_refuse(self):
+        response = self.envoyer(b'nom,unite,prix_unitaire\n"Eau"x,u,1.00\n')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("fichier", response.data)
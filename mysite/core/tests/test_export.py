@@ -0,0 +1,40 @@
+from decimal import Decimal
+from unittest import mock
+
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import Transaction
+from core.views.transaction import TransactionViewSet
+from users.models import User
+
+
+class ExportTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username="admin", role="admin")
+        self.client.force_authenticate(self.user)
+        Transaction.objects.bulk_create(
+            Transaction(type="RECETTE", module="VENTE", reference_id=i, montant=Decimal(i)) for i in range(5)
+        )
+
+    def exporter(self, export_format):
+        response = self.client.get(reverse("transaction-export"), {"export_format": export_format})
+        self.assertEqual(response.status_code, 200)
+        return b"".join(response.streaming_content).decode()
+
+    def test_export_par_paquets_keyset(self):
+        with mock.patch.object(TransactionViewSet, "export_chunk_size", 2), self.assertNumQueries(3):
+            lignes = self.exporter("csv").splitlines()
+
+        self.assertEqual(lignes[0], "id,date,type,module,reference_id,montant,description")
+        self.assertEqual(
+            [ligne.split(",")[0] for ligne in lignes[1:]],
+            [str(pk) for pk in Transaction.objects.order_by("pk").values_list("pk", flat=True)],
+        )
+
+    def test_export_ndjson(self):
+        lignes = self.exporter("ndjson").splitlines()
+
+        self.assertEqual(len(lignes), 5)
+        self.assertIn('"reference_id": 0', lignes[0])
@@ -0,0 +1,107 @@
+from decimal import Decimal
+
+from django.test import SimpleTestCase, TestCase
+from rest_framework.test import APITestCase
+
+from core.filters import ID_MAX, AchatFilter, VenteFilter, numero, plages_prefixe
+from core.models import Achat, Client, Fournisseur, Vente
+from users.models import User
+
+
+class PlagesPrefixeTests(SimpleTestCase):
+
+    def test_plages(self):
+        self.assertEqual(plages_prefixe("12")[:3], [(12, 12), (120, 129), (1200, 1299)])
+
+    def test_derniere_plage_bornee_par_id_max(self):
+        plages = plages_prefixe("9")
+        self.assertEqual(plages[-1], (9 * 10**18, ID_MAX))
+        self.assertTrue(all(debut <= fin <= ID_MAX for debut, fin in plages))
+
+    def test_zero_initial(self):
+        self.assertEqual(plages_prefixe("0"), [])
+        self.assertEqual(plages_prefixe("012"), [])
+
+    def test_prefixe_de_dix_neuf_chiffres(self):
+        self.assertEqual(plages_prefixe(str(ID_MAX)), [(ID_MAX, ID_MAX)])
+        self.assertEqual(plages_prefixe("1" * 19), [(int("1" * 19), int("1" * 19))])
+        # Au-delà du plus grand id : aucune plage.
+        self.assertEqual(plages_prefixe("9" * 19), [])
+
+    def test_numero(self):
+        self.assertEqual(numero("123"), "123")
+        self.assertEqual(numero(" #123 "), "123")
+        self.assertIsNone(numero("#"))
+        self.assertIsNone(numero("12a"))
+
+
+class DocumentFilterSetTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dupont = Client.objects.create(nom="Jean Dupont")
+        cls.martin = Client.objects.create(nom="Luc Martin")
+        for pk, client in ((1, cls.dupont), (12, cls.dupont), (125, cls.martin), (3, cls.martin)):
+            Vente.objects.create(id=pk, client=client, total=Decimal("10.00"))
+        cls.sow = Fournisseur.objects.create(nom="Sow Import", telephone="338201234")
+        cls.ba = Fournisseur.objects.create(nom="Ba et Fils")
+        Achat.objects.create(id=7, fournisseur=cls.sow, total=Decimal("10.00"))
+        Achat.objects.create(id=70, fournisseur=cls.ba, total=Decimal("10.00"))
+
+    def ventes(self, **data):
+        return sorted(VenteFilter(data, Vente.objects.all()).qs.values_list("pk", flat=True))
+
+    def achats(self, **data):
+        return sorted(AchatFilter(data, Achat.objects.all()).qs.values_list("pk", flat=True))
+
+    def test_id(self):
+        self.assertEqual(self.ventes(id=12), [12])
+        self.assertEqual(self.ventes(id_min=3), [3, 12, 125])
+        self.assertEqual(self.ventes(id_max=12), [1, 3, 12])
+        self.assertEqual(self.ventes(id_min=3, id_max=12), [3, 12])
+
+    def test_numero(self):
+        self.assertEqual(self.ventes(numero="12"), [12, 125])
+        self.assertEqual(self.ventes(numero="#12"), [12, 125])
+        self.assertEqual(self.ventes(numero="1"), [1, 12, 125])
+
+    def test_numero_invalide(self):
+        self.assertEqual(self.ventes(numero="#"), [])
+        self.assertEqual(self.ventes(numero="0"), [])
+        self.assertEqual(self.ventes(numero="douze"), [])
+
+    def test_client_nom(self):
+        self.assertEqual(self.ventes(client_nom="dupont"), [1, 12])
+        self.assertEqual(self.ventes(client_nom="luc mart"), [3, 125])
+        self.assertEqual(self.ventes(client_nom="inconnu"), [])
+
+    def test_fournisseur_nom(self):
+        self.assertEqual(self.achats(fournisseur_nom="sow"), [7])
+        self.assertEqual(self.achats(fournisseur_nom="338201234"), [7])
+        self.assertEqual(self.achats(fournisseur_nom="fils"), [70])
+
+
+class DocumentSearchFilterTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create(username="admin", role="admin"))
+        dupont = Client.objects.create(nom="Jean Dupont")
+        martin = Client.objects.create(nom="Luc Martin")
+        for pk, client in ((12, dupont), (125, martin), (4, dupont)):
+            Vente.objects.create(id=pk, client=client, total=Decimal("10.00"))
+        Achat.objects.create(id=12, fournisseur=Fournisseur.objects.create(nom="Sow Import"), total=Decimal("10.00"))
+
+    def chercher(self, url, terme):
+        reponse = self.client.get(url, {"search": terme})
+        self.assertEqual(reponse.status_code, 200)
+        return sorted(ligne["id"] for ligne in reponse.data["results"])
+
+    def test_numero_et_nom_du_tiers(self):
+        self.assertEqual(self.chercher("/api/ventes/", "12 dupont"), [12])
+        self.assertEqual(self.chercher("/api/ventes/", "#12 martin"), [125])
+        self.assertEqual(self.chercher("/api/ventes/", "dupont"), [4, 12])
+        self.assertEqual(self.chercher("/api/ventes/", "12"), [12, 125])
+
+    def test_achats(self):
+        self.assertEqual(self.chercher("/api/achats/", "12 sow"), [12])
+        self.assertEqual(self.chercher("/api/achats/", "12 dupont"), [])
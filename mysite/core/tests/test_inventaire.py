@@ -0,0 +1,41 @@
+from datetime import timedelta
+from decimal import Decimal
+
+from django.test import TestCase
+from django.utils import timezone
+
+from core.models import Produit, StockSnapshot, Vente
+from core.services import inventaire, stock
+
+
+class InventaireTests(TestCase):
+
+    def setUp(self):
+        self.produits = Produit.objects.bulk_create(
+            Produit(nom=f"P{i}", unite="u", prix_unitaire=Decimal(1), stock_actuel=10 * i) for i in range(5)
+        )
+
+    def vendre(self, produit, quantite):
+        vente = Vente.objects.create(total=Decimal(quantite))
+        ligne = vente.lignes.create(produit=produit, quantite=Decimal(quantite), prix_unitaire=Decimal(1))
+        stock.enregistrer_document(vente, [ligne])
+
+    def stock_a(self, date):
+        return dict(inventaire.annoter_stock(Produit.objects.all(), date).values_list("nom", "stock"))
+
+    def test_photo_par_paquets(self):
+        self.assertEqual(inventaire.photographier(taille_lot=2), 5)
+
+        self.assertEqual(
+            sorted(StockSnapshot.objects.values_list("produit__nom", "quantite")),
+            [(f"P{i}", 10 * i) for i in range(5)],
+        )
+
+    def test_stock_a_une_date_apres_la_photo(self):
+        self.vendre(self.produits[1], 3)
+        inventaire.photographier()
+        apres_photo = timezone.now()
+        self.vendre(self.produits[1], 2)
+
+        self.assertEqual(self.stock_a(apres_photo)["P1"], 7)
+        self.assertEqual(self.stock_a(timezone.now() + timedelta(seconds=1))["P1"], 5)
@@ -0,0 +1,23 @@
+from django.test import TestCase, override_settings
+
+
+@override_settings(METRICS_ALLOWED_IPS=["127.0.0.1"])
+class MetricsTests(TestCase):
+
+    @override_settings(METRICS_TOKEN="secret")
+    def test_jeton_requis_quand_configure(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 404)
+        self.assertEqual(self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer autre").status_code, 404)
+        response = self.client.get("/metrics/", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain"))
+
+    @override_settings(METRICS_TOKEN="", DEBUG=True)
+    def test_adresses_autorisees_en_debug_sans_jeton(self):
+        self.assertEqual(self.client.get("/metrics/").status_code, 200)
+        self.assertEqual(self.client.get("/metrics/", REMOTE_ADDR="10.0.0.5").status_code, 404)
+
+    @override_settings(METRICS_TOKEN="", DEBUG=False)
+    def test_ferme_hors_debug_sans_jeton(self):
+        # Derrière le proxy, 127.0.0.1 est l'adresse du proxy, pas du collecteur.
+        self.assertEqual(self.client.get("/metrics/").status_code, 404)
@@ -0,0 +1,36 @@
+from asgiref.sync import iscoroutinefunction
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase
+
+from core.middleware import InstrumentationMiddleware
+
+
+class InstrumentationMiddlewareTests(TestCase):
+
+    def test_requete_synchrone(self):
+        response = self.client.get("/api/ping/")
+        self.assertIn("db;dur=", response["Server-Timing"])
+
+    async def test_requete_asynchrone(self):
+        response = await self.async_client.get("/api/ping/")
+        self.assertIn("db;dur=", response["Server-Timing"])
+
+
+class ModeMiddlewareTests(SimpleTestCase):
+
+    def test_suit_le_mode_de_la_chaine(self):
+        async def suite_async(request):
+            return HttpResponse()
+
+        self.assertFalse(iscoroutinefunction(InstrumentationMiddleware(lambda request: HttpResponse())))
+        middleware = InstrumentationMiddleware(suite_async)
+        self.assertTrue(iscoroutinefunction(middleware))
+
+    async def test_appel_asynchrone_mesure(self):
+        async def suite_async(request):
+            return HttpResponse()
+
+        request = RequestFactory().get("/")
+        response = await InstrumentationMiddleware(suite_async)(request)
+        self.assertIn('desc="0 requêtes"', response["Server-Timing"])
+        self.assertEqual(request.releve_sql.requetes, 0)
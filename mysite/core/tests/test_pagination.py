@@ -0,0 +1,55 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+from urllib.parse import urlsplit
+
+from django.test import TestCase
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from core.models import Transaction
+from core.pagination import DateIdCursorPagination
+
+
+class DateIdCursorPaginationTests(TestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        Transaction.objects.bulk_create(
+            Transaction(type="RECETTE", module="VENTE", reference_id=i, montant=Decimal(1)) for i in range(7)
+        )
+        # Trois jours, dont plusieurs lignes à la même date.
+        for position, transaction in enumerate(Transaction.objects.order_by("pk")):
+            transaction.date = datetime(2025, 6, 1 + position // 3, tzinfo=timezone.utc)
+            transaction.save(update_fields=["date"])
+
+    def page(self, url):
+        paginator = DateIdCursorPagination()
+        paginator.page_size = 2
+        request = Request(APIRequestFactory().get(url))
+        page = paginator.paginate_queryset(Transaction.objects.all(), request)
+        return [transaction.pk for transaction in page], paginator
+
+    def chemin(self, lien):
+        url = urlsplit(lien)
+        return f"{url.path}?{url.query}"
+
+    def test_pages_suivantes_puis_precedentes(self):
+        attendu = list(Transaction.objects.order_by("-date", "-id").values_list("pk", flat=True))
+        servis, pages, url = [], [], "/api/transactions/"
+        while url:
+            page, paginator = self.page(url)
+            servis += page
+            pages.append(page)
+            lien = paginator.get_next_link()
+            url = lien and self.chemin(lien)
+        self.assertEqual(servis, attendu)
+
+        page, paginator = self.page(self.chemin(paginator.get_previous_link()))
+        self.assertEqual(page, pages[-2])
+
+    def test_borne_de_date_dans_la_requete(self):
+        _, paginator = self.page("/api/transactions/")
+        with self.assertNumQueries(1) as requetes:
+            self.page(self.chemin(paginator.get_next_link()))
+        sql = requetes.captured_queries[0]["sql"]
+        self.assertRegex(sql, r'"date" <= .* AND \(.*"date" < ')
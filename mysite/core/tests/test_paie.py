@@ -0,0 +1,73 @@
+from datetime import date
+from decimal import Decimal
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from core.models import Employe, Salaire, Transaction
+from core.services import paie
+from users.models import User
+
+
+@override_settings(PAYROLL_RULES={"TAUX_RETENUES": "0.10", "PRORATA": True})
+class PaieTests(TestCase):
+
+    def setUp(self):
+        self.employe = Employe.objects.create(
+            nom="Awa", poste="Caissière", salaire_base=Decimal("1000.00"), date_embauche=date(2024, 1, 1),
+        )
+
+    def test_premiere_paie_cree_les_salaires_et_les_depenses(self):
+        rapport = paie.lancer("2025-06")
+
+        salaire = Salaire.objects.get()
+        self.assertEqual((salaire.brut, salaire.net, salaire.montant_paye), (1000, 900, 900))
+        self.assertEqual((rapport["crees"], rapport["modifies"], rapport["a_regulariser"]), (1, 0, 0))
+        self.assertEqual(
+            list(Transaction.objects.values_list("type", "module", "reference_id", "montant")),
+            [("DEPENSE", "PAIE", salaire.pk, Decimal("900.00"))],
+        )
+
+    def test_relance_conserve_le_montant_paye(self):
+        paie.lancer("2025-06")
+        Salaire.objects.update(montant_paye=Decimal("850.00"))
+        self.employe.salaire_base = Decimal("1200.00")
+        self.employe.save()
+
+        rapport = paie.lancer("2025-06")
+
+        salaire = Salaire.objects.get()
+        self.assertEqual((salaire.brut, salaire.net, salaire.montant_paye), (1200, 1080, 850))
+        self.assertEqual((rapport["crees"], rapport["modifies"], rapport["a_regulariser"]), (0, 1, 1))
+        self.assertEqual(Transaction.objects.count(), 1)
+
+    def test_prorata_a_l_embauche(self):
+        self.employe.date_embauche = date(2025, 6, 16)
+        self.employe.save()
+
+        paie.lancer("2025-06")
+
+        self.assertEqual(Salaire.objects.get().brut, Decimal("500.00"))
+
+
+class LancerPaieVueTests(APITestCase):
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create(username="admin", role="admin"))
+        Employe.objects.create(nom="Awa", poste="Caissière", salaire_base=Decimal("1000.00"),
+                               date_embauche=date(2024, 1, 1))
+
+    def lancer(self, corps):
+        return self.client.post("/api/salaires/run-payroll/", corps, format="json")
+
+    def test_lancement(self):
+        response = self.lancer({"periode": "2025-06"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual((response.data["crees"], response.data["total_brut"]), (1, "1000.00"))
+
+    def test_corps_invalides(self):
+        for corps in ({"periode": 202506}, {"periode": "2025-13"}, {}, ["2025-06"]):
+            with self.subTest(corps=corps):
+                self.assertEqual(self.lancer(corps).status_code, 400)
+        self.assertFalse(Salaire.objects.exists())
@@ -0,0 +1,56 @@
+import json
+
+from django.test import TestCase
+from rest_framework.renderers import JSONRenderer
+
+from core import synthetic
+from core.models import Achat, Client, Fournisseur, LigneAchat, LigneVente, Produit, Vente
+from core.serializers import ACHAT_PROJECTION, VENTE_PROJECTION, AchatSerializer, VenteSerializer
+
+
+def rendre(data):
+    return json.loads(JSONRenderer().render(data))
+
+
+class ProjectionsTests(TestCase):
+    """Les projections de lecture rapide produisent exactement le JSON des sérialiseurs."""
+
+    @classmethod
+    def setUpTestData(cls):
+        synthetic.generer(volumes={
+            "categories": 2, "produits": 10, "clients": 5, "fournisseurs": 3, "ventes": 20,
+            "achats": 20, "employes": 0, "periodes": 0, "transactions": 0,
+        })
+        # Cas limites : sans client / fournisseur, sans lignes, ligne sans
+        # produit, libellés vides.
+        produit = Produit.objects.create(nom="", unite="u", prix_unitaire="1.50")
+        client = Client.objects.create(nom="Client « test »")
+        fournisseur = Fournisseur.objects.create(nom="")
+        for tiers in (None, client):
+            vente = Vente.objects.create(client=tiers, total="0.10", mode_paiement="")
+            LigneVente.objects.create(vente=vente, produit=produit, quantite="2.5", prix_unitaire="1.00")
+            LigneVente.objects.create(vente=vente, produit=None, quantite="1", prix_unitaire="0", remise="0.01")
+        Vente.objects.create(client=client, total="12345678.99", statut="ANNULEE")
+        for tiers in (None, fournisseur):
+            achat = Achat.objects.create(fournisseur=tiers, total="3")
+            LigneAchat.objects.create(achat=achat, produit=produit, quantite="1", prix_unitaire="3")
+        Achat.objects.create(fournisseur=None, total="0")
+
+    def comparer(self, model, serializer_class, projection, relation):
+        queryset = (
+            model.objects.select_related(relation).prefetch_related("lignes__produit").order_by("-date", "-id")
+        )
+        attendu = rendre(serializer_class(queryset, many=True).data)
+        obtenu = rendre(projection.serialiser(projection.queryset(queryset)))
+
+        self.assertEqual(len(obtenu), model.objects.count())
+        for a, b in zip(attendu, obtenu):
+            with self.subTest(id=a["id"]):
+                self.assertEqual(b, a)
+                self.assertEqual(list(b), list(a))
+
+    def test_ventes(self):
+        self.comparer(Vente, VenteSerializer, VENTE_PROJECTION, "client")
+
+    def test_achats(self):
+        self.comparer(Achat, AchatSerializer, ACHAT_PROJECTION, "fournisseur")
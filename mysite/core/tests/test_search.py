@@ -0,0 +1,156 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import TestCase, override_settings
+from rest_framework.test import APITestCase
+
+from core import search
+from core.models import Client, Fournisseur, Produit
+from users.models import User
+
+
+def produit(nom):
+    return Produit.objects.create(nom=nom, unite="u", prix_unitaire=1)
+
+
+def noms(queryset):
+    return [objet.nom for objet in queryset]
+
+
+class BackendTests(TestCase):
+
+    def test_backend_selon_le_moteur(self):
+        attendu = search.SQLiteFTSBackend if search.fts5_disponible() else search.IContainsBackend
+        self.assertIsInstance(search.backend(), attendu)
+
+    @override_settings(SEARCH_BACKEND="core.search.IContainsBackend")
+    def test_search_backend_force_le_backend(self):
+        self.assertIsInstance(search.backend(), search.IContainsBackend)
+        self.assertNotIsInstance(search.backend(), search.SQLiteFTSBackend)
+
+    @override_settings(SEARCH_BACKEND="core.search.IContainsBackend")
+    def test_icontains_trouve_un_fragment_de_mot(self):
+        produit("Eau minérale")
+
+        self.assertEqual(noms(search.rechercher(Produit.objects.all(), "au")), ["Eau minérale"])
+
+    def test_pertinence_libelle_commencant_par_le_terme_en_tete(self):
+        produit("Jus de pomme")
+        produit("Pomme verte")
+        produit("Compote de pommes")
+
+        self.assertEqual(
+            noms(search.rechercher(Produit.objects.all(), "pomme")),
+            ["Pomme verte", "Jus de pomme", "Compote de pommes"],
+        )
+
+    def test_tous_les_mots_doivent_correspondre(self):
+        Client.objects.create(nom="Jean Dupont", telephone="0601")
+        Client.objects.create(nom="Jean Martin", telephone="0602")
+
+        self.assertEqual(noms(search.rechercher(Client.objects.all(), "jean 0601")), ["Jean Dupont"])
+
+
+class TriggersFTSTests(TestCase):
+    """La table `<table>_fts` suit les écritures sur la table indexée."""
+
+    def setUp(self):
+        if not (connection.vendor == "sqlite" and search.fts5_disponible()):
+            self.skipTest("FTS5 indisponible")
+
+    def trouves(self, terme):
+        return noms(search.rechercher(Produit.objects.all(), terme, classer=False))
+
+    def test_insertion(self):
+        produit("Farine de blé")
+
+        self.assertEqual(self.trouves("farine"), ["Farine de blé"])
+        self.assertEqual(self.trouves("fari"), ["Farine de blé"])
+        self.assertEqual(self.trouves("ble"), ["Farine de blé"])
+
+    def test_mise_a_jour(self):
+        objet = produit("Farine")
+        objet.nom = "Semoule"
+        objet.save()
+
+        self.assertEqual(self.trouves("farine"), [])
+        self.assertEqual(self.trouves("semoule"), ["Semoule"])
+
+    def test_mise_a_jour_d_une_colonne_non_indexee(self):
+        objet = produit("Farine")
+        Produit.objects.filter(pk=objet.pk).update(stock_actuel=5)
+
+        self.assertEqual(self.trouves("farine"), ["Farine"])
+
+    def test_suppression(self):
+        produit("Farine").delete()
+
+        self.assertEqual(self.trouves("farine"), [])
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM core_produit_fts WHERE core_produit_fts MATCH 'farine'")
+            self.assertEqual(cursor.fetchone()[0], 0)
+
+
+class RechercheVueTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(User.objects.create(username="admin", role="admin"))
+
+    def lister(self, url, terme):
+        reponse = self.client.get(url, {"search": terme})
+        self.assertEqual(reponse.status_code, 200)
+        resultats = reponse.data["results"] if isinstance(reponse.data, dict) else reponse.data
+        return [ligne["nom"] for ligne in resultats]
+
+    def test_produits(self):
+        produit("Riz parfumé")
+        produit("Sucre")
+
+        self.assertEqual(self.lister("/api/produits/", "riz"), ["Riz parfumé"])
+
+    def test_clients_par_telephone_ou_email(self):
+        Client.objects.create(nom="Awa", telephone="770001122")
+        Client.objects.create(nom="Moussa", email="moussa@exemple.sn")
+
+        self.assertEqual(self.lister("/api/clients/", "770001122"), ["Awa"])
+        self.assertEqual(self.lister("/api/clients/", "moussa"), ["Moussa"])
+
+    def test_fournisseurs_classes_par_pertinence(self):
+        Fournisseur.objects.create(nom="Grossiste Diallo")
+        Fournisseur.objects.create(nom="Diallo Frères")
+
+        self.assertEqual(
+            self.lister("/api/fournisseurs/", "diallo"), ["Diallo Frères", "Grossiste Diallo"],
+        )
+
+
+class AutocompleteTests(APITestCase):
+    url = "/api/produits/autocomplete/"
+
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create(username="admin", role="admin"))
+        produit("Huile de palme")
+        produit("Palmiste")
+        produit("Sel")
+
+    def test_debut_de_libelle_en_tete(self):
+        reponse = self.client.get(self.url, {"q": "palm"})
+
+        self.assertEqual(reponse.status_code, 200)
+        self.assertEqual([ligne["nom"] for ligne in reponse.data], ["Palmiste", "Huile de palme"])
+        self.assertEqual(set(reponse.data[0]), {"id", "nom"})
+
+    def test_q_vide(self):
+        self.assertEqual(self.client.get(self.url, {"q": "  "}).data, [])
+        self.assertEqual(self.client.get(self.url).data, [])
+
+    def test_limit(self):
+        self.assertEqual(len(self.client.get(self.url, {"q": "palm", "limit": 1}).data), 1)
+        # Une limite nulle ou négative renvoie au moins une suggestion.
+        self.assertEqual(len(self.client.get(self.url, {"q": "palm", "limit": 0}).data), 1)
+
+    def test_limit_invalide(self):
+        reponse = self.client.get(self.url, {"q": "palm", "limit": "dix"})
+
+        self.assertEqual(reponse.status_code, 400)
+        self.assertIn("limit", reponse.data)
@@ -0,0 +1,97 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import Achat, Client, Fournisseur, Vente
+from core.services import soldes
+from users.models import User
+
+
+class SoldesTests(TestCase):
+
+    def setUp(self):
+        self.awa = Client.objects.create(nom="Awa")
+        self.kofi = Client.objects.create(nom="Kofi")
+        self.fournisseur = Fournisseur.objects.create(nom="Grossiste")
+
+    def solde(self, tiers):
+        tiers.refresh_from_db()
+        return tiers.solde
+
+    def test_creation_et_paiement(self):
+        vente = Vente.objects.create(client=self.awa, total=Decimal("100.00"), montant_paye=Decimal("30.00"))
+        self.assertEqual(self.solde(self.awa), Decimal("70.00"))
+
+        vente.montant_paye = Decimal("100.00")
+        vente.save()
+        self.assertEqual(self.solde(self.awa), 0)
+
+    def test_annulation_et_changement_de_client(self):
+        vente = Vente.objects.create(client=self.awa, total=Decimal("50.00"))
+
+        vente.client = self.kofi
+        vente.save()
+        self.assertEqual((self.solde(self.awa), self.solde(self.kofi)), (0, Decimal("50.00")))
+
+        vente.statut = "ANNULEE"
+        vente.save()
+        self.assertEqual(self.solde(self.kofi), 0)
+
+    def test_suppression(self):
+        vente = Vente.objects.create(client=self.awa, total=Decimal("20.00"))
+        achat = Achat.objects.create(fournisseur=self.fournisseur, total=Decimal("80.00"), montant_paye=Decimal("5.00"))
+        self.assertEqual(self.solde(self.fournisseur), Decimal("75.00"))
+
+        vente.delete()
+        achat.delete()
+
+        self.assertEqual((self.solde(self.awa), self.solde(self.fournisseur)), (0, 0))
+
+    def test_reconciliation_corrige_les_soldes_faux(self):
+        Vente.objects.create(client=self.awa, total=Decimal("40.00"))
+        Client.objects.filter(pk=self.awa.pk).update(solde=Decimal("1.00"))
+
+        ecarts = soldes.reconcilier(corriger=True)
+
+        self.assertEqual(ecarts, [(Client, self.awa.pk, Decimal("1.00"), Decimal("40.00"))])
+        self.assertEqual(self.solde(self.awa), Decimal("40.00"))
+        self.assertEqual(soldes.reconcilier(), [])
+
+
+class EncoursVueTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(User.objects.create(username="admin", role="admin"))
+
+    def encours(self, url_name):
+        response = self.client.get(reverse(url_name))
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(ligne["nom"], ligne["solde"]) for ligne in response.data["results"]]
+
+    def test_clients_du_plus_gros_solde_au_plus_faible(self):
+        awa, kofi, _ = (Client.objects.create(nom=nom) for nom in ("Awa", "Kofi", "Sans dette"))
+        Vente.objects.create(client=awa, total=Decimal("30.00"))
+        Vente.objects.create(client=kofi, total=Decimal("80.00"), montant_paye=Decimal("20.00"))
+
+        self.assertEqual(self.encours("client-encours"), [("Kofi", "60.00"), ("Awa", "30.00")])
+
+    def test_fournisseurs(self):
+        grossiste = Fournisseur.objects.create(nom="Grossiste")
+        Fournisseur.objects.create(nom="Réglé")
+        Achat.objects.create(fournisseur=grossiste, total=Decimal("15.00"))
+
+        self.assertEqual(self.encours("fournisseur-encours"), [("Grossiste", "15.00")])
+
+    def test_ecriture_invalide_l_encours_en_cache(self):
+        awa = Client.objects.create(nom="Awa")
+        self.assertEqual(self.encours("client-encours"), [])
+
+        # L'invalidation suit le commit (core.cache.invalider).
+        with self.captureOnCommitCallbacks(execute=True):
+            Vente.objects.create(client=awa, total=Decimal("10.00"))
+
+        self.assertEqual(self.encours("client-encours"), [("Awa", "10.00")])
@@ -0,0 +1,150 @@
+from decimal import Decimal
+
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework.test import APITestCase
+
+from core.models import Achat, CategorieProduit, Client, Fournisseur, MouvementStock, Produit, Vente
+from users.models import User
+
+
+class MoteurStockTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create(username="admin", role="admin")
+        self.client.force_authenticate(self.user)
+        self.eau = Produit.objects.create(nom="Eau", unite="u", prix_unitaire=Decimal("1.00"), stock_actuel=50)
+        self.riz = Produit.objects.create(nom="Riz", unite="kg", prix_unitaire=Decimal("2.00"), stock_actuel=20)
+        self.acheteur = Client.objects.create(nom="Awa")
+        self.fournisseur = Fournisseur.objects.create(nom="Grossiste")
+
+    def vendre(self, lignes, statut="PAYEE"):
+        response = self.client.post(reverse("vente-list"), {
+            "client_id": self.acheteur.pk, "total": "10.00", "statut": statut,
+            "lignes": [
+                {"produit_id": produit.pk, "quantite": str(quantite), "prix_unitaire": "1.00"}
+                for produit, quantite in lignes
+            ],
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return Vente.objects.get(pk=response.data["id"])
+
+    def acheter(self, lignes):
+        response = self.client.post(reverse("achat-list"), {
+            "fournisseur_id": self.fournisseur.pk, "total": "10.00", "statut": "PAYE",
+            "lignes": [
+                {"produit_id": produit.pk, "quantite": str(quantite), "prix_unitaire": "1.00"}
+                for produit, quantite in lignes
+            ],
+        }, format="json")
+        self.assertEqual(response.status_code, 201, response.data)
+        return Achat.objects.get(pk=response.data["id"])
+
+    def stocks(self):
+        return dict(Produit.objects.values_list("nom", "stock_actuel"))
+
+    def test_creation_ecrit_les_mouvements_et_le_stock(self):
+        vente = self.vendre([(self.eau, 3), (self.riz, 2)])
+        self.acheter([(self.eau, 10)])
+
+        self.assertEqual(self.stocks(), {"Eau": 57, "Riz": 18})
+        self.assertEqual(
+            sorted(MouvementStock.objects.filter(source_type="VENTE").values_list("produit__nom", "type", "quantite")),
+            [("Eau", "SORTIE", 3), ("Riz", "SORTIE", 2)],
+        )
+        self.assertEqual(set(MouvementStock.objects.filter(source_type="VENTE").values_list("source_id", flat=True)),
+                         {vente.pk})
+
+    def test_document_annule_ne_mouvemente_pas(self):
+        self.vendre([(self.eau, 3)], statut="ANNULEE")
+
+        self.assertEqual(self.stocks(), {"Eau": 50, "Riz": 20})
+        self.assertFalse(MouvementStock.objects.exists())
+
+    def test_annulation_puis_reactivation(self):
+        vente = self.vendre([(self.eau, 3)])
+        url = reverse("vente-detail", args=[vente.pk])
+
+        self.client.patch(url, {"statut": "ANNULEE"}, format="json")
+        self.assertEqual(self.stocks()["Eau"], 50)
+        self.client.patch(url, {"statut": "ANNULEE"}, format="json")
+        self.assertEqual(self.stocks()["Eau"], 50)
+        self.client.patch(url, {"statut": "EN_COURS"}, format="json")
+        self.assertEqual(self.stocks()["Eau"], 47)
+        self.assertEqual(
+            list(MouvementStock.objects.order_by("pk").values_list("type", flat=True)),
+            ["SORTIE", "ENTREE", "SORTIE"],
+        )
+
+    def test_lignes_concurrentes_sur_un_meme_produit(self):
+        # Deux lignes du même produit et une instance lue avant une autre
+        # vente : le stock est modifié par différence en base, rien ne se perd.
+        perime = Produit.objects.get(pk=self.eau.pk)
+        self.vendre([(self.eau, 3), (self.eau, 4)])
+        self.vendre([(self.eau, 1)])
+        perime.nom = "Eau minérale"
+        perime.save(update_fields=["nom"])
+
+        self.assertEqual(self.stocks()["Eau minérale"], 42)
+        self.assertEqual(MouvementStock.objects.count(), 3)
+
+    def test_suppression_remet_le_stock(self):
+        vente = self.vendre([(self.eau, 3)])
+        achat = self.acheter([(self.riz, 5)])
+
+        self.assertEqual(self.client.delete(reverse("vente-detail", args=[vente.pk])).status_code, 204)
+        achat.delete()
+
+        self.assertEqual(self.stocks(), {"Eau": 50, "Riz": 20})
+        self.assertEqual(MouvementStock.objects.count(), 4)
+
+    def test_suppression_d_un_document_annule(self):
+        vente = self.vendre([(self.eau, 3)])
+        self.client.patch(reverse("vente-detail", args=[vente.pk]), {"statut": "ANNULEE"}, format="json")
+
+        vente.delete()
+
+        self.assertEqual(self.stocks()["Eau"], 50)
+        self.assertEqual(MouvementStock.objects.count(), 2)
+
+
+class StockFaibleTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.client.force_authenticate(User.objects.create(username="admin", role="admin"))
+        boissons = CategorieProduit.objects.create(nom="Boissons")
+        epicerie = CategorieProduit.objects.create(nom="Épicerie")
+        for nom, categorie, stock, seuil in (
+            ("Eau", boissons, 2, 10),
+            ("Jus", boissons, 4, 5),
+            ("Riz", epicerie, 0, 20),
+            ("Sel", epicerie, 30, 5),
+        ):
+            Produit.objects.create(
+                nom=nom, categorie=categorie, unite="u", prix_unitaire=Decimal("1.00"),
+                stock_actuel=stock, seuil_min=seuil,
+            )
+        self.boissons = boissons
+
+    def alertes(self, **params):
+        response = self.client.get(reverse("produit-stock-faible"), params)
+        self.assertEqual(response.status_code, 200, response.data)
+        return [(ligne["nom"], ligne["manque"]) for ligne in response.data["results"]]
+
+    def test_tri_par_defaut_plus_gros_manque_en_tete(self):
+        self.assertEqual(self.alertes(), [("Riz", 20), ("Eau", 8), ("Jus", 1)])
+        self.assertEqual(self.alertes(ordering="-manque"), self.alertes())
+
+    def test_tris(self):
+        self.assertEqual(self.alertes(ordering="manque"), [("Jus", 1), ("Eau", 8), ("Riz", 20)])
+        self.assertEqual(self.alertes(ordering="nom"), [("Eau", 8), ("Jus", 1), ("Riz", 20)])
+
+    def test_filtre_par_categorie(self):
+        self.assertEqual(self.alertes(categorie=self.boissons.pk), [("Eau", 8), ("Jus", 1)])
+
+    def test_tri_inconnu(self):
+        response = self.client.get(reverse("produit-stock-faible"), {"ordering": "prix"})
+
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("ordering", response.data)
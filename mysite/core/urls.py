@@ -4,6 +4,8 @@ from django.urls import path, include
 from core.views import stock, vente, achat, rh, transaction
 from core.views.dashboard import DashboardStatsView
 from .views.dashboard import HistoriqueVentesView
+from .views.batch import BatchView
+from .views.rapports import ValorisationStockView
 
 
 router = DefaultRouter()
@@ -29,7 +31,13 @@ router.register(r'salaires', rh.SalaireViewSet, basename='salaire')
 router.register(r'transactions', transaction.TransactionViewSet, basename='transaction')
 
 urlpatterns = [
+    # Listes en lecture servies par des vues asynchrones ; déclarées avant le
+    # routeur, qui garde le détail et l'export.
+    path("transactions/", transaction.TransactionListView.as_view(), name="transaction-list-async"),
+    path("mouvements/", stock.MouvementStockListView.as_view(), name="mouvement-list-async"),
     path("", include(router.urls)),
     path('dashboard-stats/', DashboardStatsView.as_view(), name='dashboard-stats'),
     path('stats/historique-ventes/', HistoriqueVentesView.as_view(), name='historique-ventes'),
+    path('stats/valorisation-stock/', ValorisationStockView.as_view(), name='valorisation-stock'),
+    path('batch/', BatchView.as_view(), name='batch'),
 ]
\ No newline at end of file
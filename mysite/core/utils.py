@@ -1,11 +1,58 @@
+from . import audit
 from .models import Transaction
 
-def log_transaction(user, type, module, reference_id, montant, description):
-    """Crée une entrée d'audit dans Transaction."""
-    return Transaction.objects.create(
+
+def _transaction(user, type, module, reference_id, montant, description):
+    return Transaction(
         type=type,
         module=module,
         reference_id=reference_id,
         montant=montant,
         description=f"{description} (par {user.username if user else 'system'})"
     )
+
+
+def log_transaction(user, type, module, reference_id, montant, description):
+    """
+    Crée une entrée d'audit dans Transaction.
+
+    L'écriture est confiée à core.audit : elle a lieu après le commit de la
+    transaction en cours, en bloc avec les autres entrées. L'instance renvoyée
+    n'a donc pas encore de clé primaire (sauf en mode synchrone).
+    """
+    entree = _transaction(user, type, module, reference_id, montant, description)
+    audit.enregistrer(entree)
+    return entree
+
+
+def log_transactions(user, entrees):
+    """
+    Variante groupée de log_transaction : `entrees` est une liste de dicts
+    (type, module, reference_id, montant, description).
+    """
+    objets = [_transaction(user, **entree) for entree in entrees]
+    audit.enregistrer(*objets)
+    return objets
+
+
+def par_paquets(queryset, champs, taille):
+    """
+    Parcourt `queryset` par paquets d'au plus `taille` tuples `(pk, *champs)`,
+    en ordre de clé primaire.
+
+    Chaque paquet est une requête indépendante `pk > dernier LIMIT taille`
+    (keyset) : ni curseur serveur ni transaction maintenue entre deux
+    paquets, ce qui reste valable derrière PgBouncer en mode transaction
+    (DISABLE_SERVER_SIDE_CURSORS), où `.iterator()` chargerait tout le
+    résultat d'un coup. La mémoire est bornée à un paquet.
+    """
+    queryset = queryset.order_by("pk").values_list("pk", *champs)
+    dernier = None
+    while True:
+        suite = queryset if dernier is None else queryset.filter(pk__gt=dernier)
+        paquet = list(suite[:taille])
+        if paquet:
+            yield paquet
+        if len(paquet) < taille:
+            return
+        dernier = paquet[-1][0]
@@ -15,6 +15,8 @@ from core.serializers import (
     ClientSerializer,
     EmployeSerializer
 )
+from core.filters import AchatFilter, DocumentSearchFilter, VenteFilter
+from core.pagination import DateIdCursorPagination
 
 class BaseViewSet(viewsets.ModelViewSet):
     """ViewSet de base avec fonctionnalités communes"""
@@ -29,14 +31,16 @@ class BaseViewSet(viewsets.ModelViewSet):
 class AchatViewSet(BaseViewSet):
     queryset = Achat.objects.select_related("fournisseur").prefetch_related("lignes__produit")
     serializer_class = AchatSerializer
-    filterset_fields = ["statut", "fournisseur"]
-    search_fields = ["id"]
+    pagination_class = DateIdCursorPagination
+    filter_backends = [DjangoFilterBackend, DocumentSearchFilter]
+    filterset_class = AchatFilter
 
 class VenteViewSet(BaseViewSet):
     queryset = Vente.objects.select_related("client").prefetch_related("lignes__produit")
     serializer_class = VenteSerializer
-    filterset_fields = ["statut", "client"]
-    search_fields = ["id"]
+    pagination_class = DateIdCursorPagination
+    filter_backends = [DjangoFilterBackend, DocumentSearchFilter]
+    filterset_class = VenteFilter
 
 class ClientViewSet(BaseViewSet):
     queryset = Client.objects.all()
@@ -1,7 +1,13 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
 from core.models import Fournisseur, Achat
-from core.serializers import FournisseurSerializer, AchatSerializer
+from core.serializers import FournisseurSerializer, AchatSerializer, ACHAT_PROJECTION
+from core.filters import AchatFilter, DocumentSearchFilter
+from core.pagination import DateIdCursorPagination
+from core.search import RechercheFilter
+from .mixins import (
+    AutocompleteMixin, BulkImportMixin, CachedReadMixin, EncoursMixin, ProjectionReadMixin, StreamingExportMixin,
+)
 from drf_spectacular.utils import (
     extend_schema,
     OpenApiParameter,
@@ -10,11 +16,13 @@ from drf_spectacular.utils import (
 from drf_spectacular.types import OpenApiTypes
 
 # ViewSet pour les Fournisseurs (inchangé)
-class FournisseurViewSet(viewsets.ModelViewSet):
+class FournisseurViewSet(AutocompleteMixin, BulkImportMixin, EncoursMixin, CachedReadMixin, viewsets.ModelViewSet):
     queryset = Fournisseur.objects.all()
+    import_catalogue = "fournisseurs"
     serializer_class = FournisseurSerializer
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [RechercheFilter]
     search_fields = ["nom", "telephone", "email"]
+    autocomplete_fields = ("id", "nom", "telephone")
 
     @extend_schema(
         parameters=[
@@ -39,12 +47,16 @@ class FournisseurViewSet(viewsets.ModelViewSet):
     partial_update=extend_schema(tags=["Achats"]),
     destroy=extend_schema(tags=["Achats"]),
 )
-class AchatViewSet(viewsets.ModelViewSet):
+class AchatViewSet(ProjectionReadMixin, StreamingExportMixin, viewsets.ModelViewSet):
     queryset = Achat.objects.select_related("fournisseur").prefetch_related("lignes__produit")
     serializer_class = AchatSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ["statut", "fournisseur"]
-    search_fields = ["id"]
+    projection = ACHAT_PROJECTION
+    pagination_class = DateIdCursorPagination
+    filter_backends = [DjangoFilterBackend, DocumentSearchFilter]
+    filterset_class = AchatFilter
+    export_fields = (
+        "id", "date", "fournisseur_id", "fournisseur__nom", "total", "montant_paye", "statut",
+    )
 
     @extend_schema(
         parameters=[
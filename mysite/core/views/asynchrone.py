@@ -0,0 +1,95 @@
+"""
+Vues DRF asynchrones, servies nativement sous ASGI (uvicorn, daphne).
+
+DRF n'exécute que des vues synchrones : `AsyncAPIView` réécrit `dispatch`
+en coroutine. L'authentification, les permissions et le throttling
+(`initial`) restent synchrones — Firebase et l'ORM — et passent par
+`sync_to_async` ; le handler (`get`, ...) est une coroutine. Sous WSGI la
+vue fonctionne aussi, Django l'exécutant via `async_to_sync`.
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.db import close_old_connections
+from rest_framework import generics, mixins
+from rest_framework.views import APIView
+
+
+class AsyncAPIView(APIView):
+    # Django refuse par défaut une vue mêlant handlers sync (options) et async.
+    view_is_async = True
+
+    async def dispatch(self, request, *args, **kwargs):
+        self.args = args
+        self.kwargs = kwargs
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.initial)(request, *args, **kwargs)
+
+            if request.method.lower() in self.http_method_names:
+                handler = getattr(self, request.method.lower(), self.http_method_not_allowed)
+            else:
+                handler = self.http_method_not_allowed
+
+            response = handler(request, *args, **kwargs)
+            if asyncio.iscoroutine(response):
+                response = await response
+        except Exception as exc:
+            response = await sync_to_async(self.handle_exception)(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+
+# Pool propre à en_parallele : sous WSGI, chaque requête tourne dans une
+# boucle éphémère dont l'exécuteur par défaut disparaît avec elle, laissant
+# derrière lui des connexions orphelines. Des threads permanents gardent leur
+# connexion d'un appel à l'autre (CONN_MAX_AGE) et bornent leur nombre.
+_executeur = ThreadPoolExecutor(max_workers=8, thread_name_prefix="en-parallele")
+
+
+def _isoler(fonction):
+    # Exécutée hors du thread sync partagé, la fonction a sa propre connexion :
+    # on applique CONN_MAX_AGE comme le ferait un cycle de requête.
+    def executer(*args, **kwargs):
+        close_old_connections()
+        try:
+            return fonction(*args, **kwargs)
+        finally:
+            close_old_connections()
+    return executer
+
+
+async def en_parallele(*appels):
+    """
+    Exécute des fonctions ORM synchrones indépendantes en même temps.
+
+    Les méthodes async de l'ORM (`aaggregate`...) passent toutes par le même
+    thread sync et s'exécutent donc l'une après l'autre ; chaque appel est ici
+    lancé dans un thread distinct (`thread_sensitive=False`), si bien que
+    la durée totale est celle de la requête la plus lente.
+    """
+    return await asyncio.gather(*(
+        sync_to_async(_isoler(appel), thread_sensitive=False, executor=_executeur)()
+        for appel in appels
+    ))
+
+
+class AsyncListAPIView(AsyncAPIView, mixins.ListModelMixin, generics.GenericAPIView):
+    """
+    Liste en lecture seule : filtres et pagination de la vue, page lue avec
+    `async for` (la pagination doit fournir `apaginate_queryset`).
+    ListModelMixin n'est là que pour que le schéma OpenAPI la décrive comme
+    une liste paginée ; `get` ne l'utilise pas.
+    """
+
+    async def get(self, request, *args, **kwargs):
+        # Les filtres peuvent interroger la base (validation des ModelChoiceFilter).
+        queryset = await sync_to_async(self.filter_queryset)(self.get_queryset())
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
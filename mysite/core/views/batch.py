@@ -0,0 +1,123 @@
+"""
+Requêtes groupées : plusieurs appels à l'API en un aller-retour HTTP.
+
+Chaque sous-requête est résolue par l'URLconf et confiée à sa vue comme
+une requête ordinaire (permissions, validation, cache, pagination), sans
+repasser par les middlewares. L'utilisateur authentifié par l'appel groupé
+est transmis tel quel : les sous-requêtes ne réinterrogent ni Firebase ni
+la base des jetons.
+"""
+import asyncio
+import io
+import json
+from urllib.parse import urlsplit
+
+from asgiref.sync import async_to_sync, iscoroutinefunction
+from django.core.handlers.wsgi import WSGIRequest
+from django.db import transaction
+from django.http import Http404
+from django.urls import resolve
+from drf_spectacular.utils import extend_schema
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.serializers.batch import BatchReponseSerializer, BatchSerializer
+
+# En-têtes de l'appel groupé propres à celui-ci, non transmis aux sous-requêtes.
+ENTETES_EXCLUS = ("CONTENT_TYPE", "CONTENT_LENGTH", "HTTP_IF_NONE_MATCH", "HTTP_IF_MATCH", "HTTP_ACCEPT")
+
+
+async def _attendre(coroutine):
+    return await coroutine
+
+
+class BatchView(APIView):
+    """
+    Exécute dans l'ordre une liste de sous-requêtes (méthode, chemin, corps)
+    et renvoie leurs réponses ensemble. Au plus `BATCH_MAX_REQUESTS`
+    sous-requêtes ; avec `atomique`, la première réponse en erreur annule
+    tout le lot, et les vues asynchrones y sont refusées (400).
+    """
+
+    @extend_schema(request=BatchSerializer, responses=BatchReponseSerializer)
+    def post(self, request):
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        requetes = serializer.validated_data["requetes"]
+
+        if not serializer.validated_data["atomique"]:
+            return Response({"reponses": [self._executer(request, requete) for requete in requetes], "annule": False})
+
+        reponses = []
+        with transaction.atomic():
+            for requete in requetes:
+                reponses.append(self._executer(request, requete, atomique=True))
+                if reponses[-1]["statut"] >= 400:
+                    transaction.set_rollback(True)
+                    return Response({"reponses": reponses, "annule": True})
+        return Response({"reponses": reponses, "annule": False})
+
+    def _executer(self, request, requete, atomique=False):
+        sous_requete = self._sous_requete(request, requete)
+        # Les lectures d'un lot atomique voient ses écritures non validées :
+        # servies hors du cache des réponses, qu'elles ne doivent pas alimenter.
+        sous_requete.hors_cache = atomique
+        try:
+            correspondance = resolve(sous_requete.path_info, getattr(request, "urlconf", None))
+        except Http404:
+            return {"statut": 404, "entetes": {}, "corps": {"detail": "Chemin introuvable."}}
+        # Un lot imbriqué multiplierait les sous-requêtes à chaque niveau.
+        if getattr(correspondance.func, "view_class", None) is BatchView:
+            return {"statut": 400, "entetes": {}, "corps": {"detail": "Un lot ne peut pas contenir /api/batch/."}}
+        # Une vue asynchrone lit sur d'autres threads, donc d'autres connexions
+        # (en_parallele, sync_to_async) : elle ne verrait pas les écritures non
+        # validées du lot, ou attendrait leurs verrous.
+        if atomique and iscoroutinefunction(correspondance.func):
+            return {"statut": 400, "entetes": {}, "corps": {
+                "detail": "Vue asynchrone non disponible dans un lot atomique.",
+            }}
+
+        response = correspondance.func(sous_requete, *correspondance.args, **correspondance.kwargs)
+        if asyncio.iscoroutine(response):
+            response = async_to_sync(_attendre)(response)
+        return self._contenu(response)
+
+    def _sous_requete(self, request, requete):
+        url = urlsplit(requete["chemin"])
+        corps = b""
+        if requete.get("corps") is not None:
+            corps = json.dumps(requete["corps"]).encode()
+
+        environ = {cle: valeur for cle, valeur in request.META.items() if cle not in ENTETES_EXCLUS}
+        environ.update({
+            "REQUEST_METHOD": requete["methode"],
+            "PATH_INFO": url.path,
+            "SCRIPT_NAME": "",
+            "QUERY_STRING": url.query,
+            "HTTP_ACCEPT": "application/json",
+            "CONTENT_TYPE": "application/json",
+            "CONTENT_LENGTH": str(len(corps)),
+            "wsgi.input": io.BytesIO(corps),
+            "wsgi.url_scheme": request.scheme,
+        })
+        sous_requete = WSGIRequest(environ)
+        # Authentification forcée de DRF (Request l'applique à la place des
+        # authenticators) : l'utilisateur et le jeton de l'appel groupé.
+        sous_requete._force_auth_user = request.user
+        sous_requete._force_auth_token = request.auth
+        return sous_requete
+
+    def _contenu(self, response):
+        entetes = {cle: valeur for cle, valeur in response.items()}
+        if isinstance(response, Response):
+            # Données reprises telles quelles, sans rendu : pas de Content-Type propre.
+            entetes.pop("Content-Type", None)
+            return {"statut": response.status_code, "entetes": entetes, "corps": response.data}
+        if getattr(response, "streaming", False):
+            return {"statut": 400, "entetes": {}, "corps": {"detail": "Réponse en flux non prise en charge."}}
+        if hasattr(response, "render"):
+            response.render()
+        corps = response.content.decode(response.charset) if response.content else None
+        if corps and response.get("Content-Type", "").startswith("application/json"):
+            corps = json.loads(corps)
+        return {"statut": response.status_code, "entetes": entetes, "corps": corps}
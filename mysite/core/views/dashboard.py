@@ -1,38 +1,44 @@
 # core/views/dashboard.py
-from rest_framework.views import APIView
 from rest_framework.response import Response
-from core.models import Vente, Achat, Produit
-from django.db.models import Sum, Count, Avg
+from decimal import Decimal
+from core.models import AgregatJournalier, Produit
+from django.db.models import Sum
 from django.db.models.functions import TruncDay, TruncWeek, TruncMonth
 from django.utils import timezone
 from datetime import timedelta
 from core.serializers.dashboard import DashboardStatsSerializer, HistoriqueVentesSerializer
 from drf_spectacular.utils import extend_schema
+from .asynchrone import AsyncAPIView, en_parallele
 
-class DashboardStatsView(APIView):
+class DashboardStatsView(AsyncAPIView):
     """Calcule et sérialise les statistiques pour le tableau de bord"""
 
     @extend_schema(
         responses=DashboardStatsSerializer
     )
-    def get(self, request):
-        today = timezone.now().date()
+    async def get(self, request):
+        today = timezone.localdate()
         first_day_of_month = today.replace(day=1)
         last_day_of_month = (first_day_of_month + timedelta(days=32)).replace(day=1) - timedelta(days=1)
 
-        ventes_mois = Vente.objects.filter(
-            date__date__range=[first_day_of_month, last_day_of_month],
-            statut='PAYEE'
-        ).aggregate(total_vente=Sum('total'))['total_vente'] or 0
-
-        achats_mois = Achat.objects.filter(
-            date__date__range=[first_day_of_month, last_day_of_month],
-            statut__in=['PAYE', 'PARTIEL']
-        ).aggregate(total_achat=Sum('total'))['total_achat'] or 0
-
-        stock_total = Produit.objects.aggregate(
-            total_stock=Sum('stock_actuel')
-        )['total_stock'] or 0
+        # Lecture des cumuls journaliers : coût proportionnel au nombre de jours du mois.
+        ventes = AgregatJournalier.objects.filter(
+            module='VENTE',
+            statut='PAYEE',
+            jour__range=[first_day_of_month, last_day_of_month],
+        )
+        achats = AgregatJournalier.objects.filter(
+            module='ACHAT',
+            statut__in=['PAYE', 'PARTIEL'],
+            jour__range=[first_day_of_month, last_day_of_month],
+        )
+
+        # Les trois agrégats sont indépendants : exécutés en parallèle.
+        ventes_mois, achats_mois, stock_total = await en_parallele(
+            lambda: ventes.aggregate(total=Sum('total'))['total'] or 0,
+            lambda: achats.aggregate(total=Sum('total'))['total'] or 0,
+            lambda: Produit.objects.aggregate(total=Sum('stock_actuel'))['total'] or 0,
+        )
 
         data = {
             'total_vente': float(ventes_mois),
@@ -46,7 +52,7 @@ class DashboardStatsView(APIView):
         return Response(serializer.data)
 
 
-class HistoriqueVentesView(APIView):
+class HistoriqueVentesView(AsyncAPIView):
     """Retourne l'historique des ventes agrégées par période"""
 
     @extend_schema(
@@ -75,7 +81,7 @@ class HistoriqueVentesView(APIView):
         ],
         responses=HistoriqueVentesSerializer(many=True)
     )
-    def get(self, request):
+    async def get(self, request):
         jours = int(request.query_params.get('jours', 30))
         periode = request.query_params.get('periode', 'jour')
 
@@ -90,18 +96,31 @@ class HistoriqueVentesView(APIView):
         }
         trunc_func = trunc_map.get(periode, TruncDay)
 
-        queryset = Vente.objects.filter(
-            date__range=[date_debut, date_fin],
-            statut='PAYEE'
+        cumuls = AgregatJournalier.objects.filter(
+            module='VENTE',
+            statut='PAYEE',
+            jour__range=[timezone.localdate(date_debut), timezone.localdate(date_fin)],
         ).annotate(
-            periode=trunc_func('date')
+            periode=trunc_func('jour')
         ).values('periode').annotate(
             total_ventes=Sum('total'),
-            nombre_ventes=Count('id'),
-            montant_moyen=Avg('total')
+            nombre_ventes=Sum('nombre'),
         ).order_by('periode')
 
-        serializer = HistoriqueVentesSerializer(queryset, many=True)
+        lignes = [
+            {
+                'date': cumul['periode'],
+                'total_ventes': cumul['total_ventes'],
+                'nombre_ventes': cumul['nombre_ventes'],
+                'montant_moyen': (
+                    cumul['total_ventes'] / cumul['nombre_ventes']
+                    if cumul['nombre_ventes'] else Decimal(0)
+                ),
+            }
+            async for cumul in cumuls
+        ]
+
+        serializer = HistoriqueVentesSerializer(lignes, many=True)
 
         return Response({
             'meta': {
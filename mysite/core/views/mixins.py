@@ -0,0 +1,261 @@
+import csv
+from datetime import datetime
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from django.utils.http import parse_etags, quote_etag
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.generics import get_object_or_404
+from rest_framework.parsers import MultiPartParser
+from rest_framework.response import Response
+
+from core import cache as cache_api
+from core import search
+from core.renderers import ORJSONParser
+from core.services import catalogue
+from core.utils import par_paquets
+
+
+class CachedReadMixin:
+    """
+    Met en cache les réponses `list` / `retrieve` d'un ViewSet.
+
+    `cache_models` liste les modèles dont dépend la réponse (le modèle du
+    ViewSet et ceux qu'il imbrique) : toute écriture sur l'un d'eux invalide
+    l'entrée. La clé tient compte des paramètres de requête et du rôle de
+    l'utilisateur ; elle sert aussi d'ETag (`If-None-Match` -> 304).
+    Une APIView peut passer son `get` par `_reponse_en_cache` ; une action de
+    liste renvoie `_reponse_liste(queryset)`, paginée comme `list`.
+
+    Une requête marquée `hors_cache` (sous-requête d'un lot atomique de
+    core.views.batch) est servie sans lire ni écrire le cache : elle peut
+    voir des écritures non validées, que le cache ne doit pas retenir.
+    """
+    cache_models = ()
+
+    def list(self, request, *args, **kwargs):
+        return self._reponse_en_cache(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self._reponse_en_cache(super().retrieve, request, *args, **kwargs)
+
+    def _reponse_en_cache(self, handler, request, *args, **kwargs):
+        if getattr(request, "hors_cache", False):
+            return handler(request, *args, **kwargs)
+        models = self.cache_models or (self.get_queryset().model,)
+        cle = cache_api.cle_reponse(request, models, getattr(self, "action", None))
+        etag = quote_etag(cle.rsplit(":", 1)[-1])
+
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        data = cache.get(cle)
+        if data is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            data = response.data
+            cache.set(cle, data, settings.API_CACHE_TIMEOUT)
+        return Response(data, headers={"ETag": etag})
+
+    def _reponse_liste(self, queryset):
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            return self.get_paginated_response(self.get_serializer(page, many=True).data)
+        return Response(self.get_serializer(queryset, many=True).data)
+
+
+class EncoursMixin:
+    """
+    Action `encours` : tiers dont le solde est positif, du plus élevé au plus
+    faible (index partiel sur `solde`, tenu par core.services.soldes).
+    """
+
+    @action(detail=False, methods=["get"], url_path="encours")
+    def encours(self, request):
+        return self._reponse_en_cache(self._encours, request)
+
+    def _encours(self, request):
+        queryset = self.filter_queryset(self.get_queryset()).filter(solde__gt=0).order_by("-solde", "pk")
+        return self._reponse_liste(queryset)
+
+
+class ProjectionReadMixin:
+    """
+    Sert `list` et `retrieve` par `projection` (core.serializers.projection)
+    au lieu du sérialiseur : lecture `.values()` et conversion directe en
+    dict, même JSON. Les écritures gardent le sérialiseur complet.
+    """
+    projection = None
+
+    def list(self, request, *args, **kwargs):
+        lignes = self.projection.queryset(self.filter_queryset(self.get_queryset()))
+        page = self.paginate_queryset(lignes)
+        if page is not None:
+            return self.get_paginated_response(self.projection.serialiser(page))
+        return Response(self.projection.serialiser(lignes))
+
+    def retrieve(self, request, *args, **kwargs):
+        lignes = self.projection.queryset(self.filter_queryset(self.get_queryset()))
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        ligne = get_object_or_404(lignes, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        return Response(self.projection.serialiser([ligne])[0])
+
+
+class _Tampon:
+    """Pseudo-fichier pour csv.writer : renvoie la ligne au lieu de l'écrire."""
+
+    def write(self, value):
+        return value
+
+
+class StreamingExportMixin:
+    """
+    Action `export` : flux CSV ou NDJSON de la liste filtrée.
+
+    Les lignes sont lues par paquets de `export_chunk_size` en keyset sur la
+    clé primaire (`core.utils.par_paquets`, une requête par paquet, sans
+    curseur serveur) et envoyées au fil de l'eau : la mémoire du worker ne
+    dépend pas du nombre de lignes exportées, y compris derrière PgBouncer.
+    """
+    export_fields = ()
+    export_chunk_size = 2000
+    export_formats = {
+        "csv": "text/csv; charset=utf-8",
+        "ndjson": "application/x-ndjson",
+    }
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="export_format",
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                enum=["csv", "ndjson"],
+                description="Format du fichier exporté (csv par défaut)",
+            )
+        ],
+        responses={(200, "text/csv"): OpenApiTypes.STR, (200, "application/x-ndjson"): OpenApiTypes.STR},
+    )
+    @action(detail=False, methods=["get"], url_path="export", pagination_class=None)
+    def export(self, request):
+        export_format = request.query_params.get("export_format", "csv")
+        if export_format not in self.export_formats:
+            raise ValidationError({"export_format": f"Formats acceptés : {', '.join(self.export_formats)}"})
+
+        paquets = par_paquets(
+            self.filter_queryset(self.get_queryset()).prefetch_related(None),
+            self.export_fields,
+            self.export_chunk_size,
+        )
+        # Le pk en tête de chaque tuple ne sert qu'au keyset.
+        rows = (row[1:] for paquet in paquets for row in paquet)
+        colonnes = [field.replace("__", "_") for field in self.export_fields]
+        lignes = self._csv(colonnes, rows) if export_format == "csv" else self._ndjson(colonnes, rows)
+
+        response = StreamingHttpResponse(lignes, content_type=self.export_formats[export_format])
+        nom = f"{self.basename}s-{timezone.localdate():%Y%m%d}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{nom}"'
+        return response
+
+    def _paquets(self, rows, formater):
+        # Première ligne envoyée seule pour que le client reçoive des octets
+        # tout de suite, puis des paquets de 500 lignes.
+        paquet, seuil = [], 1
+        for row in rows:
+            paquet.append(formater(row))
+            if len(paquet) >= seuil:
+                yield "".join(paquet)
+                paquet, seuil = [], 500
+        if paquet:
+            yield "".join(paquet)
+
+    def _csv(self, colonnes, rows):
+        writer = csv.writer(_Tampon())
+        yield writer.writerow(colonnes)
+        yield from self._paquets(
+            rows,
+            lambda row: writer.writerow([v.isoformat() if isinstance(v, datetime) else v for v in row]),
+        )
+
+    def _ndjson(self, colonnes, rows):
+        encoder = DjangoJSONEncoder(ensure_ascii=False)
+        yield from self._paquets(rows, lambda row: encoder.encode(dict(zip(colonnes, row))) + "\n")
+
+
+class BulkImportMixin:
+    """
+    Action `import` : import en masse (upsert) d'un référentiel.
+
+    Corps JSON (liste d'objets) ou envoi multipart d'un fichier `fichier`
+    (.csv ou .json). Renvoie le rapport de `core.services.catalogue.importer`.
+    """
+    import_catalogue = None
+
+    @extend_schema(
+        request={
+            "application/json": {"type": "array", "items": {"type": "object"}},
+            "multipart/form-data": {
+                "type": "object",
+                "properties": {"fichier": {"type": "string", "format": "binary"}},
+            },
+        },
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(
+        detail=False, methods=["post"], url_path="import",
+        parser_classes=[ORJSONParser, MultiPartParser],
+    )
+    def importer(self, request):
+        fichier = request.FILES.get("fichier")
+        if fichier is not None:
+            format_fichier = "json" if fichier.name.lower().endswith(".json") else "csv"
+            try:
+                lignes = catalogue.lire_lignes(fichier.file, format_fichier)
+            except ValueError as e:
+                raise ValidationError({"fichier": str(e)})
+        elif isinstance(request.data, list):
+            lignes = request.data
+        else:
+            raise ValidationError("Liste d'objets JSON ou fichier `fichier` attendu.")
+
+        rapport = catalogue.importer(self.import_catalogue, lignes)
+        return Response(rapport)
+
+
+class AutocompleteMixin:
+    """
+    Action `autocomplete` : suggestions pour la saisie au clavier (`q`),
+    via core.search. Ne lit que `autocomplete_fields`.
+    """
+    autocomplete_fields = ("id", "nom")
+    autocomplete_max = 50
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(name="q", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=True),
+            OpenApiParameter(
+                name="limit", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY,
+                description="Nombre de suggestions (10 par défaut)",
+            ),
+        ],
+        responses={200: OpenApiTypes.OBJECT},
+    )
+    @action(detail=False, methods=["get"], url_path="autocomplete", pagination_class=None)
+    def autocomplete(self, request):
+        terme = request.query_params.get("q", "").strip()
+        if not terme:
+            return Response([])
+        try:
+            limite = min(int(request.query_params.get("limit", 10)), self.autocomplete_max)
+        except ValueError:
+            raise ValidationError({"limit": "Entier attendu."})
+        suggestions = search.suggerer(self.get_queryset(), terme, max(limite, 1))
+        return Response(list(suggestions.values(*self.autocomplete_fields)))
@@ -0,0 +1,50 @@
+from decimal import Decimal
+
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from core.models import CategorieProduit, MouvementStock, Produit, StockSnapshot
+from core.serializers.dashboard import ValorisationStockSerializer
+from core.services import inventaire
+from .mixins import CachedReadMixin
+
+
+class ValorisationStockView(CachedReadMixin, APIView):
+    """
+    Valorisation du stock (quantité et stock × prix_unitaire) par catégorie,
+    calculée en une requête groupée et mise en cache jusqu'à la prochaine
+    écriture sur les produits, les catégories ou le stock.
+    """
+    cache_models = (Produit, CategorieProduit, MouvementStock, StockSnapshot)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="date", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY,
+                description="Stock à cette date (AAAA-MM-JJ ou ISO 8601), reconstitué depuis les "
+                            "photos et les mouvements ; stock actuel sinon",
+            ),
+        ],
+        responses=ValorisationStockSerializer,
+    )
+    def get(self, request):
+        return self._reponse_en_cache(self._valorisation, request)
+
+    def _valorisation(self, request):
+        date = request.query_params.get("date")
+        if date:
+            try:
+                date = inventaire.instant(date)
+            except ValueError as e:
+                raise ValidationError({"date": str(e)})
+        categories = inventaire.valorisation(date or None)
+        total = {
+            "produits": sum(ligne["produits"] for ligne in categories),
+            "quantite": sum((ligne["quantite"] for ligne in categories), Decimal(0)),
+            "valeur": sum((ligne["valeur"] for ligne in categories), Decimal(0)),
+        }
+        serializer = ValorisationStockSerializer({"date": date or None, "categories": categories, "total": total})
+        return Response(serializer.data)
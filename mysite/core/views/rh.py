@@ -1,9 +1,15 @@
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import extend_schema
 from core.models import Employe, Salaire
-from core.serializers import EmployeSerializer, SalaireSerializer
+from core.serializers import EmployeSerializer, LancerPaieSerializer, SalaireSerializer
+from core.services import paie
+from .mixins import CachedReadMixin
 
-class EmployeViewSet(viewsets.ModelViewSet):
+class EmployeViewSet(CachedReadMixin, viewsets.ModelViewSet):
     queryset = Employe.objects.all()
     serializer_class = EmployeSerializer
     filter_backends = [filters.SearchFilter]
@@ -14,3 +20,14 @@ class SalaireViewSet(viewsets.ModelViewSet):
     serializer_class = SalaireSerializer
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ["periode","employe"]
+
+    @extend_schema(request=LancerPaieSerializer, responses={200: OpenApiTypes.OBJECT})
+    @action(detail=False, methods=["post"], url_path="run-payroll")
+    def lancer_paie(self, request):
+        """Calcule et enregistre les salaires d'une période pour tous les employés actifs."""
+        serializer = LancerPaieSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        rapport = paie.lancer(serializer.validated_data["periode"], user=request.user)
+        return Response({
+            **rapport, "total_brut": str(rapport["total_brut"]), "total_net": str(rapport["total_net"]),
+        })
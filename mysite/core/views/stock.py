@@ -1,25 +1,125 @@
+from django.db.models import F
 from rest_framework import viewsets, filters
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
 from django_filters.rest_framework import DjangoFilterBackend
-from core.models import CategorieProduit, Produit, MouvementStock
+from drf_spectacular.types import OpenApiTypes
+from drf_spectacular.utils import OpenApiParameter, extend_schema
+from core.models import CategorieProduit, Produit, MouvementStock, StockSnapshot
 from core.serializers import (
-    CategorieProduitSerializer, ProduitSerializer, MouvementStockSerializer
+    CategorieProduitSerializer, ProduitSerializer, ProduitAlerteSerializer, ProduitStockSerializer,
+    MouvementStockSerializer,
 )
+from core.pagination import DateIdCursorPagination
+from core.search import RechercheFilter
+from core.services import inventaire
+from .asynchrone import AsyncListAPIView
+from .mixins import AutocompleteMixin, BulkImportMixin, CachedReadMixin, StreamingExportMixin
 
-class CategorieProduitViewSet(viewsets.ModelViewSet):
+class CategorieProduitViewSet(CachedReadMixin, viewsets.ModelViewSet):
     queryset = CategorieProduit.objects.all()
     serializer_class = CategorieProduitSerializer
     filter_backends = [filters.SearchFilter]
     search_fields = ["nom"]
 
-class ProduitViewSet(viewsets.ModelViewSet):
-    queryset = Produit.objects.all()
+class ProduitViewSet(AutocompleteMixin, BulkImportMixin, CachedReadMixin, viewsets.ModelViewSet):
+    queryset = Produit.objects.select_related("categorie")
+    cache_models = (Produit, CategorieProduit)
+    import_catalogue = "produits"
     serializer_class = ProduitSerializer
-    filter_backends = [filters.SearchFilter, DjangoFilterBackend]
+    filter_backends = [RechercheFilter, DjangoFilterBackend]
     search_fields = ["nom"]
     filterset_fields = ["categorie"]
 
-class MouvementStockViewSet(viewsets.ReadOnlyModelViewSet):
+    # Tris de low-stock ; écart = stock_actuel - seuil_min, l'expression des
+    # index partiels core_produit_alerte_*.
+    ECART = F("stock_actuel") - F("seuil_min")
+    TRIS_ALERTE = {
+        "-manque": (ECART.asc(), "pk"),
+        "manque": (ECART.desc(), "-pk"),
+        "nom": ("nom", "pk"),
+    }
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="ordering", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY,
+                enum=list(TRIS_ALERTE), description="Tri (-manque par défaut : plus gros manque en tête)",
+            ),
+        ],
+        responses=ProduitAlerteSerializer(many=True),
+    )
+    @action(detail=False, methods=["get"], url_path="low-stock", serializer_class=ProduitAlerteSerializer)
+    def stock_faible(self, request):
+        """Produits dont le stock est sous `seuil_min`, filtrables par catégorie."""
+        return self._reponse_en_cache(self._stock_faible, request)
+
+    def _stock_faible(self, request):
+        tri = request.query_params.get("ordering", "-manque")
+        if tri not in self.TRIS_ALERTE:
+            raise ValidationError({"ordering": f"Tris acceptés : {', '.join(self.TRIS_ALERTE)}"})
+        queryset = (
+            self.filter_queryset(self.get_queryset())
+            .filter(stock_actuel__lt=F("seuil_min"))
+            .annotate(manque=F("seuil_min") - F("stock_actuel"))
+            .order_by(*self.TRIS_ALERTE[tri])
+        )
+        return self._reponse_liste(queryset)
+
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name="date", type=OpenApiTypes.STR, location=OpenApiParameter.QUERY, required=True,
+                description="AAAA-MM-JJ (stock en fin de journée) ou date-heure ISO 8601",
+            ),
+            OpenApiParameter(
+                name="produit", type=OpenApiTypes.INT, location=OpenApiParameter.QUERY,
+                description="Limiter à un produit",
+            ),
+        ],
+        responses=ProduitStockSerializer(many=True),
+    )
+    @action(
+        detail=False, methods=["get"], url_path="stock-at", serializer_class=ProduitStockSerializer,
+        cache_models=(Produit, CategorieProduit, MouvementStock, StockSnapshot),
+    )
+    def stock_a(self, request):
+        """
+        Stock de chaque produit à une date passée : dernière photo
+        (snapshot_stock) plus les mouvements qui la suivent.
+        """
+        return self._reponse_en_cache(self._stock_a, request)
+
+    def _stock_a(self, request):
+        try:
+            date = inventaire.instant(request.query_params.get("date"))
+        except ValueError as e:
+            raise ValidationError({"date": str(e)})
+        queryset = self.filter_queryset(self.get_queryset())
+        produit = request.query_params.get("produit")
+        if produit is not None:
+            if not produit.isdigit():
+                raise ValidationError({"produit": "Identifiant de produit attendu."})
+            queryset = queryset.filter(pk=produit)
+        queryset = inventaire.annoter_stock(queryset.order_by("pk"), date)
+        return self._reponse_liste(queryset)
+
+class MouvementStockViewSet(StreamingExportMixin, viewsets.ReadOnlyModelViewSet):
     queryset = MouvementStock.objects.select_related("produit")
     serializer_class = MouvementStockSerializer
+    pagination_class = DateIdCursorPagination
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["produit","type","date"]
+    # Plages de dates semi-ouvertes (date__gte / date__lt) : pas de cast, l'index (produit, date) reste utilisable.
+    filterset_fields = {"produit": ["exact"], "type": ["exact"], "date": ["exact", "gte", "lt"]}
+    export_fields = (
+        "id", "date", "produit_id", "produit__nom", "type", "quantite", "source_type", "source_id",
+    )
+
+
+class MouvementStockListView(AsyncListAPIView):
+    """Liste des mouvements servie en asynchrone (même filtres et pagination que le viewset)."""
+    queryset = MouvementStockViewSet.queryset
+    serializer_class = MouvementStockViewSet.serializer_class
+    pagination_class = MouvementStockViewSet.pagination_class
+    filter_backends = MouvementStockViewSet.filter_backends
+    filterset_fields = MouvementStockViewSet.filterset_fields
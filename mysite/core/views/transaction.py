@@ -2,9 +2,28 @@ from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
 from core.models import Transaction
 from core.serializers import TransactionSerializer
+from core.pagination import DateIdCursorPagination
+from .asynchrone import AsyncListAPIView
+from .mixins import StreamingExportMixin
 
-class TransactionViewSet(viewsets.ReadOnlyModelViewSet):
+class TransactionViewSet(StreamingExportMixin, viewsets.ReadOnlyModelViewSet):
     queryset = Transaction.objects.all()
     serializer_class = TransactionSerializer
+    pagination_class = DateIdCursorPagination
     filter_backends = [DjangoFilterBackend]
-    filterset_fields = ["type","module","date"]
+    filterset_fields = {
+        "type": ["exact"],
+        "module": ["exact"],
+        "reference_id": ["exact"],
+        "date": ["exact", "gte", "lt"],
+    }
+    export_fields = ("id", "date", "type", "module", "reference_id", "montant", "description")
+
+
+class TransactionListView(AsyncListAPIView):
+    """Liste des transactions servie en asynchrone (même filtres et pagination que le viewset)."""
+    queryset = TransactionViewSet.queryset
+    serializer_class = TransactionViewSet.serializer_class
+    pagination_class = TransactionViewSet.pagination_class
+    filter_backends = TransactionViewSet.filter_backends
+    filterset_fields = TransactionViewSet.filterset_fields
@@ -1,17 +1,29 @@
-from rest_framework import viewsets, filters
+from rest_framework import viewsets
 from django_filters.rest_framework import DjangoFilterBackend
 from core.models import Client, Vente
-from core.serializers import ClientSerializer, VenteSerializer
+from core.serializers import ClientSerializer, VenteSerializer, VENTE_PROJECTION
+from core.filters import VenteFilter, DocumentSearchFilter
+from core.pagination import DateIdCursorPagination
+from core.search import RechercheFilter
+from .mixins import (
+    AutocompleteMixin, BulkImportMixin, CachedReadMixin, EncoursMixin, ProjectionReadMixin, StreamingExportMixin,
+)
 
-class ClientViewSet(viewsets.ModelViewSet):
+class ClientViewSet(AutocompleteMixin, BulkImportMixin, EncoursMixin, CachedReadMixin, viewsets.ModelViewSet):
     queryset = Client.objects.all()
+    import_catalogue = "clients"
     serializer_class = ClientSerializer
-    filter_backends = [filters.SearchFilter]
+    filter_backends = [RechercheFilter]
     search_fields = ["nom","telephone","email"]
+    autocomplete_fields = ("id", "nom", "telephone")
 
-class VenteViewSet(viewsets.ModelViewSet):
+class VenteViewSet(ProjectionReadMixin, StreamingExportMixin, viewsets.ModelViewSet):
     queryset = Vente.objects.select_related("client").prefetch_related("lignes__produit")
     serializer_class = VenteSerializer
-    filter_backends = [DjangoFilterBackend, filters.SearchFilter]
-    filterset_fields = ["statut","client"]
-    search_fields = ["id"]
+    projection = VENTE_PROJECTION
+    pagination_class = DateIdCursorPagination
+    filter_backends = [DjangoFilterBackend, DocumentSearchFilter]
+    filterset_class = VenteFilter
+    export_fields = (
+        "id", "date", "client_id", "client__nom", "total", "montant_paye", "mode_paiement", "statut",
+    )
@@ -0,0 +1,48 @@
+"""
+Configuration gunicorn de production (voir Dockerfile).
+
+Workers synchrones multi-threads (gthread) : la majorité du temps d'une
+requête se passe à attendre Postgres ou Firebase, plusieurs threads par
+processus occupent donc mieux le CPU qu'un worker sync unique. Toutes les
+valeurs sont surchargeables par variables d'environnement.
+"""
+import multiprocessing
+import os
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+
+workers = int(os.getenv("GUNICORN_WORKERS", multiprocessing.cpu_count() * 2 + 1))
+# Sous ASGI : GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker et
+# l'application mysite.asgi:application (vues asynchrones de core.views).
+worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+threads = int(os.getenv("GUNICORN_THREADS", 4))
+
+# Charge Django une fois dans le maître puis fork : démarrage plus rapide,
+# mémoire partagée en copie-sur-écriture.
+preload_app = True
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", 30))
+graceful_timeout = 30
+keepalive = 5
+
+# Recycle les workers régulièrement (fuites mémoire éventuelles), avec un
+# décalage aléatoire pour qu'ils ne redémarrent pas tous ensemble.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", 2000))
+max_requests_jitter = 200
+
+accesslog = "-"
+errorlog = "-"
+
+
+def pre_fork(server, worker):
+    # Une connexion ouverte par le maître pendant le préchargement ne doit
+    # pas être héritée par les enfants : on la ferme avant chaque fork.
+    from django.db import connections
+    for connection in connections.all(initialized_only=True):
+        connection.close()
+
+
+def worker_exit(server, worker):
+    # Écrit les entrées d'audit encore en file avant l'arrêt du worker.
+    from core.audit import writer
+    writer.arreter()
@@ -1,6 +1,7 @@
 import os
 from pathlib import Path
 from datetime import timedelta
+from django.core.exceptions import ImproperlyConfigured
 from django.core.management.utils import get_random_secret_key
 from corsheaders.defaults import default_headers
 
@@ -89,6 +90,8 @@ INSTALLED_APPS = [
 # 6. Middleware (inchangé)
 # ─────────────────────────────────────────────
 MIDDLEWARE = [
+    # Compte requêtes SQL et temps par requête (voir core.middleware)
+    "core.middleware.InstrumentationMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
@@ -115,6 +118,15 @@ if ENV == "prod":
             "PASSWORD": os.getenv("DB_PASSWORD", "postgres"),
             "HOST": os.getenv("DB_HOST", "db"),
             "PORT": os.getenv("DB_PORT", "5432"),
+            # Connexions persistantes : une connexion par thread de worker,
+            # réutilisée entre requêtes et vérifiée avant réutilisation.
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", 60)),
+            "CONN_HEALTH_CHECKS": True,
+            # Derrière PgBouncer en mode transaction, les curseurs serveur
+            # (QuerySet.iterator) ne survivent pas d'une transaction à l'autre :
+            # .iterator() charge alors tout le résultat. Les lectures longues
+            # (exports, photos de stock) passent par core.utils.par_paquets.
+            "DISABLE_SERVER_SIDE_CURSORS": os.getenv("DB_POOLER") == "pgbouncer",
         }
     }
 else:
@@ -141,6 +153,18 @@ REST_FRAMEWORK = {
         "django_filters.rest_framework.DjangoFilterBackend",
         "rest_framework.filters.SearchFilter",
     ],
+    # JSON via orjson (core.renderers), repli automatique sur json si absent.
+    "DEFAULT_RENDERER_CLASSES": [
+        "core.renderers.ORJSONRenderer",
+        "rest_framework.renderers.BrowsableAPIRenderer",
+    ],
+    "DEFAULT_PARSER_CLASSES": [
+        "core.renderers.ORJSONParser",
+        "rest_framework.parsers.FormParser",
+        "rest_framework.parsers.MultiPartParser",
+    ],
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.StandardLimitOffsetPagination",
+    "PAGE_SIZE": int(os.getenv("API_PAGE_SIZE", 50)),
     "DEFAULT_SCHEMA_CLASS": "drf_spectacular.openapi.AutoSchema",
 }
 
@@ -233,6 +257,12 @@ if FIREBASE_CREDENTIALS:
 else:
     FIREBASE_CONFIG = None
 
+# Cache des ID-tokens vérifiés (voir core.authentication.VerifiedTokenCache)
+FIREBASE_TOKEN_CACHE = {
+    "MAX_ENTRIES": int(os.getenv("FIREBASE_TOKEN_CACHE_SIZE", 1024)),
+    "MAX_TTL": int(os.getenv("FIREBASE_TOKEN_CACHE_TTL", 300)),
+}
+
 # ─────────────────────────────────────────────
 # 14. Nouvelle section : Configuration Admin
 # ─────────────────────────────────────────────
@@ -250,4 +280,76 @@ ADMIN_INTERFACE_CONFIG = {
     'DARK_MODE': True,  # Activer le mode sombre
     'COLOR_SCHEME': 'auto',  # auto | light | dark
     'DEFAULT_COLOR_SCHEME': 'dark',  # Préférer le mode sombre
-}
\ No newline at end of file
+}
+# ─────────────────────────────────────────────
+# 15. Cache (réponses des référentiels, voir core.cache)
+# ─────────────────────────────────────────────
+# REDIS_URL (ex. redis://localhost:6379/1) partage le cache entre workers.
+# Il est exigé hors DEBUG : avec plusieurs workers gunicorn, un cache en
+# mémoire locale par processus garderait des réponses périmées, chaque
+# invalidation (core.cache) ne touchant que le worker qui a écrit.
+REDIS_URL = os.getenv("REDIS_URL")
+if not REDIS_URL and not DEBUG:
+    raise ImproperlyConfigured("REDIS_URL est requis hors DEBUG (cache partagé entre workers).")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "mutooni",
+            "OPTIONS": {"MAX_ENTRIES": 5000},
+        }
+    }
+API_CACHE_TIMEOUT = int(os.getenv("API_CACHE_TIMEOUT", 300))
+
+# ─────────────────────────────────────────────
+# 16. Journal d'audit (voir core.audit)
+# ─────────────────────────────────────────────
+# En mode "async", les entrées Transaction sont écrites en bloc par un thread
+# d'arrière-plan après le commit ; "sync" les écrit dans la requête (réglage
+# des tests, voir mysite.settings_test).
+AUDIT_WRITER = {
+    "MODE": os.getenv("AUDIT_WRITER_MODE", "async"),
+    "FLUSH_INTERVAL_MS": int(os.getenv("AUDIT_FLUSH_INTERVAL_MS", 200)),
+    "BATCH_SIZE": int(os.getenv("AUDIT_BATCH_SIZE", 500)),
+    "TENTATIVES": int(os.getenv("AUDIT_TENTATIVES", 3)),
+}
+
+# ─────────────────────────────────────────────
+# 17. Instrumentation (voir core.middleware et core.metrics)
+# ─────────────────────────────────────────────
+# Au-delà de ce nombre d'exécutions d'un même gabarit SQL dans une requête
+# HTTP, celle-ci est signalée comme N+1.
+QUERY_INSTRUMENTATION = {
+    "N_PLUS_ONE_THRESHOLD": int(os.getenv("N_PLUS_ONE_THRESHOLD", 10)),
+}
+# /metrics (format Prometheus) : avec METRICS_TOKEN, réservé au porteur du
+# jeton (`Authorization: Bearer ...`), seul moyen fiable derrière un proxy où
+# REMOTE_ADDR est l'adresse du proxy ; sans jeton, servi en DEBUG aux seules
+# adresses de METRICS_ALLOWED_IPS, et à personne hors DEBUG.
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+METRICS_ALLOWED_IPS = os.getenv("METRICS_ALLOWED_IPS", "127.0.0.1,::1").split(",")
+
+# ─────────────────────────────────────────────
+# 18. Paie (voir core.services.paie)
+# ─────────────────────────────────────────────
+# PRIMES : montant fixe ajouté au salaire de base selon le poste ;
+# TAUX_RETENUES : part du brut retenue pour obtenir le net (aucune par
+# défaut : net = brut tant qu'un taux n'est pas configuré).
+PAYROLL_RULES = {
+    "PRIMES": {},
+    "TAUX_RETENUES": os.getenv("PAYROLL_TAUX_RETENUES", "0"),
+    "PRORATA": True,
+}
+
+# ─────────────────────────────────────────────
+# 19. Requêtes groupées (voir core.views.batch)
+# ─────────────────────────────────────────────
+# Nombre maximal de sous-requêtes d'un appel à /api/batch/.
+BATCH_MAX_REQUESTS = int(os.getenv("BATCH_MAX_REQUESTS", 20))
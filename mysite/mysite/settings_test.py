@@ -0,0 +1,16 @@
+"""
+Réglages des tests : `python manage.py test --settings=mysite.settings_test`.
+"""
+from .settings import *  # noqa: F401,F403
+
+# Journal d'audit écrit dans la transaction du test (TestCase n'exécute pas
+# les callbacks on_commit du mode "async").
+AUDIT_WRITER = {**AUDIT_WRITER, "MODE": "sync"}  # noqa: F405
+
+# Cache propre au processus de test, jamais le Redis partagé.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        "LOCATION": "mutooni-tests",
+    }
+}
@@ -2,11 +2,15 @@ from django.contrib import admin
 from django.urls import path, include
 from django.views.generic import RedirectView
 from drf_spectacular.views import SpectacularAPIView, SpectacularSwaggerView, SpectacularRedocView
+from core.metrics import metrics_view
 
 urlpatterns = [
     # Redirection de la racine vers Swagger UI
     path("", RedirectView.as_view(url="/api/docs/", permanent=False)),
     
+    # Métriques Prometheus (accès local uniquement)
+    path("metrics/", metrics_view, name="metrics"),
+    
     # Interface d'administration Django
     path("admin/", admin.site.urls),
     